@@ -0,0 +1,210 @@
+# cadence_benchmarks.py
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from emotional_ai_module import EmotionAI_PathBased_DynamicIntensity_V3, DEFAULT_APPRAISAL_RULES
+from mind_ai_module import MindAI_Learning
+from executor_ai_module import executor_ai_decision_dynamic_intensity
+from main_ai_system import MIND_AI_OPTIONS, run_turn
+from transcript_replay import iter_lines, iter_transcript_turns
+
+SESSION_HISTORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Session History.txt")
+HISTORY_SIZES = (0, 1000, 10000, 100000, 1000000)
+FORMAT_VERSION = 1
+
+
+def load_corpus(path=SESSION_HISTORY_PATH, seed=1234):
+    """
+    Builds benchmark inputs: "User:" / "Gemini:" turns from the session history, bucketed by length,
+    plus document-length text and synthetic keyword-heavy text drawn from the appraisal rules.
+    """
+    turns = [text for _, text in iter_transcript_turns(iter_lines(path))]
+
+    rng = random.Random(seed)
+    keywords = sorted({keyword for category_keywords, _, sub_rules in DEFAULT_APPRAISAL_RULES
+                       for keywords in (category_keywords,) + tuple(sub_keywords for sub_keywords, _ in sub_rules)
+                       for keyword in keywords})
+    filler = " ".join(turns).split()
+    keyword_heavy = [" ".join(rng.choice(keywords) if rng.random() < 0.5 else rng.choice(filler) for _ in range(60)) for _ in range(50)]
+
+    document = " ".join(turns)
+    return {
+        "short": [turn for turn in turns if len(turn) < 120] or [turn[:120] for turn in turns],
+        "medium": [turn for turn in turns if 120 <= len(turn) < 2000],
+        "document": [document[start:start + 20000] for start in range(0, max(len(document) - 20000, 1), 5000)],
+        "keyword_heavy": keyword_heavy,
+    }
+
+
+def measure(operation, inputs, number=None, repeat=5, target_seconds=0.2):
+    """
+    Times operation(input) cycling over inputs. The iteration count is calibrated to roughly
+    target_seconds per round unless given. Returns per-call nanosecond statistics.
+    """
+    def run_round(count):
+        start = time.perf_counter_ns()
+        for index in range(count):
+            operation(inputs[index % len(inputs)])
+        return time.perf_counter_ns() - start
+
+    if number is None:
+        number = 1
+        while True:
+            elapsed = run_round(number)
+            if elapsed >= target_seconds * 1e9 / 10 or number >= 1 << 20:
+                break
+            number *= 2
+        number = max(1, int(number * target_seconds * 1e9 / max(elapsed, 1)))
+
+    per_call = [run_round(number) / number for _ in range(repeat)]
+    return {
+        "iterations": number,
+        "repeat": repeat,
+        "min_ns": min(per_call),
+        "median_ns": statistics.median(per_call),
+        "max_ns": max(per_call),
+    }
+
+
+def bench_generate_emotion_path(corpus, results):
+    for bucket in ("short", "medium", "document", "keyword_heavy"):
+        emotion_ai = EmotionAI_PathBased_DynamicIntensity_V3()
+        results[f"generate_emotion_path.{bucket}"] = measure(emotion_ai.generate_emotion_path, corpus[bucket])
+
+
+def bench_update_emotion_intensity(corpus, results):
+    emotion_ai = EmotionAI_PathBased_DynamicIntensity_V3()
+    emotion_ai.generate_emotion_path("I am afraid and sad and angry")
+    results["update_emotion_intensity"] = measure(lambda _: emotion_ai.update_emotion_intensity(), [None])
+
+
+def bench_analyze_options(corpus, results, history_sizes=HISTORY_SIZES):
+    """analyze_options latency and decision history memory as the history grows."""
+    emotion_paths = [EmotionAI_PathBased_DynamicIntensity_V3().generate_emotion_path(text) for text in corpus["short"]]
+    fear_path = EmotionAI_PathBased_DynamicIntensity_V3().generate_emotion_path("I am afraid")
+    rng = random.Random(99)
+    for size in history_sizes:
+        mind_ai_learner = MindAI_Learning()
+        tracemalloc.start()
+        for index in range(size):
+            mind_ai_learner.record_decision_outcome(
+                emotion_paths[index % len(emotion_paths)], rng.choice(("Option A", "Option B", "Option C")),
+                rng.choice(("positive", "neutral", "negative"))
+            )
+        history_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        result = measure(lambda path: mind_ai_learner.analyze_options("Current situation", path), [fear_path])
+        result["history_records"] = size
+        result["history_bytes"] = history_bytes
+        results[f"analyze_options.history_{size}"] = result
+
+
+def bench_executor(corpus, results):
+    emotion_ai = EmotionAI_PathBased_DynamicIntensity_V3()
+    mind_ai_learner = MindAI_Learning()
+    paths = [(emotion_ai.generate_emotion_path(text), dict(emotion_ai.get_emotion_intensity())) for text in corpus["short"]]
+    results["executor_ai_decision_dynamic_intensity"] = measure(
+        lambda item: executor_ai_decision_dynamic_intensity(MIND_AI_OPTIONS, item[0], item[1], mind_ai_learner), paths
+    )
+
+
+def bench_full_turn(corpus, results, memory_turns=10000):
+    inputs = corpus["short"] + corpus["medium"]
+    emotion_ai, mind_ai_learner = EmotionAI_PathBased_DynamicIntensity_V3(), MindAI_Learning()
+    result = measure(lambda text: run_turn(emotion_ai, mind_ai_learner, text), inputs)
+
+    # Memory retained per turn (mostly decision history), over a fixed number of turns so reports compare
+    emotion_ai, mind_ai_learner = EmotionAI_PathBased_DynamicIntensity_V3(), MindAI_Learning()
+    tracemalloc.start()
+    for index in range(memory_turns):
+        run_turn(emotion_ai, mind_ai_learner, inputs[index % len(inputs)])
+    result["retained_bytes_per_turn"] = tracemalloc.get_traced_memory()[0] / memory_turns
+    tracemalloc.stop()
+    results["run_turn"] = result
+
+
+def run_benchmarks(quick=False, selected=None):
+    corpus = load_corpus()
+    history_sizes = tuple(size for size in HISTORY_SIZES if not quick or size <= 100000)
+    suites = {
+        "generate_emotion_path": lambda results: bench_generate_emotion_path(corpus, results),
+        "update_emotion_intensity": lambda results: bench_update_emotion_intensity(corpus, results),
+        "analyze_options": lambda results: bench_analyze_options(corpus, results, history_sizes),
+        "executor": lambda results: bench_executor(corpus, results),
+        "run_turn": lambda results: bench_full_turn(corpus, results),
+    }
+    results = {}
+    for name, suite in suites.items():
+        if selected is None or name in selected:
+            suite(results)
+    return {
+        "version": FORMAT_VERSION,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "created": time.time(),
+        "corpus": {bucket: len(texts) for bucket, texts in corpus.items()},
+        "benchmarks": results,
+    }
+
+
+def compare(baseline, current, max_regression=0.2, min_delta_ns=1000):
+    """
+    Compares best-round latency (min_ns, the least noisy statistic) and recorded memory against a baseline report.
+    Returns (rows, regressions) where a regression is a metric more than max_regression worse; latency changes
+    smaller than min_delta_ns are treated as timer noise.
+    """
+    rows, regressions = [], []
+    for name, result in current["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if previous is None:
+            continue
+        for metric in ("min_ns", "history_bytes", "retained_bytes_per_turn"):
+            if metric not in result or not previous.get(metric):
+                continue
+            change = result[metric] / previous[metric] - 1.0
+            row = (name, metric, previous[metric], result[metric], change)
+            rows.append(row)
+            if change > max_regression and (metric != "min_ns" or result[metric] - previous[metric] >= min_delta_ns):
+                regressions.append(row)
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Cadence turn pipeline.")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against a previous JSON report")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed relative slowdown/growth (default 0.2 = 20%%)")
+    parser.add_argument("--min-delta-ns", type=float, default=1000, help="Ignore latency changes smaller than this")
+    parser.add_argument("--quick", action="store_true", help="Cap decision history at 100k records")
+    parser.add_argument("--only", action="append", help="Run only these suites (repeatable)")
+    args = parser.parse_args()
+
+    report = run_benchmarks(quick=args.quick, selected=args.only)
+    report_json = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(report_json + "\n")
+    else:
+        print(report_json)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        rows, regressions = compare(baseline, report, args.max_regression, args.min_delta_ns)
+        for row in rows:
+            name, metric, before, after, change = row
+            flag = "  REGRESSION" if row in regressions else ""
+            print(f"{name:45} {metric:18} {before:>14.0f} -> {after:>14.0f} {change:+7.1%}{flag}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# cadence_clock.py
+import time
+
+
+class SystemClock:
+    """
+    Real time: time() for record timestamps, monotonic() for decay, sleep() for pacing.
+    Components take a clock argument and default to SYSTEM_CLOCK.
+    """
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class VirtualClock:
+    """
+    Simulated time that only moves when advanced: sleep() returns immediately after advancing the clock,
+    so paced loops and lazy decay run as fast as the CPU allows and are reproducible run to run.
+    time() is epoch + elapsed seconds, monotonic() is the elapsed seconds.
+    """
+    def __init__(self, epoch=0.0):
+        self.epoch = epoch
+        self.elapsed = 0.0
+
+    def time(self):
+        return self.epoch + self.elapsed
+
+    def monotonic(self):
+        return self.elapsed
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def advance(self, seconds):
+        if seconds < 0:
+            raise ValueError("A clock can't go backwards")
+        self.elapsed += seconds
+
+
+SYSTEM_CLOCK = SystemClock()
@@ -0,0 +1,322 @@
+# cadence_events.py
+import collections
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+
+from cadence_clock import SYSTEM_CLOCK
+from emotional_ai_module import EMOTION_CATEGORIES
+
+TURN_FIELDS = ("emotion_path", "emotion_intensities", "decision_scores", "chosen_option", "ai_response")
+VERBOSITY_FIELDS = {
+    "minimal": ("chosen_option",),
+    "decisions": ("emotion_path", "decision_scores", "chosen_option"),
+    "full": TURN_FIELDS,
+}
+CONSOLE_LABELS = {
+    "emotion_path": "Emotion Path",
+    "emotion_intensities": "Current Emotion Intensities",
+    "decision_scores": "Decision Scores",
+    "chosen_option": "Chosen Option",
+    "ai_response": "AI Response",
+}
+
+BINARY_MAGIC = b"CADEVT1\n"
+_STRING_RECORD, _TURN_RECORD = 0, 1
+_STRING_HEADER = struct.Struct("<BI") # kind, utf-8 length; the string gets the next code
+_TURN_HEADER = struct.Struct("<BdiB") # kind, timestamp, session code (-1: none), field mask (bit i: TURN_FIELDS[i])
+_COUNT = struct.Struct("<H")
+_CODE = struct.Struct("<I")
+_SCORE = struct.Struct("<Id")
+_INTENSITIES = struct.Struct("<%dd" % len(EMOTION_CATEGORIES))
+
+
+class EventSink:
+    """
+    Receives one structured event per turn (see record_turn) instead of printing it.
+
+    verbosity picks the turn fields kept ("minimal", "decisions" or "full"); sample_rate keeps that fraction
+    of turns, evenly spaced, so sampling is deterministic. Recording only stores a reference to the turn:
+    selecting fields and formatting happen when the event is written or read.
+    """
+    def __init__(self, verbosity="full", sample_rate=1.0, clock=None):
+        if verbosity not in VERBOSITY_FIELDS:
+            raise ValueError(f"Unknown verbosity {verbosity!r}; choose from {', '.join(VERBOSITY_FIELDS)}")
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.verbosity = verbosity
+        self.fields = VERBOSITY_FIELDS[verbosity]
+        self.sample_rate = sample_rate
+        self.clock = clock or SYSTEM_CLOCK
+        self.recorded = 0
+        self._sample_credit = 0.0
+
+    def record_turn(self, turn, session_id=None):
+        """Records a run_turn() result, subject to sampling. The turn must not be modified afterwards."""
+        if self.sample_rate < 1.0:
+            self._sample_credit += self.sample_rate
+            if self._sample_credit < 1.0:
+                return
+            self._sample_credit -= 1.0
+        self.recorded += 1
+        self._emit((self.clock.time(), session_id, turn))
+
+    def format_record(self, event):
+        """The structured record of an event: time, session (when known) and the fields of the verbosity."""
+        timestamp, session_id, turn = event
+        record = {"time": timestamp}
+        if session_id is not None:
+            record["session"] = session_id
+        for field in self.fields:
+            if field in turn:
+                record[field] = turn[field]
+        return record
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _emit(self, event):
+        raise NotImplementedError
+
+
+class NullSink(EventSink):
+    """Discards every event."""
+    def record_turn(self, turn, session_id=None):
+        pass
+
+
+class RingBufferSink(EventSink):
+    """Keeps the latest capacity events in memory."""
+    def __init__(self, capacity=1024, verbosity="full", sample_rate=1.0, clock=None):
+        super().__init__(verbosity, sample_rate, clock)
+        self._events = collections.deque(maxlen=capacity)
+
+    def __len__(self):
+        return len(self._events)
+
+    def records(self):
+        """The buffered events as structured records, oldest first."""
+        return [self.format_record(event) for event in list(self._events)]
+
+    def _emit(self, event):
+        self._events.append(event)
+
+
+class BufferedSink(EventSink):
+    """
+    Queues events and writes them from a background thread every flush_interval seconds, or sooner once
+    half of max_pending events are waiting. When the queue is full new events are dropped and counted
+    (dropped) rather than blocking the turn. flush() writes everything queued from the calling thread.
+    """
+    def __init__(self, verbosity="full", sample_rate=1.0, clock=None, flush_interval=1.0, max_pending=65536):
+        super().__init__(verbosity, sample_rate, clock)
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.dropped = 0
+        self.written = 0
+        self._pending = collections.deque()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def flush(self):
+        with self._write_lock:
+            batch = []
+            while self._pending:
+                batch.append(self._pending.popleft())
+            if batch:
+                self._write(batch)
+                self.written += len(batch)
+            self._flush_output()
+
+    def close(self):
+        """Stops the writer thread, writes what is still queued and closes the output."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+        self._close_output()
+
+    def _emit(self, event):
+        pending = len(self._pending)
+        if pending >= self.max_pending:
+            self.dropped += 1
+            return
+        self._pending.append(event)
+        if pending + 1 == self.max_pending // 2:
+            self._wake.set()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _write(self, events):
+        raise NotImplementedError
+
+    def _flush_output(self):
+        pass
+
+    def _close_output(self):
+        pass
+
+
+class JsonlFileSink(BufferedSink):
+    """Appends one JSON object per event (see format_record) to a file."""
+    def __init__(self, path, verbosity="full", sample_rate=1.0, clock=None, flush_interval=1.0, max_pending=65536,
+                 buffer_size=1 << 16):
+        self._file = open(path, "a", encoding="utf-8", buffering=buffer_size)
+        super().__init__(verbosity, sample_rate, clock, flush_interval, max_pending)
+
+    def _write(self, events):
+        self._file.write("".join(json.dumps(self.format_record(event)) + "\n" for event in events))
+
+    def _flush_output(self):
+        self._file.flush()
+
+    def _close_output(self):
+        self._file.close()
+
+
+class BinaryFileSink(BufferedSink):
+    """
+    Writes events in a compact binary form: strings (session ids, tags, options, responses) are written once
+    and then referred to by code, intensities and scores are packed doubles. read_binary_events() reads it back.
+    """
+    def __init__(self, path, verbosity="full", sample_rate=1.0, clock=None, flush_interval=1.0, max_pending=65536,
+                 buffer_size=1 << 16):
+        self._file = open(path, "wb", buffering=buffer_size)
+        self._file.write(BINARY_MAGIC)
+        self._string_codes = {}
+        super().__init__(verbosity, sample_rate, clock, flush_interval, max_pending)
+
+    def _code(self, chunks, value):
+        code = self._string_codes.get(value)
+        if code is None:
+            code = self._string_codes[value] = len(self._string_codes)
+            encoded = value.encode("utf-8")
+            chunks.append(_STRING_HEADER.pack(_STRING_RECORD, len(encoded)))
+            chunks.append(encoded)
+        return code
+
+    def _write(self, events):
+        chunks = []
+        mask = sum(1 << index for index, field in enumerate(TURN_FIELDS) if field in self.fields)
+        for timestamp, session_id, turn in events:
+            session_code = -1 if session_id is None else self._code(chunks, str(session_id))
+            body = []
+            if "emotion_path" in self.fields:
+                tags = turn["emotion_path"]
+                body.append(_COUNT.pack(len(tags)))
+                body.extend(_CODE.pack(self._code(chunks, tag)) for tag in tags)
+            if "emotion_intensities" in self.fields:
+                intensities = turn["emotion_intensities"]
+                body.append(_INTENSITIES.pack(*(intensities.get(emotion, 0.0) for emotion in EMOTION_CATEGORIES)))
+            if "decision_scores" in self.fields:
+                scores = turn["decision_scores"]
+                body.append(_COUNT.pack(len(scores)))
+                body.extend(_SCORE.pack(self._code(chunks, option), score) for option, score in scores.items())
+            for field in ("chosen_option", "ai_response"):
+                if field in self.fields:
+                    body.append(_CODE.pack(self._code(chunks, turn[field])))
+            chunks.append(_TURN_HEADER.pack(_TURN_RECORD, timestamp, session_code, mask))
+            chunks.extend(body)
+        self._file.write(b"".join(chunks))
+
+    def _flush_output(self):
+        self._file.flush()
+
+    def _close_output(self):
+        self._file.close()
+
+
+class ConsoleSink(BufferedSink):
+    """Writes each event as the human-readable lines main() used to print, off the turn path."""
+    def __init__(self, stream=None, verbosity="full", sample_rate=1.0, clock=None, flush_interval=0.1, max_pending=65536):
+        self.stream = stream or sys.stdout
+        super().__init__(verbosity, sample_rate, clock, flush_interval, max_pending)
+
+    def _write(self, events):
+        lines = []
+        for _, _, turn in events:
+            lines.extend(f"{CONSOLE_LABELS[field]}: {turn[field]}\n" for field in TURN_FIELDS if field in self.fields)
+            lines.append("\n\n")
+        self.stream.write("".join(lines))
+
+    def _flush_output(self):
+        self.stream.flush()
+
+
+def read_binary_events(path):
+    """Yields the records of a BinaryFileSink file, as format_record() would have made them (session ids as strings)."""
+    with open(path, "rb") as event_file:
+        if os.fstat(event_file.fileno()).st_size < len(BINARY_MAGIC):
+            raise ValueError(f"{path} is not a Cadence binary event file")
+        with mmap.mmap(event_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+                raise ValueError(f"{path} is not a Cadence binary event file")
+            yield from _iter_binary_records(data)
+
+
+def _iter_binary_records(data):
+    strings = []
+    offset = len(BINARY_MAGIC)
+    while offset < len(data):
+        if data[offset] == _STRING_RECORD:
+            _, length = _STRING_HEADER.unpack_from(data, offset)
+            offset += _STRING_HEADER.size
+            strings.append(data[offset:offset + length].decode("utf-8"))
+            offset += length
+            continue
+        _, timestamp, session_code, mask = _TURN_HEADER.unpack_from(data, offset)
+        offset += _TURN_HEADER.size
+        record = {"time": timestamp}
+        if session_code >= 0:
+            record["session"] = strings[session_code]
+        for index, field in enumerate(TURN_FIELDS):
+            if not mask & (1 << index):
+                continue
+            if field == "emotion_path":
+                count, = _COUNT.unpack_from(data, offset)
+                offset += _COUNT.size
+                record[field] = [strings[code] for code, in _CODE.iter_unpack(data[offset:offset + count * _CODE.size])]
+                offset += count * _CODE.size
+            elif field == "emotion_intensities":
+                record[field] = dict(zip(EMOTION_CATEGORIES, _INTENSITIES.unpack_from(data, offset)))
+                offset += _INTENSITIES.size
+            elif field == "decision_scores":
+                count, = _COUNT.unpack_from(data, offset)
+                offset += _COUNT.size
+                record[field] = {strings[code]: score for code, score in _SCORE.iter_unpack(data[offset:offset + count * _SCORE.size])}
+                offset += count * _SCORE.size
+            else:
+                code, = _CODE.unpack_from(data, offset)
+                offset += _CODE.size
+                record[field] = strings[code]
+        yield record
+
+
+def open_event_sink(path, verbosity="full", sample_rate=1.0, clock=None):
+    """A JSONL sink for .jsonl/.ndjson paths, a binary sink otherwise; "-" is the console."""
+    if path == "-":
+        return ConsoleSink(verbosity=verbosity, sample_rate=sample_rate, clock=clock)
+    if path.lower().endswith((".jsonl", ".ndjson")):
+        return JsonlFileSink(path, verbosity, sample_rate, clock)
+    return BinaryFileSink(path, verbosity, sample_rate, clock)
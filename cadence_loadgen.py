@@ -0,0 +1,219 @@
+# cadence_loadgen.py
+import argparse
+import json
+import math
+import os
+import random
+import resource
+import sys
+import time
+
+from emotional_ai_module import EmotionAI_PathBased_DynamicIntensity_V3, get_appraisal_index
+from mind_ai_module import MindAI_Learning
+from decision_history_store import ColumnarDecisionHistory
+from main_ai_system import run_turn
+
+NEUTRAL_WORDS = ("the", "a", "today", "about", "we", "plan", "report", "after", "lunch", "maybe", "next", "system", "later", "notes")
+SLOWDOWN_EXPONENT = 0.1 # Latency growing faster than turns**0.1 over the run is flagged
+
+
+def stimulus_vocabulary(appraisal_index=None):
+    """
+    Keywords per category pathway of the appraisal rules in effect, plus "neutral" (no keywords).
+    A keyword is only kept if, on its own, it selects its category's pathway or one of its refinements:
+    refinement-only keywords ("surprise", "won award") and keywords caught by an earlier category are left out.
+    """
+    appraisal_index = appraisal_index or get_appraisal_index()
+    vocabulary = {}
+    for category_keywords, category_pathway, sub_rules in appraisal_index.rules:
+        keywords = vocabulary.setdefault(category_pathway, [])
+        pathways = {category_pathway}.union(sub_pathway for _, sub_pathway in sub_rules)
+        for rule_keywords in (category_keywords,) + tuple(sub_keywords for sub_keywords, _ in sub_rules):
+            keywords.extend(keyword for keyword in rule_keywords
+                            if keyword not in keywords and appraisal_index.select_pathway(keyword) in pathways)
+    vocabulary["neutral"] = []
+    return vocabulary
+
+
+def filler_words(appraisal_index=None):
+    """NEUTRAL_WORDS that contain no keyword of the appraisal rules in effect."""
+    appraisal_index = appraisal_index or get_appraisal_index()
+    return [word for word in NEUTRAL_WORDS if appraisal_index.select_pathway(word) == appraisal_index.default_pathway]
+
+
+def parse_mix(mix, vocabulary):
+    """
+    Parses "category=weight,..." into {category: weight}. "uniform" (the default) weights every category
+    of the vocabulary equally.
+    """
+    if not mix or mix == "uniform":
+        return {category: 1.0 for category in vocabulary}
+    weights = {}
+    for item in mix.split(","):
+        category, _, weight = item.partition("=")
+        category = category.strip()
+        if category not in vocabulary:
+            raise ValueError(f"Unknown stimulus category {category!r}; choose from {', '.join(vocabulary)}")
+        weights[category] = float(weight or 1.0)
+    return weights
+
+
+class StimulusGenerator:
+    """Synthetic user messages: filler words around keywords of a category drawn by weight."""
+    def __init__(self, mix, vocabulary, rng, min_words=4, max_words=24, filler=NEUTRAL_WORDS):
+        self.categories = list(mix)
+        self.weights = [mix[category] for category in self.categories]
+        self.vocabulary = vocabulary
+        self.rng = rng
+        self.min_words = min_words
+        self.max_words = max_words
+        self.filler = filler
+
+    def __call__(self):
+        rng = self.rng
+        words = [rng.choice(self.filler) for _ in range(rng.randint(self.min_words, self.max_words))]
+        keywords = self.vocabulary[rng.choices(self.categories, self.weights)[0]]
+        if keywords:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+        return " ".join(words)
+
+
+def current_rss_bytes():
+    """Resident set size now (Linux /proc), or the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def growth_exponent(turns, latencies):
+    """Least-squares slope of log(latency) against log(cumulative turns): ~0 when flat, 1 when linear."""
+    points = [(math.log(turn_count), math.log(latency)) for turn_count, latency in zip(turns, latencies) if turn_count > 0 and latency > 0]
+    if len(points) < 3:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread if spread else 0.0
+
+
+def run_load(sessions=1000, duration=60.0, interval=10.0, mix=None, rate=None, seed=0, history="list",
+             history_capacity=None, report=None):
+    """
+    Drives synthetic sessions through run_turn() for duration seconds, calling report(sample) every interval.
+    Each sample covers one interval: turns/s, p50/p99 latency, RSS and total decision history size.
+    rate caps turns per second (None = as fast as possible). Returns the summary dict.
+    """
+    rng = random.Random(seed)
+    vocabulary = stimulus_vocabulary()
+    generate = StimulusGenerator(parse_mix(mix, vocabulary), vocabulary, rng, filler=filler_words())
+
+    def new_session():
+        decision_history = ColumnarDecisionHistory(capacity=history_capacity) if history == "columnar" else None
+        return EmotionAI_PathBased_DynamicIntensity_V3(), MindAI_Learning(decision_history)
+
+    states = [new_session() for _ in range(sessions)]
+    samples, latencies = [], []
+    total_turns = 0
+    started = next_report = time.monotonic()
+    next_report += interval
+    interval_started = started
+    rss_start = current_rss_bytes()
+
+    while True:
+        now = time.monotonic()
+        if now >= next_report or now - started >= duration:
+            latencies.sort()
+            sample = {
+                "elapsed": round(now - started, 3),
+                "turns": total_turns,
+                "tps": len(latencies) / (now - interval_started) if now > interval_started else 0.0,
+                "p50_ms": percentile(latencies, 0.50) / 1e6,
+                "p99_ms": percentile(latencies, 0.99) / 1e6,
+                "rss_bytes": current_rss_bytes(),
+                "history_records": sum(len(mind_ai_learner.decision_history) for _, mind_ai_learner in states),
+            }
+            samples.append(sample)
+            if report is not None:
+                report(sample)
+            latencies = []
+            interval_started, next_report = now, now + interval
+            if now - started >= duration:
+                break
+        if rate is not None:
+            delay = started + total_turns / rate - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+        emotion_ai, mind_ai_learner = states[rng.randrange(sessions)]
+        text = generate()
+        turn_started = time.perf_counter_ns()
+        run_turn(emotion_ai, mind_ai_learner, text)
+        latencies.append(time.perf_counter_ns() - turn_started)
+        total_turns += 1
+
+    return summarize(samples, rss_start, started)
+
+
+def summarize(samples, rss_start, started):
+    measured = [sample for sample in samples[1:] if sample["tps"]] # The first interval includes warm-up
+    exponent = growth_exponent([sample["turns"] for sample in measured], [sample["p50_ms"] for sample in measured])
+    total_turns = samples[-1]["turns"] if samples else 0
+    elapsed = samples[-1]["elapsed"] if samples else time.monotonic() - started
+    rss_end = samples[-1]["rss_bytes"] if samples else rss_start
+    warnings = []
+    if exponent > SLOWDOWN_EXPONENT:
+        warnings.append(f"p50 latency grows like turns^{exponent:.2f}: per-turn cost increases with accumulated state")
+    if measured and measured[-1]["p50_ms"] > 2 * measured[0]["p50_ms"]:
+        warnings.append(f"p50 latency doubled during the run ({measured[0]['p50_ms']:.3f} ms -> {measured[-1]['p50_ms']:.3f} ms)")
+    return {
+        "turns": total_turns,
+        "elapsed": elapsed,
+        "tps": total_turns / elapsed if elapsed else 0.0,
+        "p50_ms": sorted(sample["p50_ms"] for sample in measured)[len(measured) // 2] if measured else 0.0,
+        "p99_ms": max((sample["p99_ms"] for sample in measured), default=0.0),
+        "rss_start_bytes": rss_start,
+        "rss_end_bytes": rss_end,
+        "rss_bytes_per_turn": (rss_end - rss_start) / total_turns if total_turns else 0.0,
+        "latency_growth_exponent": exponent,
+        "warnings": warnings,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak-test the Cadence pipeline with synthetic concurrent sessions.")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds to run (hours are fine)")
+    parser.add_argument("--interval", type=float, default=10.0, help="Seconds per report line")
+    parser.add_argument("--mix", help='Stimulus mix, e.g. "stimulus_social_cue=5,neutral=3,negative_stimulus_threat=1" (default: uniform)')
+    parser.add_argument("--rate", type=float, help="Target turns per second (default: as fast as possible)")
+    parser.add_argument("--history", choices=("list", "columnar"), default="list", help="Decision history backend")
+    parser.add_argument("--history-capacity", type=int, help="Ring capacity for columnar histories")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--list-categories", action="store_true", help="Print the stimulus categories and exit")
+    args = parser.parse_args()
+
+    if args.list_categories:
+        for category, keywords in stimulus_vocabulary().items():
+            print(f"{category}: {', '.join(keywords) or '(no keywords)'}")
+        return
+
+    summary = run_load(args.sessions, args.duration, args.interval, args.mix, args.rate, args.seed, args.history,
+                       args.history_capacity, report=lambda sample: print(json.dumps(sample), flush=True))
+    print(json.dumps({"summary": summary}), flush=True)
+    for warning in summary["warnings"]:
+        print(f"WARNING: {warning}", file=sys.stderr)
+    if summary["warnings"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
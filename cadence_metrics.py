@@ -0,0 +1,186 @@
+# cadence_metrics.py
+import json
+import sys
+import time
+import weakref
+
+from emotional_ai_module import get_appraisal_cache
+
+PIPELINE_STAGES = ("appraisal", "mind", "executor", "record", "decay")
+PROMETHEUS_BUCKETS = range(10, 31) # Exported histogram buckets: le = 2**b ns, about 1 us to 1 s
+
+
+class LatencyHistogram:
+    """
+    Latency histogram with power-of-two nanosecond buckets: bucket b counts samples in [2**(b-1), 2**b).
+    Recording is an int.bit_length() and a list increment.
+    """
+    __slots__ = ("buckets", "count", "total_ns", "max_ns")
+
+    def __init__(self):
+        self.buckets = [0] * 64
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, elapsed_ns):
+        self.buckets[min(elapsed_ns.bit_length(), 63)] += 1
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def percentile(self, fraction):
+        """Upper bound (ns) of the bucket holding the given fraction of samples, 0 if empty."""
+        if not self.count:
+            return 0
+        threshold, seen = fraction * self.count, 0
+        for bucket, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= threshold:
+                return min(1 << bucket, self.max_ns)
+        return self.max_ns
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "total_ns": self.total_ns,
+            "mean_ns": self.total_ns / self.count if self.count else 0.0,
+            "p50_ns": self.percentile(0.5),
+            "p99_ns": self.percentile(0.99),
+            "max_ns": self.max_ns,
+            # Upper bound (ns) -> count, non-empty buckets only
+            "buckets": {str(1 << bucket): bucket_count for bucket, bucket_count in enumerate(self.buckets) if bucket_count},
+        }
+
+
+def emotion_state_bytes(emotion_ai):
+    """Approximate bytes of an emotion AI's per-session state (fixed size: one entry per emotion)."""
+    if not isinstance(getattr(emotion_ai, "emotion_intensity_levels", None), dict):
+        return 0 # Pool sessions: a row of the pool's shared array
+    return sys.getsizeof(emotion_ai.emotion_intensity_levels) + sys.getsizeof(emotion_ai.intensity_decay_rates)
+
+
+def mind_state_bytes(mind_ai_learner):
+    """
+    Approximate bytes of a Mind AI's state: learning dicts plus the decision history.
+    List histories are estimated from their newest record, so this stays cheap for long histories.
+    """
+    size = sys.getsizeof(mind_ai_learner.outcome_counts) + sys.getsizeof(mind_ai_learner._penalty_cache)
+    size += sum(sys.getsizeof(entry[0]) for entry in mind_ai_learner._penalty_cache.values())
+    history = mind_ai_learner.decision_history
+    if isinstance(history, list):
+        size += sys.getsizeof(history)
+        if history:
+            record = history[-1]
+            size += len(history) * (sys.getsizeof(record) + sys.getsizeof(record["emotion_path"]) + sys.getsizeof(record["timestamp"]))
+    else:
+        size += history.nbytes
+    return size
+
+
+class PipelineMetrics:
+    """
+    Opt-in instrumentation for run_turn(): per-stage latency histograms, pathway selection counts,
+    and (computed on snapshot) decision history size and state memory of every session seen.
+
+    Stages are timed as laps: start() at the beginning of a turn, then lap(stage) at the end of each stage.
+    One instance is meant to be driven from one thread (or one event loop) at a time.
+    """
+    def __init__(self):
+        self.stage_latency = {stage: LatencyHistogram() for stage in PIPELINE_STAGES}
+        self.turn_latency = LatencyHistogram()
+        self.pathway_counts = {}
+        self.started = time.time()
+        self._sessions = {} # session id -> (weakref to Mind AI, emotion state bytes)
+        self._turn_start = 0
+        self._lap_start = 0
+
+    def start(self):
+        self._turn_start = self._lap_start = time.perf_counter_ns()
+
+    def lap(self, stage):
+        """Records the time since the previous lap (or start()) under stage."""
+        now = time.perf_counter_ns()
+        self.stage_latency[stage].record(now - self._lap_start)
+        self._lap_start = now
+
+    def record_turn(self, emotion_ai, mind_ai_learner, session_id=None):
+        """Ends a turn: total latency, the selected pathway, and which session state to report on."""
+        self.turn_latency.record(time.perf_counter_ns() - self._turn_start)
+        pathway = getattr(emotion_ai, "last_pathway", None)
+        self.pathway_counts[pathway] = self.pathway_counts.get(pathway, 0) + 1
+        session = self._sessions.get(session_id)
+        if session is None or session[0]() is not mind_ai_learner:
+            self._sessions[session_id] = (weakref.ref(mind_ai_learner), emotion_state_bytes(emotion_ai))
+
+    def forget_session(self, session_id):
+        self._sessions.pop(session_id, None)
+
+    def snapshot(self):
+        """Returns all metrics as a plain dict (JSON-serializable)."""
+        sessions = {}
+        for session_id, (mind_ref, emotion_bytes) in list(self._sessions.items()):
+            mind_ai_learner = mind_ref()
+            if mind_ai_learner is None:
+                del self._sessions[session_id] # Session state was garbage collected
+                continue
+            sessions[str(session_id)] = {
+                "decision_history_records": len(mind_ai_learner.decision_history),
+                "state_bytes": emotion_bytes + mind_state_bytes(mind_ai_learner),
+            }
+        return {
+            "uptime_seconds": time.time() - self.started,
+            "turns": self.turn_latency.count,
+            "turn_latency": self.turn_latency.snapshot(),
+            "stage_latency": {stage: histogram.snapshot() for stage, histogram in self.stage_latency.items()},
+            "pathway_counts": {str(pathway): count for pathway, count in self.pathway_counts.items()},
+            "decision_history_records": sum(session["decision_history_records"] for session in sessions.values()),
+            "state_bytes": sum(session["state_bytes"] for session in sessions.values()),
+            "sessions": sessions,
+            "appraisal_cache": get_appraisal_cache().stats() if get_appraisal_cache() is not None else None,
+        }
+
+    def to_json(self, indent=None):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix="cadence"):
+        """Renders a snapshot in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = []
+
+        def sample(name, labels, value):
+            lines.append(f"{prefix}_{name}{{{','.join(labels)}}} {value}" if labels else f"{prefix}_{name} {value}")
+
+        def histogram(name, help_text, histograms):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} histogram")
+            for labels, latency in histograms:
+                for bucket in PROMETHEUS_BUCKETS:
+                    cumulative = sum(latency.buckets[:bucket + 1])
+                    sample(f"{name}_bucket", labels + [f'le="{(1 << bucket) / 1e9:.10g}"'], cumulative)
+                sample(f"{name}_bucket", labels + ['le="+Inf"'], latency.count)
+                sample(f"{name}_sum", labels, f"{latency.total_ns / 1e9:.9g}")
+                sample(f"{name}_count", labels, latency.count)
+
+        def metric(name, metric_type, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+            for labels, value in samples:
+                sample(name, labels, value)
+
+        histogram("turn_latency_seconds", "Latency of a whole run_turn() call.", [([], self.turn_latency)])
+        histogram("stage_latency_seconds", "Latency of each pipeline stage.",
+                  [([f'stage="{stage}"'], latency) for stage, latency in self.stage_latency.items()])
+        metric("turns_total", "counter", "Turns processed.", [([], snapshot["turns"])])
+        metric("pathway_selected_total", "counter", "Turns per selected appraisal pathway.",
+               [([f'pathway="{_escape_label(pathway)}"'], count) for pathway, count in snapshot["pathway_counts"].items()])
+        metric("decision_history_records", "gauge", "Decision history records per session.",
+               [([f'session="{_escape_label(session_id)}"'], session["decision_history_records"]) for session_id, session in snapshot["sessions"].items()])
+        metric("session_state_bytes", "gauge", "Approximate state memory per session.",
+               [([f'session="{_escape_label(session_id)}"'], session["state_bytes"]) for session_id, session in snapshot["sessions"].items()])
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
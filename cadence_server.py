@@ -0,0 +1,233 @@
+# cadence_server.py
+import argparse
+import asyncio
+import functools
+import json
+import os
+import signal
+import sys
+
+from emotional_ai_module import EmotionAI_PathBased_DynamicIntensity_V3, enable_appraisal_cache, reload_appraisal_rules
+from mind_ai_module import MindAI_Learning
+from main_ai_system import run_turn
+from cadence_metrics import PipelineMetrics
+from cadence_events import VERBOSITY_FIELDS, open_event_sink
+from cadence_snapshot import load_sessions, save_sessions
+from session_paging import PagedSessions
+
+
+class CadenceServer:
+    """
+    Asyncio front end serving many Cadence sessions over a local socket.
+
+    Protocol: newline-delimited JSON. Each request line is {"session": <id>, "text": <user input>} plus an
+    optional "id" that is echoed back; each response line carries the run_turn() result, or {"error": ...}.
+    With metrics enabled, {"stats": "json"} returns the metrics snapshot and {"stats": "prometheus"} returns
+    {"prometheus": <exposition text>}. Requests on one connection are answered in order. Each connection has
+    a bounded queue: when it is full the server stops reading from that socket, so TCP flow control pushes
+    back on the client. With a rules_path, SIGHUP reloads the appraisal rules from it without a restart.
+    """
+    def __init__(self, host="127.0.0.1", port=8765, unix_path=None, max_pending=64, max_line_bytes=1 << 20,
+                 emotion_ai_factory=EmotionAI_PathBased_DynamicIntensity_V3, mind_ai_factory=MindAI_Learning, metrics=None,
+                 rules_path=None, rules_cache_dir=None, events=None, sessions=None):
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.max_pending = max_pending
+        self.max_line_bytes = max_line_bytes
+        self.emotion_ai_factory = emotion_ai_factory
+        self.mind_ai_factory = mind_ai_factory
+        self.metrics = metrics # Optional cadence_metrics.PipelineMetrics
+        self.events = events # Optional cadence_events.EventSink recording every turn
+        self.rules_path = rules_path # Appraisal rules data file reloaded on SIGHUP
+        self.rules_cache_dir = rules_cache_dir
+        # session id -> (emotion_ai, mind_ai_learner): a dict, or a session_paging.PagedSessions under a memory budget
+        self.sessions = sessions if sessions is not None else {}
+        self._server = None
+        self._connections = {} # connection handler task -> StreamReader
+        self._closing = False
+
+    async def start(self):
+        if self.unix_path:
+            self._server = await asyncio.start_unix_server(self._handle_connection, self.unix_path, limit=self.max_line_bytes)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, self.host, self.port, limit=self.max_line_bytes)
+        return self._server
+
+    @property
+    def sockets(self):
+        return self._server.sockets if self._server else ()
+
+    async def serve_forever(self):
+        """Serves until SIGINT/SIGTERM, then shuts down gracefully."""
+        if self._server is None:
+            await self.start()
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signal_number, stop.set)
+        if self.rules_path:
+            loop.add_signal_handler(signal.SIGHUP, self.reload_rules)
+        try:
+            await stop.wait()
+        finally:
+            for signal_number in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP):
+                loop.remove_signal_handler(signal_number)
+            await self.shutdown()
+
+    def reload_rules(self):
+        """Recompiles rules_path and swaps it in; turns already running finish on the old rules."""
+        try:
+            reload_appraisal_rules(self.rules_path, self.rules_cache_dir)
+        except (OSError, ValueError) as error:
+            print(f"Keeping current appraisal rules, reload failed: {error}", file=sys.stderr)
+        else:
+            print(f"Reloaded appraisal rules from {self.rules_path}", file=sys.stderr)
+
+    async def shutdown(self):
+        """Stops accepting connections and reading requests, answers everything already queued, then closes."""
+        self._closing = True
+        if self._server is not None:
+            self._server.close()
+        for reader in self._connections.values():
+            reader.feed_eof() # Ends the connection's read loop; its worker drains the queue
+        if self._connections:
+            await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    def session(self, session_id):
+        """Returns (emotion_ai, mind_ai_learner) for a session, creating it on first use."""
+        state = self.sessions.get(session_id)
+        if state is None:
+            state = self.sessions[session_id] = (self.emotion_ai_factory(), self.mind_ai_factory())
+        return state
+
+    def handle_request(self, request):
+        """Runs one decoded request through the pipeline and returns the response object."""
+        if isinstance(request, dict) and "stats" in request:
+            return self.stats(request["stats"])
+        if (not isinstance(request, dict) or not isinstance(request.get("session"), (str, int))
+                or not isinstance(request.get("text"), str)):
+            return {"error": "expected {\"session\": ..., \"text\": \"...\"}"}
+        emotion_ai, mind_ai_learner = self.session(request["session"])
+        response = run_turn(emotion_ai, mind_ai_learner, request["text"], self.metrics, request["session"], self.events)
+        response["session"] = request["session"]
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    def stats(self, output_format="json"):
+        if self.metrics is None:
+            return {"error": "metrics are disabled"}
+        if output_format == "prometheus":
+            return {"prometheus": self.metrics.to_prometheus()}
+        snapshot = self.metrics.snapshot()
+        if isinstance(self.sessions, PagedSessions):
+            snapshot["paging"] = self.sessions.stats()
+        return snapshot
+
+    async def _handle_connection(self, reader, writer):
+        if self._closing:
+            writer.close()
+            return
+        self._connections[asyncio.current_task()] = reader
+        queue = asyncio.Queue(maxsize=self.max_pending)
+        worker = asyncio.create_task(self._process_queue(queue, writer))
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    await queue.put(("error", "request line too long"))
+                    break
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    item = ("request", json.loads(line))
+                except ValueError:
+                    item = ("error", "invalid JSON")
+                await queue.put(item) # Waits while the queue is full: backpressure
+        finally:
+            await queue.put(None)
+            await worker
+            del self._connections[asyncio.current_task()]
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _process_queue(self, queue, writer):
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            kind, payload = item
+            if kind == "request":
+                try:
+                    response = self.handle_request(payload)
+                except Exception as error: # E.g. a session store error: answer it and keep draining the queue
+                    response = {"error": str(error)}
+                    if isinstance(payload, dict) and "id" in payload:
+                        response["id"] = payload["id"]
+            else:
+                response = {"error": payload}
+            try:
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+            except ConnectionError:
+                pass # Client went away; keep draining so the reader side can finish
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Cadence sessions over newline-delimited JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", dest="unix_path", help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument("--max-pending", type=int, default=64, help="Queued requests per connection before backpressure")
+    parser.add_argument("--metrics", action="store_true", help="Record per-stage latency and session metrics (see the stats request)")
+    parser.add_argument("--rules", help="Appraisal rules data file, loaded at startup and reloaded on SIGHUP")
+    parser.add_argument("--rules-cache", help="Directory caching compiled rules by content hash")
+    parser.add_argument("--snapshot", help="Restore sessions from this snapshot file at startup and save them to it on shutdown")
+    parser.add_argument("--session-store", help="Page least recently used sessions out to this SQLite file to stay within --memory-budget")
+    parser.add_argument("--memory-budget", type=float, default=256, metavar="MB", help="Resident session memory with --session-store")
+    parser.add_argument("--appraisal-cache", type=int, default=0, metavar="ENTRIES", help="Cache pathway selection for this many distinct texts")
+    parser.add_argument("--multi-label", action="store_true", help="Blend every matched appraisal pathway instead of the first")
+    parser.add_argument("--events", metavar="PATH", help="Record every turn to this file (.jsonl: JSON lines, otherwise binary; -: console)")
+    parser.add_argument("--events-verbosity", choices=tuple(VERBOSITY_FIELDS), default="full")
+    parser.add_argument("--events-sample", type=float, default=1.0, metavar="RATE", help="Fraction of turns to record")
+    args = parser.parse_args()
+    if args.snapshot and args.session_store:
+        parser.error("--snapshot and --session-store are exclusive: the session store already persists sessions")
+
+    if args.appraisal_cache:
+        enable_appraisal_cache(args.appraisal_cache)
+    emotion_ai_factory = EmotionAI_PathBased_DynamicIntensity_V3
+    if args.multi_label:
+        emotion_ai_factory = functools.partial(EmotionAI_PathBased_DynamicIntensity_V3, appraisal_mode="multi")
+    server = CadenceServer(host=args.host, port=args.port, unix_path=args.unix_path, max_pending=args.max_pending,
+                           emotion_ai_factory=emotion_ai_factory,
+                           metrics=PipelineMetrics() if args.metrics else None,
+                           rules_path=args.rules, rules_cache_dir=args.rules_cache,
+                           events=open_event_sink(args.events, args.events_verbosity, args.events_sample) if args.events else None,
+                           sessions=PagedSessions(args.session_store, int(args.memory_budget * (1 << 20)), emotion_ai_factory) if args.session_store else None)
+    if args.rules:
+        reload_appraisal_rules(args.rules, args.rules_cache)
+    if args.snapshot and os.path.exists(args.snapshot):
+        server.sessions.update(load_sessions(args.snapshot))
+    asyncio.run(server.serve_forever())
+    if server.events is not None:
+        server.events.close()
+    if args.session_store:
+        server.sessions.close()
+    if args.snapshot:
+        save_sessions(args.snapshot, server.sessions)
+
+
+if __name__ == "__main__":
+    main()
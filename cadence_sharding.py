@@ -0,0 +1,182 @@
+# cadence_sharding.py
+import multiprocessing
+import os
+import queue
+import time
+import zlib
+
+from emotional_ai_module import EmotionAI_PathBased_DynamicIntensity_V3
+from mind_ai_module import MindAI_Learning
+from main_ai_system import run_turn
+
+
+def shard_for(session_id, shard_count):
+    """Stable shard index for a session id (crc32 of its text form, so it doesn't depend on hash seeds)."""
+    return zlib.crc32(str(session_id).encode("utf-8")) % shard_count
+
+
+def _shard_worker(shard_index, requests, results, emotion_ai_factory, mind_ai_factory):
+    """Worker process loop: owns the state of every session hashed to this shard and runs their turns in order."""
+    sessions = {} # session id -> (emotion_ai, mind_ai_learner)
+    turns = batches = errors = 0
+    busy_seconds = 0.0
+    while True:
+        message = requests.get()
+        if message is None:
+            return
+        kind, payload = message
+        if kind == "turns":
+            started = time.perf_counter()
+            batch_results = []
+            for index, session_id, text in payload:
+                state = sessions.get(session_id)
+                if state is None:
+                    state = sessions[session_id] = (emotion_ai_factory(), mind_ai_factory())
+                try:
+                    batch_results.append((index, run_turn(state[0], state[1], text)))
+                except Exception as error: # Report the failed turn, keep the shard alive
+                    errors += 1
+                    batch_results.append((index, {"error": f"{type(error).__name__}: {error}"}))
+            turns += len(payload)
+            batches += 1
+            busy_seconds += time.perf_counter() - started
+            results.put(("turns", shard_index, batch_results))
+        elif kind == "stats":
+            results.put(("stats", shard_index, {
+                "pid": os.getpid(), "sessions": len(sessions), "turns": turns, "batches": batches,
+                "errors": errors, "busy_seconds": busy_seconds,
+            }))
+
+
+class ShardedRuntime:
+    """
+    Runs Cadence turns on a pool of worker processes, one shard per process.
+
+    Sessions are hashed to shards (shard_for), and each shard process owns the Emotion/Mind AI state of its
+    sessions, so a session's turns always run in one process, in submission order. The router buffers turns
+    per shard and ships them in batches of up to batch_size to amortize IPC; at most max_inflight batches
+    per shard are outstanding. Results come back in the order the turns were submitted.
+    """
+    def __init__(self, shard_count=None, batch_size=64, max_inflight=2,
+                 emotion_ai_factory=EmotionAI_PathBased_DynamicIntensity_V3, mind_ai_factory=MindAI_Learning,
+                 start_method=None):
+        self.shard_count = shard_count or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.max_inflight = max_inflight
+        context = multiprocessing.get_context(start_method)
+        self._results = context.Queue()
+        self._requests = [context.Queue() for _ in range(self.shard_count)]
+        self._workers = [
+            context.Process(target=_shard_worker, args=(shard_index, self._requests[shard_index], self._results,
+                                                       emotion_ai_factory, mind_ai_factory), daemon=True)
+            for shard_index in range(self.shard_count)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+        self._buffers = [[] for _ in range(self.shard_count)] # Turns waiting to be batched, per shard
+        self._inflight = [0] * self.shard_count # Batches sent and not yet answered, per shard
+        self._completed = {} # Submission index -> result, until it can be yielded in order
+        self._next_index = 0 # Next submission index
+        self._batches_sent = [0] * self.shard_count
+        self._turns_sent = [0] * self.shard_count
+        self._closed = False
+
+    def map_turns(self, turns):
+        """
+        Runs (session_id, text) turns and yields their run_turn() results in submission order.
+        Streams: only the turns in flight and the results waiting for an earlier turn are held in memory.
+        """
+        self._drain() # Leftovers of an abandoned earlier map_turns() call
+        next_to_yield = self._next_index
+        for session_id, text in turns:
+            shard_index = shard_for(session_id, self.shard_count)
+            self._buffers[shard_index].append((self._next_index, session_id, text))
+            self._next_index += 1
+            if len(self._buffers[shard_index]) >= self.batch_size:
+                self._send(shard_index)
+            while next_to_yield in self._completed:
+                yield self._completed.pop(next_to_yield)
+                next_to_yield += 1
+        for shard_index in range(self.shard_count):
+            if self._buffers[shard_index]:
+                self._send(shard_index)
+        while next_to_yield < self._next_index:
+            while next_to_yield not in self._completed:
+                self._receive()
+            yield self._completed.pop(next_to_yield)
+            next_to_yield += 1
+
+    def run_turns(self, turns):
+        """map_turns() collected into a list."""
+        return list(self.map_turns(turns))
+
+    def stats(self):
+        """Per-shard statistics from the router (batching) and from each worker (sessions, turns, busy time)."""
+        self._drain()
+        for requests in self._requests:
+            requests.put(("stats", None))
+        shard_stats = [None] * self.shard_count
+        while any(stats is None for stats in shard_stats):
+            kind, shard_index, payload = self._get_result()
+            if kind == "stats":
+                shard_stats[shard_index] = payload
+        for shard_index, stats in enumerate(shard_stats):
+            stats["shard"] = shard_index
+            stats["batches_sent"] = self._batches_sent[shard_index]
+            stats["turns_sent"] = self._turns_sent[shard_index]
+            stats["mean_batch_size"] = self._turns_sent[shard_index] / self._batches_sent[shard_index] if self._batches_sent[shard_index] else 0.0
+        return shard_stats
+
+    def close(self):
+        """Stops the workers after they finish the batches already sent."""
+        if self._closed:
+            return
+        self._closed = True
+        for requests in self._requests:
+            requests.put(None)
+        for worker in self._workers:
+            worker.join()
+        for requests in self._requests:
+            requests.close()
+        self._results.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _drain(self):
+        """Sends buffered turns, waits for every batch in flight and drops results nobody is waiting for."""
+        for shard_index in range(self.shard_count):
+            if self._buffers[shard_index]:
+                self._send(shard_index)
+        while any(self._inflight):
+            self._receive()
+        self._completed.clear()
+
+    def _send(self, shard_index):
+        while self._inflight[shard_index] >= self.max_inflight:
+            self._receive()
+        batch, self._buffers[shard_index] = self._buffers[shard_index], []
+        self._requests[shard_index].put(("turns", batch))
+        self._inflight[shard_index] += 1
+        self._batches_sent[shard_index] += 1
+        self._turns_sent[shard_index] += len(batch)
+
+    def _receive(self):
+        """Waits for one batch of results and files them by submission index."""
+        kind, shard_index, payload = self._get_result()
+        if kind == "turns":
+            self._inflight[shard_index] -= 1
+            self._completed.update(payload)
+
+    def _get_result(self):
+        while True:
+            try:
+                return self._results.get(timeout=1.0)
+            except queue.Empty:
+                dead = [shard_index for shard_index, worker in enumerate(self._workers) if not worker.is_alive()]
+                if dead:
+                    raise RuntimeError(f"Shard worker(s) {dead} exited unexpectedly")
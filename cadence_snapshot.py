@@ -0,0 +1,324 @@
+# cadence_snapshot.py
+import contextlib
+import gc
+import json
+import os
+import struct
+import time
+
+import numpy as np
+
+from emotional_ai_module import EmotionAI_PathBased_DynamicIntensity_V3, EMOTION_CATEGORIES
+from mind_ai_module import MindAI_Learning
+from decision_history_store import ColumnarDecisionHistory
+from emotion_session_pool import EmotionSessionPool
+
+SNAPSHOT_MAGIC = b"CADSNAP1"
+SNAPSHOT_VERSION = 2 # 2 added the appraisal mode: emotion.parameter_multi_label, and the pool section's appraisal_mode
+SNAPSHOT_READABLE_VERSIONS = (1, 2) # Version 1 instances restore in "single" appraisal mode
+SNAPSHOT_ALIGNMENT = 64 # Every array starts on a 64-byte boundary
+_PREAMBLE = struct.Struct("<8sQQ") # magic, header offset, header length; padded to SNAPSHOT_ALIGNMENT
+
+
+class _SnapshotWriter:
+    """Streams aligned arrays into a snapshot file, then the JSON header describing them."""
+    def __init__(self, snapshot_file):
+        self.file = snapshot_file
+        self.arrays = {}
+        self.file.write(b"\0" * SNAPSHOT_ALIGNMENT) # Preamble, filled in by finish()
+
+    def add(self, name, array):
+        array = np.ascontiguousarray(array)
+        offset = self._align()
+        self.arrays[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        self.file.write(array.tobytes())
+
+    def finish(self, header):
+        header = dict(header, arrays=self.arrays)
+        header_bytes = json.dumps(header).encode("utf-8")
+        header_offset = self._align()
+        self.file.write(header_bytes)
+        self.file.seek(0)
+        self.file.write(_PREAMBLE.pack(SNAPSHOT_MAGIC, header_offset, len(header_bytes)))
+
+    def _align(self):
+        position = self.file.tell()
+        padding = -position % SNAPSHOT_ALIGNMENT
+        self.file.write(b"\0" * padding)
+        return position + padding
+
+
+class Snapshot:
+    """
+    A snapshot file opened for restore. Arrays are memory-mapped copy-on-write: nothing is read until used,
+    and restored state can be modified without touching the file.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as snapshot_file:
+            magic, header_offset, header_length = _PREAMBLE.unpack(snapshot_file.read(_PREAMBLE.size))
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"Not a Cadence snapshot: {path}")
+            snapshot_file.seek(header_offset)
+            self.header = json.loads(snapshot_file.read(header_length))
+        if self.header.get("version") not in SNAPSHOT_READABLE_VERSIONS:
+            raise ValueError(f"Unsupported snapshot version: {self.header.get('version')}")
+
+    def array(self, name):
+        spec = self.header["arrays"][name]
+        dtype, shape = np.dtype(spec["dtype"]), tuple(spec["shape"])
+        if not np.prod(shape, dtype=np.int64):
+            return np.zeros(shape, dtype=dtype) # Empty arrays can't be mapped
+        return np.memmap(self.path, dtype=dtype, mode="c", offset=spec["offset"], shape=shape)
+
+    def emotion_ais(self, clock=None):
+        """Restores session id -> EmotionAI_PathBased_DynamicIntensity_V3 from an instances snapshot."""
+        section = self._section("emotion", "instances")
+        categories = section["emotion_categories"]
+        parameter_count = len(self.array("emotion.parameter_multipliers"))
+        multi_label = self.array("emotion.parameter_multi_label").tolist() if "emotion.parameter_multi_label" in self.header["arrays"] else [0] * parameter_count
+        parameter_sets = [
+            (dict(zip(categories, decay_rates)), multiplier, "lazy" if lazy else "tick", tick_seconds, "multi" if multi else "single")
+            for decay_rates, multiplier, lazy, tick_seconds, multi in zip(*(
+                self.array(f"emotion.parameter_{name}").tolist() for name in ("decay_rates", "multipliers", "lazy", "tick_seconds")
+            ), multi_label)
+        ]
+        emotion_ais = {}
+        with _gc_paused():
+            for session_id, parameter_index, intensities in zip(
+                    section["session_ids"], self.array("emotion.parameter_index").tolist(), self.array("emotion.intensities").tolist()):
+                decay_rates, multiplier, decay_mode, tick_seconds, appraisal_mode = parameter_sets[parameter_index]
+                emotion_ai = EmotionAI_PathBased_DynamicIntensity_V3(dict(decay_rates), multiplier, decay_mode, tick_seconds, clock, appraisal_mode)
+                emotion_ai.emotion_intensity_levels = dict(zip(categories, intensities))
+                emotion_ais[session_id] = emotion_ai
+        return emotion_ais
+
+    def pool(self, clock=None):
+        """Restores an EmotionSessionPool whose intensities are the snapshot's memory map (no copy)."""
+        section = self._section("emotion", "pool")
+        return EmotionSessionPool.from_arrays(
+            section["session_ids"], self.array("emotion.intensities"),
+            dict(zip(section["emotion_categories"], self.array("emotion.decay_rates").tolist())),
+            section["appraisal_intensity_multiplier"], section["decay_mode"], section["decay_tick_seconds"], clock,
+            section.get("appraisal_mode", "single") # Version 1 pools are single-label
+        )
+
+    def mind_ai_learners(self, clock=None):
+        """
+        Restores session id -> MindAI_Learning. History snapshots restore each learner's history in its
+        original form (list or columnar); counts-only snapshots restore list learners with their outcome counts.
+        """
+        section = self.header.get("mind")
+        if section is None:
+            raise ValueError("Snapshot has no Mind AI section")
+        learning_rates = self.array("mind.learning_rates").tolist()
+        with _gc_paused():
+            if section["mode"] == "counts":
+                return self._restore_counts(section, learning_rates, clock)
+            return self._restore_histories(section, learning_rates, clock)
+
+    def _restore_counts(self, section, learning_rates, clock):
+        offsets = self.array("mind.count_offsets").tolist()
+        tags, options, outcomes = section["tags"], section["options"], section["outcomes"]
+        keys = zip(
+            [tags[code] for code in self.array("mind.count_tag").tolist()],
+            [options[code] for code in self.array("mind.count_option").tolist()],
+            [outcomes[code] for code in self.array("mind.count_outcome").tolist()],
+        )
+        counts = list(zip(keys, self.array("mind.count_value").tolist()))
+        learners = {}
+        for row, session_id in enumerate(section["session_ids"]):
+            learner = MindAI_Learning(clock=clock)
+            learner.learning_rate = learning_rates[row]
+            learner.outcome_counts = dict(counts[offsets[row]:offsets[row + 1]])
+            learners[session_id] = learner
+        return learners
+
+    def _restore_histories(self, section, learning_rates, clock):
+        offsets = self.array("mind.history_offsets").tolist()
+        columns = [self.array(f"mind.history_{name}") for name in ("path", "option", "outcome", "timestamp")]
+        paths, options, outcomes = [tuple(path) for path in section["paths"]], section["options"], section["outcomes"]
+        capacities = self.array("mind.history_capacities").tolist()
+        learners = {}
+        for row, session_id in enumerate(section["session_ids"]):
+            start, end = offsets[row], offsets[row + 1]
+            path_codes, option_codes, outcome_codes, timestamps = (column[start:end] for column in columns)
+            if capacities[row] < 0: # List history
+                learner = MindAI_Learning(clock=clock)
+                for path_code, option_code, outcome_code, timestamp in zip(path_codes.tolist(), option_codes.tolist(), outcome_codes.tolist(), timestamps.tolist()):
+                    append_list_record(learner, list(paths[path_code]), options[option_code], outcomes[outcome_code], timestamp)
+            else:
+                # Re-intern against this learner's own values so its code tables stay small
+                path_values, path_codes = np.unique(path_codes, return_inverse=True)
+                option_values, option_codes = np.unique(option_codes, return_inverse=True)
+                outcome_values, outcome_codes = np.unique(outcome_codes, return_inverse=True)
+                learner = MindAI_Learning(ColumnarDecisionHistory.from_columns(
+                    [paths[code] for code in path_values.tolist()], [options[code] for code in option_values.tolist()],
+                    [outcomes[code] for code in outcome_values.tolist()], path_codes, option_codes, outcome_codes, timestamps,
+                    capacity=capacities[row] or None
+                ), clock=clock)
+            learner.learning_rate = learning_rates[row]
+            learners[session_id] = learner
+        return learners
+
+    def _section(self, name, kind):
+        section = self.header.get(name)
+        if section is None or section.get("kind") != kind:
+            raise ValueError(f"Snapshot has no {name} {kind} section")
+        return section
+
+
+@contextlib.contextmanager
+def _gc_paused():
+    """Pauses the cyclic garbage collector, which otherwise rescans the growing heap while millions of objects are built."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def append_list_record(learner, emotion_path, chosen_option, outcome, timestamp):
+    """Appends a list-history record and its outcome counts, as MindAI_Learning.record_decision_outcome does."""
+    learner.decision_history.append({
+        "emotion_path": emotion_path,
+        "chosen_option": chosen_option,
+        "outcome": outcome,
+        "timestamp": timestamp
+    })
+    learner.count_decision(emotion_path, chosen_option, outcome)
+
+
+def _intern(codes, value):
+    code = codes.get(value)
+    if code is None:
+        code = codes[value] = len(codes)
+    return code
+
+
+def _write_emotion_instances(writer, emotion_ais):
+    """Intensities per session; decay rates, multiplier and decay mode are stored once per distinct combination."""
+    intensities, parameter_index, parameter_codes = [], [], {}
+    for emotion_ai in emotion_ais.values():
+        levels = emotion_ai.get_emotion_intensity() # Settles lazy decay first
+        intensities.append([levels.get(emotion, 0.0) for emotion in EMOTION_CATEGORIES])
+        parameters = (tuple(emotion_ai.intensity_decay_rates.get(emotion, 0.0) for emotion in EMOTION_CATEGORIES),
+                      emotion_ai.appraisal_intensity_multiplier, emotion_ai.decay_mode == "lazy", emotion_ai.decay_tick_seconds,
+                      emotion_ai.appraisal_mode == "multi")
+        parameter_index.append(_intern(parameter_codes, parameters))
+    parameter_sets = list(parameter_codes)
+    writer.add("emotion.intensities", np.array(intensities, dtype=np.float64).reshape(-1, len(EMOTION_CATEGORIES)))
+    writer.add("emotion.parameter_index", np.array(parameter_index, dtype=np.uint32))
+    writer.add("emotion.parameter_decay_rates", np.array([parameters[0] for parameters in parameter_sets], dtype=np.float64).reshape(-1, len(EMOTION_CATEGORIES)))
+    for column, (name, dtype) in enumerate((("multipliers", np.float64), ("lazy", np.uint8), ("tick_seconds", np.float64), ("multi_label", np.uint8)), 1):
+        writer.add(f"emotion.parameter_{name}", np.array([parameters[column] for parameters in parameter_sets], dtype=dtype))
+    return {"kind": "instances", "session_ids": list(emotion_ais), "emotion_categories": list(EMOTION_CATEGORIES)}
+
+
+def _write_emotion_pool(writer, pool):
+    writer.add("emotion.intensities", pool.intensities) # Settles lazy decay first
+    writer.add("emotion.decay_rates", pool.decay_rates)
+    return {
+        "kind": "pool", "session_ids": pool.session_ids, "emotion_categories": list(pool.emotion_categories),
+        "appraisal_intensity_multiplier": pool.emotion_ai.appraisal_intensity_multiplier,
+        "decay_mode": pool.decay_mode, "decay_tick_seconds": pool.decay_tick_seconds, "appraisal_mode": pool.appraisal_mode,
+    }
+
+
+def _write_mind_counts(writer, mind_ai_learners):
+    """Aggregated statistics only: (emotion tag, option, outcome) -> count per learner."""
+    tag_codes, option_codes, outcome_codes = {}, {}, {}
+    offsets, rows = [0], []
+    for learner in mind_ai_learners.values():
+        history = learner.decision_history
+        if isinstance(history, list):
+            counts = learner.outcome_counts.items()
+        else:
+            counts = [((history.emotions[emotion], history.options[option], history.outcomes[outcome]), count)
+                      for (emotion, option, outcome), count in np.ndenumerate(history.outcome_counts())
+                      if count and history.emotions[emotion] is not None]
+        for (tag, option, outcome), count in counts:
+            rows.append((_intern(tag_codes, tag), _intern(option_codes, option), _intern(outcome_codes, outcome), count))
+        offsets.append(len(rows))
+    table = np.array(rows, dtype=np.int64).reshape(-1, 4)
+    writer.add("mind.count_offsets", np.array(offsets, dtype=np.int64))
+    for column, name in enumerate(("tag", "option", "outcome")):
+        writer.add(f"mind.count_{name}", table[:, column].astype(np.int32))
+    writer.add("mind.count_value", table[:, 3])
+    return {"mode": "counts", "tags": list(tag_codes), "options": list(option_codes), "outcomes": list(outcome_codes)}
+
+
+def _write_mind_history(writer, mind_ai_learners):
+    """Every learner's full decision history, concatenated, with global code tables."""
+    path_codes, option_codes, outcome_codes = {}, {}, {}
+    offsets, capacities, chunks = [0], [], []
+    for learner in mind_ai_learners.values():
+        history = learner.decision_history
+        if isinstance(history, list):
+            capacities.append(-1)
+            chunk = (
+                np.array([_intern(path_codes, tuple(record["emotion_path"])) for record in history], dtype=np.int32),
+                np.array([_intern(option_codes, record["chosen_option"]) for record in history], dtype=np.int32),
+                np.array([_intern(outcome_codes, record["outcome"]) for record in history], dtype=np.int32),
+                np.array([record["timestamp"] for record in history], dtype=np.float64),
+            )
+        else:
+            capacities.append(history.capacity or 0)
+            paths, options, outcomes, timestamps = history.columns()
+            # Map this history's codes to the global tables with one lookup array per column
+            chunk = (
+                np.array([_intern(path_codes, path) for path in history.paths], dtype=np.int32)[paths] if len(paths) else paths,
+                np.array([_intern(option_codes, option) for option in history.options], dtype=np.int32)[options] if len(options) else options,
+                np.array([_intern(outcome_codes, outcome) for outcome in history.outcomes], dtype=np.int32)[outcomes] if len(outcomes) else outcomes,
+                timestamps,
+            )
+        chunks.append(chunk)
+        offsets.append(offsets[-1] + len(chunk[3]))
+    writer.add("mind.history_offsets", np.array(offsets, dtype=np.int64))
+    writer.add("mind.history_capacities", np.array(capacities, dtype=np.int64))
+    for column, (name, dtype) in enumerate((("path", np.int32), ("option", np.int32), ("outcome", np.int32), ("timestamp", np.float64))):
+        writer.add(f"mind.history_{name}", np.concatenate([chunk[column] for chunk in chunks]).astype(dtype) if chunks else np.zeros(0, dtype=dtype))
+    return {"mode": "history", "paths": [list(path) for path in path_codes], "options": list(option_codes), "outcomes": list(outcome_codes)}
+
+
+def save_snapshot(path, emotion_ais=None, mind_ai_learners=None, pool=None, include_history=True):
+    """
+    Writes a snapshot of emotion state (session id -> emotion AI, or an EmotionSessionPool) and/or Mind AI state
+    (session id -> MindAI_Learning). include_history=False stores only the learners' aggregated outcome counts.
+    The file is written next to path and renamed into place, so an existing snapshot is never left half-written.
+    """
+    if emotion_ais is not None and pool is not None:
+        raise ValueError("Snapshot either emotion AI instances or a pool, not both")
+    header = {"version": SNAPSHOT_VERSION, "created": time.time()}
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as snapshot_file:
+        writer = _SnapshotWriter(snapshot_file)
+        if emotion_ais is not None:
+            header["emotion"] = _write_emotion_instances(writer, emotion_ais)
+        elif pool is not None:
+            header["emotion"] = _write_emotion_pool(writer, pool)
+        if mind_ai_learners is not None:
+            writer.add("mind.learning_rates", np.array([learner.learning_rate for learner in mind_ai_learners.values()], dtype=np.float64))
+            header["mind"] = _write_mind_history(writer, mind_ai_learners) if include_history else _write_mind_counts(writer, mind_ai_learners)
+            header["mind"]["session_ids"] = list(mind_ai_learners)
+        writer.finish(header)
+    os.replace(temporary_path, path)
+
+
+def load_snapshot(path):
+    return Snapshot(path)
+
+
+def save_sessions(path, sessions, include_history=True):
+    """Snapshots a session id -> (emotion_ai, mind_ai_learner) mapping, as kept by CadenceServer."""
+    save_snapshot(path, {session_id: state[0] for session_id, state in sessions.items()},
+                  {session_id: state[1] for session_id, state in sessions.items()}, include_history=include_history)
+
+
+def load_sessions(path, clock=None):
+    """Restores a session id -> (emotion_ai, mind_ai_learner) mapping written by save_sessions(), running on clock."""
+    snapshot = load_snapshot(path)
+    emotion_ais, mind_ai_learners = snapshot.emotion_ais(clock), snapshot.mind_ai_learners(clock)
+    return {session_id: (emotion_ai, mind_ai_learners[session_id]) for session_id, emotion_ai in emotion_ais.items()}
@@ -0,0 +1,227 @@
+# decision_history_store.py
+import numpy as np
+
+
+class ColumnarDecisionHistory:
+    """
+    Compact decision history for MindAI_Learning.
+    Emotion paths, options and outcomes are interned to small-int codes and kept, with the timestamps,
+    in NumPy columns. With a capacity the columns grow up to it and then form a ring buffer that drops the oldest records.
+    """
+    def __init__(self, capacity=None, initial_size=1024):
+        self.capacity = capacity # None = unbounded
+        size = min(capacity, max(initial_size, 1)) if capacity else max(initial_size, 1)
+        self._path_col = np.zeros(size, dtype=np.int32)
+        self._option_col = np.zeros(size, dtype=np.int32)
+        self._outcome_col = np.zeros(size, dtype=np.int32)
+        self._timestamp_col = np.zeros(size, dtype=np.float64)
+        self._start = 0 # Ring head: physical index of the oldest record
+        self._size = 0
+
+        # Interning tables: value -> code and code -> value
+        self._path_codes, self.paths = {}, [] # paths are tuples of tags
+        self._option_codes, self.options = {}, []
+        self._outcome_codes, self.outcomes = {}, []
+        self._emotion_codes, self.emotions = {}, [] # Emotion tag of each path, None if it has none
+        self._path_emotion = [] # path code -> emotion code
+        self._tag_paths = {} # tag -> codes of the paths containing it
+
+        # (path code, option code, outcome code) -> count of live records, kept through eviction and compaction
+        self._counts = {}
+
+    @classmethod
+    def from_columns(cls, paths, options, outcomes, path_codes, option_codes, outcome_codes, timestamps, capacity=None):
+        """
+        Builds a history in bulk from interning tables (code -> value lists) and code/timestamp columns,
+        without going through append() per record.
+        """
+        history = cls(capacity=capacity, initial_size=len(timestamps))
+        for path in paths:
+            history._intern_path(tuple(path))
+        for option in options:
+            cls._intern(history._option_codes, history.options, option)
+        for outcome in outcomes:
+            cls._intern(history._outcome_codes, history.outcomes, outcome)
+
+        if capacity and len(timestamps) > capacity:
+            path_codes, option_codes, outcome_codes, timestamps = (
+                column[-capacity:] for column in (path_codes, option_codes, outcome_codes, timestamps)
+            )
+        size = len(timestamps)
+        history._path_col[:size] = path_codes
+        history._option_col[:size] = option_codes
+        history._outcome_col[:size] = outcome_codes
+        history._timestamp_col[:size] = timestamps
+        history._size = size
+        if size:
+            history._counts = dict(history._key_counts(*(column[:size] for column in history.columns()[:3])))
+        return history
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        """Returns record index (oldest first) as a dict shaped like MindAI_Learning's list records."""
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("decision history index out of range")
+        position = (self._start + index) % len(self._path_col)
+        return {
+            "emotion_path": list(self.paths[self._path_col[position]]),
+            "chosen_option": self.options[self._option_col[position]],
+            "outcome": self.outcomes[self._outcome_col[position]],
+            "timestamp": float(self._timestamp_col[position])
+        }
+
+    def __iter__(self):
+        for index in range(self._size):
+            yield self[index]
+
+    @property
+    def nbytes(self):
+        """Bytes held by the record columns (allocated capacity, not just live records)."""
+        return sum(column.nbytes for column in (self._path_col, self._option_col, self._outcome_col, self._timestamp_col))
+
+    def append(self, emotion_path, chosen_option, outcome, timestamp):
+        """Appends one decision. Amortized O(1); evicts the oldest record when a capacity is full."""
+        path_code = self._intern_path(tuple(emotion_path))
+        option_code = self._intern(self._option_codes, self.options, chosen_option)
+        outcome_code = self._intern(self._outcome_codes, self.outcomes, outcome)
+
+        length = len(self._path_col)
+        if self._size == length:
+            if self.capacity and length >= self.capacity:
+                self._decrement((int(self._path_col[self._start]), int(self._option_col[self._start]), int(self._outcome_col[self._start])))
+                self._start = (self._start + 1) % length
+                self._size -= 1
+            else:
+                self._grow()
+                length = len(self._path_col)
+
+        position = (self._start + self._size) % length
+        self._path_col[position] = path_code
+        self._option_col[position] = option_code
+        self._outcome_col[position] = outcome_code
+        self._timestamp_col[position] = timestamp
+        self._size += 1
+
+        key = (path_code, option_code, outcome_code)
+        self._counts[key] = self._counts.get(key, 0) + 1
+
+    def count(self, tag, chosen_option, outcome):
+        """Number of live records whose path contains tag, with this option and outcome. Independent of history size."""
+        option_code = self._option_codes.get(chosen_option)
+        outcome_code = self._outcome_codes.get(outcome)
+        if option_code is None or outcome_code is None:
+            return 0
+        return sum(self._counts.get((path_code, option_code, outcome_code), 0) for path_code in self._tag_paths.get(tag, ()))
+
+    def columns(self):
+        """Returns (path codes, option codes, outcome codes, timestamps) in record order, oldest first."""
+        return tuple(self._ordered(column) for column in (self._path_col, self._option_col, self._outcome_col, self._timestamp_col))
+
+    def outcome_counts(self, since=None, until=None):
+        """
+        Vectorized counts of records per (emotion, option, outcome) over an optional time window.
+        Returns an int64 array of shape (len(emotions), len(options), len(outcomes)).
+        """
+        path_codes, option_codes, outcome_codes, timestamps = self.columns()
+        if since is not None or until is not None:
+            window = np.ones(len(timestamps), dtype=bool)
+            if since is not None:
+                window &= timestamps >= since
+            if until is not None:
+                window &= timestamps < until
+            path_codes, option_codes, outcome_codes = path_codes[window], option_codes[window], outcome_codes[window]
+
+        shape = (len(self.emotions), len(self.options), len(self.outcomes))
+        emotion_codes = np.asarray(self._path_emotion, dtype=np.int64)[path_codes]
+        flat_keys = (emotion_codes * shape[1] + option_codes) * shape[2] + outcome_codes
+        return np.bincount(flat_keys, minlength=shape[0] * shape[1] * shape[2]).reshape(shape)
+
+    def outcome_rates(self, since=None, until=None):
+        """
+        Share of each outcome per (emotion, option), over an optional time window.
+        Returns a float64 array like outcome_counts, NaN where an (emotion, option) pair has no records.
+        """
+        counts = self.outcome_counts(since, until)
+        totals = counts.sum(axis=2, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return counts / totals
+
+    def compact(self, max_age=None, now=None, before=None):
+        """
+        Drops records older than a cutoff: timestamps before `before`, or older than max_age seconds before now.
+        Returns the number of records removed.
+        """
+        if before is None:
+            if max_age is None or now is None:
+                raise ValueError("compact needs either before, or max_age and now")
+            before = now - max_age
+
+        path_codes, option_codes, outcome_codes, timestamps = self.columns()
+        keep = timestamps >= before
+        removed = int(self._size - np.count_nonzero(keep))
+        if not removed:
+            return 0
+
+        dropped = ~keep
+        for key, count in self._key_counts(path_codes[dropped], option_codes[dropped], outcome_codes[dropped]):
+            self._decrement(key, count)
+
+        size = self._size - removed
+        length = len(self._path_col) if self.capacity else max(len(self._path_col) // 2, size, 1)
+        for name, column in (("_path_col", path_codes), ("_option_col", option_codes), ("_outcome_col", outcome_codes), ("_timestamp_col", timestamps)):
+            compacted = np.zeros(length, dtype=column.dtype)
+            compacted[:size] = column[keep]
+            setattr(self, name, compacted)
+        self._start = 0
+        self._size = size
+        return removed
+
+    def _key_counts(self, path_codes, option_codes, outcome_codes):
+        """Yields ((path, option, outcome), count) for the distinct keys among the given records."""
+        keys = np.stack((path_codes, option_codes, outcome_codes), axis=1)
+        unique_keys, counts = np.unique(keys, axis=0, return_counts=True)
+        for key, count in zip(unique_keys.tolist(), counts.tolist()):
+            yield tuple(key), count
+
+    def _decrement(self, key, count=1):
+        remaining = self._counts[key] - count
+        if remaining:
+            self._counts[key] = remaining
+        else:
+            del self._counts[key]
+
+    def _ordered(self, column):
+        end = self._start + self._size
+        if end <= len(column):
+            return column[self._start:end]
+        return np.concatenate((column[self._start:], column[:end - len(column)]))
+
+    def _grow(self):
+        for name in ("_path_col", "_option_col", "_outcome_col", "_timestamp_col"):
+            column = self._ordered(getattr(self, name))
+            grown = np.zeros(min(max(len(column) * 2, 1), self.capacity or np.inf), dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+        self._start = 0
+
+    @staticmethod
+    def _intern(codes, values, value):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(values)
+            values.append(value)
+        return code
+
+    def _intern_path(self, path):
+        code = self._path_codes.get(path)
+        if code is None:
+            code = self._intern(self._path_codes, self.paths, path)
+            emotion_tag = next((tag for tag in path if tag.startswith("[EMOTION_")), None)
+            self._path_emotion.append(self._intern(self._emotion_codes, self.emotions, emotion_tag))
+            for tag in set(path):
+                self._tag_paths.setdefault(tag, []).append(code)
+        return code
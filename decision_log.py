@@ -0,0 +1,254 @@
+# decision_log.py
+import json
+import os
+import threading
+
+import numpy as np
+
+from decision_history_store import ColumnarDecisionHistory
+
+LOG_MAGIC = b"CADLOG1\0"
+LOG_HEADER_SIZE = 16
+RECORD_DTYPE = np.dtype([("timestamp", "<f8"), ("path", "<i4"), ("option", "<i4"), ("outcome", "<i4")])
+
+
+class DecisionLog:
+    """
+    Append-only on-disk log of Mind AI decisions.
+
+    Files next to `path`:
+      path          fixed-size binary records (RECORD_DTYPE) after a small header
+      path.strings  JSON lines interning emotion paths, options and outcomes to codes, in code order
+      path.ckpt     periodic summary checkpoint: outcome counts over the first N records
+
+    Records are buffered and written in groups, so appending is only an in-memory operation. With background
+    (the default) groups are written, and fsynced if fsync is set, by a writer thread every flush_interval
+    seconds or as soon as group_size records are waiting, like cadence_events.BufferedSink; otherwise the append
+    that fills a group writes it. close() writes a checkpoint, so the next startup reads no tail.
+    On startup the counts come from the checkpoint plus a vectorized pass over the memory-mapped tail.
+    """
+    def __init__(self, path, group_size=256, checkpoint_every=100000, fsync=False, background=True, flush_interval=1.0):
+        self.path = path
+        self.group_size = group_size
+        self.checkpoint_every = checkpoint_every
+        self.fsync = fsync
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock() # Guards the pending buffers, code tables and counts
+        self._write_lock = threading.RLock() # One group write or checkpoint at a time
+
+        self.paths, self.options, self.outcomes = [], [], []
+        self._codes = {"path": {}, "option": {}, "outcome": {}}
+        self._values = {"path": self.paths, "option": self.options, "outcome": self.outcomes}
+        self._pending_strings = []
+        self._pending_records = []
+
+        self._load_strings()
+        self._record_count = self._repair_log()
+        self._counts = self._load_counts()
+        self._checkpointed_count = self._record_count
+        self._appended_count = self._record_count
+        self._log_file = open(self.path, "ab")
+        self._strings_file = open(self.path + ".strings", "a", encoding="utf-8")
+
+        self._closed = False
+        self._wake = threading.Event()
+        self._thread = None
+        if background:
+            self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+            self._thread.start()
+
+    def __len__(self):
+        return self._appended_count
+
+    def append(self, emotion_path, chosen_option, outcome, timestamp):
+        """Buffers one decision record; writes happen in groups of group_size."""
+        with self._lock:
+            key = (self._intern("path", tuple(emotion_path)), self._intern("option", chosen_option), self._intern("outcome", outcome))
+            self._pending_records.append((timestamp,) + key)
+            self._counts[key] = self._counts.get(key, 0) + 1
+            self._appended_count += 1
+            group_full = len(self._pending_records) >= self.group_size
+        if group_full:
+            if self._thread is not None:
+                self._wake.set()
+            else:
+                self.flush()
+
+    def flush(self):
+        """Group commit: strings first, then the buffered records, then a checkpoint if one is due."""
+        with self._write_lock:
+            self._write_pending()
+            if self._record_count - self._checkpointed_count >= self.checkpoint_every:
+                self.write_checkpoint()
+
+    def write_checkpoint(self):
+        """Writes the outcome counts over all records, atomically replacing the previous checkpoint."""
+        with self._write_lock:
+            counts = self._write_pending(snapshot_counts=True)
+            checkpoint = {
+                "version": 1,
+                "records": self._record_count,
+                "counts": [list(key) + [count] for key, count in counts.items()]
+            }
+            temporary_path = self.path + ".ckpt.tmp"
+            with open(temporary_path, "w", encoding="utf-8") as checkpoint_file:
+                json.dump(checkpoint, checkpoint_file)
+            os.replace(temporary_path, self.path + ".ckpt")
+            self._checkpointed_count = self._record_count
+
+    def _write_pending(self, snapshot_counts=False):
+        """
+        Writes the buffered strings and records. With snapshot_counts, returns a copy of the counts taken
+        together with the buffers, so it covers exactly the records written so far.
+        """
+        with self._write_lock:
+            with self._lock:
+                strings, self._pending_strings = self._pending_strings, []
+                records, self._pending_records = self._pending_records, []
+                counts = dict(self._counts) if snapshot_counts else None
+            if strings:
+                self._strings_file.write("".join(strings))
+                self._strings_file.flush()
+                if self.fsync:
+                    os.fsync(self._strings_file.fileno())
+            if records:
+                self._log_file.write(np.array(records, dtype=RECORD_DTYPE).tobytes())
+                self._log_file.flush()
+                if self.fsync:
+                    os.fsync(self._log_file.fileno())
+                self._record_count += len(records)
+            return counts
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def close(self):
+        """Stops the writer thread, writes what is still buffered and a checkpoint, and closes the files."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._wake.set()
+            self._thread.join()
+        self.flush()
+        if self._record_count > self._checkpointed_count:
+            self.write_checkpoint()
+        self._log_file.close()
+        self._strings_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def records(self):
+        """Memory-maps the flushed records as a read-only structured array (no copy)."""
+        if not self._record_count:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+        return np.memmap(self.path, dtype=RECORD_DTYPE, mode="r", offset=LOG_HEADER_SIZE, shape=(self._record_count,))
+
+    def outcome_counts(self):
+        """(path code, option code, outcome code) -> count over every appended record."""
+        with self._lock:
+            return dict(self._counts)
+
+    def load_history(self, capacity=None):
+        """Builds a ColumnarDecisionHistory from the memory-mapped log in bulk."""
+        self.flush()
+        records = self.records()
+        return ColumnarDecisionHistory.from_columns(
+            self.paths, self.options, self.outcomes,
+            records["path"], records["option"], records["outcome"], records["timestamp"], capacity=capacity
+        )
+
+    def restore(self, mind_ai_learner, load_history=False):
+        """
+        Restores a MindAI_Learning from the log and attaches the log for further recording.
+        A list history only gets the learned outcome counts, unless load_history=True replaces it with a
+        columnar decision history rebuilt from the log. A columnar history derives its counts from its records,
+        so it is always rebuilt from the log, keeping its capacity; it must be empty.
+        """
+        history = mind_ai_learner.decision_history
+        if not isinstance(history, list):
+            if len(history):
+                raise ValueError("restore() needs an empty columnar decision history")
+            mind_ai_learner.decision_history = self.load_history(capacity=history.capacity)
+        elif load_history:
+            mind_ai_learner.decision_history = self.load_history()
+        else:
+            outcome_counts = mind_ai_learner.outcome_counts
+            for (path_code, option_code, outcome_code), count in self._counts.items():
+                for tag in set(self.paths[path_code]):
+                    if tag.startswith("[EMOTION_"):
+                        key = (tag, self.options[option_code], self.outcomes[outcome_code])
+                        outcome_counts[key] = outcome_counts.get(key, 0) + count
+        mind_ai_learner.decision_log = self
+        return mind_ai_learner
+
+    def _intern(self, kind, value):
+        codes = self._codes[kind]
+        code = codes.get(value)
+        if code is None:
+            values = self._values[kind]
+            code = codes[value] = len(values)
+            values.append(value)
+            self._pending_strings.append(json.dumps([kind, list(value) if kind == "path" else value]) + "\n")
+        return code
+
+    def _load_strings(self):
+        strings_path = self.path + ".strings"
+        if not os.path.exists(strings_path):
+            return
+        valid_bytes = 0
+        with open(strings_path, "rb") as strings_file:
+            for line in strings_file:
+                try:
+                    kind, value = json.loads(line)
+                except ValueError:
+                    break # Torn final line from an interrupted write
+                value = tuple(value) if kind == "path" else value
+                self._codes[kind][value] = len(self._values[kind])
+                self._values[kind].append(value)
+                valid_bytes += len(line)
+        if valid_bytes < os.path.getsize(strings_path):
+            with open(strings_path, "r+b") as strings_file:
+                strings_file.truncate(valid_bytes)
+
+    def _repair_log(self):
+        """Creates the log if needed and drops a torn trailing record. Returns the record count."""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < LOG_HEADER_SIZE:
+            with open(self.path, "wb") as log_file:
+                log_file.write(LOG_MAGIC.ljust(LOG_HEADER_SIZE, b"\0"))
+            return 0
+        with open(self.path, "rb") as log_file:
+            if log_file.read(len(LOG_MAGIC)) != LOG_MAGIC:
+                raise ValueError(f"Not a decision log: {self.path}")
+        record_bytes = os.path.getsize(self.path) - LOG_HEADER_SIZE
+        if record_bytes % RECORD_DTYPE.itemsize:
+            with open(self.path, "r+b") as log_file:
+                log_file.truncate(LOG_HEADER_SIZE + record_bytes - record_bytes % RECORD_DTYPE.itemsize)
+        return record_bytes // RECORD_DTYPE.itemsize
+
+    def _load_counts(self):
+        """Counts from the checkpoint, plus a vectorized count over the records written after it."""
+        counts, checkpointed = {}, 0
+        try:
+            with open(self.path + ".ckpt", encoding="utf-8") as checkpoint_file:
+                checkpoint = json.load(checkpoint_file)
+            if checkpoint.get("version") == 1 and checkpoint["records"] <= self._record_count:
+                checkpointed = checkpoint["records"]
+                counts = {tuple(entry[:3]): entry[3] for entry in checkpoint["counts"]}
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+
+        tail = self.records()[checkpointed:]
+        if len(tail):
+            keys = np.stack((tail["path"], tail["option"], tail["outcome"]), axis=1)
+            unique_keys, key_counts = np.unique(keys, axis=0, return_counts=True)
+            for key, count in zip(map(tuple, unique_keys.tolist()), key_counts.tolist()):
+                counts[key] = counts.get(key, 0) + count
+        return counts
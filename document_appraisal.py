@@ -0,0 +1,163 @@
+# document_appraisal.py
+import argparse
+import json
+import mmap
+import multiprocessing
+import os
+
+import numpy as np
+
+from emotional_ai_module import (
+    EmotionAI_PathBased_DynamicIntensity_V3, AppraisalIndex, EMOTION_CATEGORIES, PATHWAY_STAGES,
+    get_appraisal_index, rules_from_data, rules_to_data,
+)
+
+DEFAULT_WINDOW_BYTES = 4096
+WINDOWS_PER_TASK = 256 # Windows appraised per worker task; bounds the IPC per result and the pages mapped at once
+
+_worker = {} # Per worker process: "index" (AppraisalIndex), "path" and "mapped" (the open document)
+
+
+def window_count(size, window_bytes, step_bytes):
+    """Number of windows of window_bytes, step_bytes apart, needed to cover size bytes."""
+    if size <= 0:
+        return 0
+    return 1 + max(0, -(-(size - window_bytes) // step_bytes))
+
+
+def _index_data(appraisal_index):
+    """Rule data (see rules_to_data) that rebuilds appraisal_index in a worker process."""
+    pathways = {record.name: dict(zip(PATHWAY_STAGES, record.tags)) for record in appraisal_index.pathway_table}
+    return rules_to_data(appraisal_index.rules, appraisal_index.default_pathway, pathways)
+
+
+def _init_worker(index_data):
+    _worker["index"] = AppraisalIndex(*rules_from_data(index_data))
+
+
+def _appraise_windows(task):
+    """Worker task: pathway ids of count windows starting at window first, read through the worker's map of path."""
+    path, first, count, window_bytes, step_bytes = task
+    if _worker.get("path") != path:
+        if "mapped" in _worker:
+            _worker["mapped"].close()
+        with open(path, "rb") as document:
+            _worker["mapped"] = mmap.mmap(document.fileno(), 0, access=mmap.ACCESS_READ)
+        _worker["path"] = path
+    return _select_pathways(_worker["index"], _worker["mapped"], first, count, window_bytes, step_bytes)
+
+
+def _select_pathways(appraisal_index, mapped, first, count, window_bytes, step_bytes):
+    pathway_ids = np.empty(count, dtype=np.int32)
+    for offset in range(count):
+        start = (first + offset) * step_bytes
+        # Windows split multi-byte characters at their edges; the partial characters are dropped
+        text = mapped[start:start + window_bytes].decode("utf-8", "ignore").lower()
+        pathway_ids[offset] = appraisal_index.pathway_ids.get(appraisal_index.select_pathway(text), -1)
+    if hasattr(mmap, "MADV_DONTNEED"): # Release the pages just read, so resident memory stays flat
+        start = first * step_bytes - first * step_bytes % mmap.PAGESIZE
+        end = min(len(mapped), (first + count - 1) * step_bytes + window_bytes)
+        if end > start:
+            mapped.madvise(mmap.MADV_DONTNEED, start, end - start)
+    return pathway_ids
+
+
+def iter_document_pathways(path, window_bytes=DEFAULT_WINDOW_BYTES, step_bytes=None, workers=None,
+                           windows_per_task=WINDOWS_PER_TASK, appraisal_index=None, start_method=None):
+    """
+    Yields the pathway ids (int32 arrays indexing appraisal_index.pathway_names, -1 if unknown) of the
+    sliding windows over a text file, in document order, a task's worth at a time. Windows are window_bytes
+    long and step_bytes apart (default: half a window, so a keyword cut by one window edge is whole in the
+    next). Tasks are fanned out to workers processes (default: one per CPU; 0 or 1 appraises in-process),
+    which read their windows from their own memory map of the file.
+    """
+    appraisal_index = appraisal_index or get_appraisal_index()
+    step_bytes = step_bytes or max(1, window_bytes // 2)
+    if window_bytes <= 0 or step_bytes <= 0:
+        raise ValueError("window_bytes and step_bytes must be positive")
+    count = window_count(os.path.getsize(path), window_bytes, step_bytes)
+    tasks = ((path, first, min(windows_per_task, count - first), window_bytes, step_bytes) for first in range(0, count, windows_per_task))
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if workers <= 1 or count <= windows_per_task:
+        if count == 0:
+            return
+        with open(path, "rb") as document, mmap.mmap(document.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for _, first, task_count, _, _ in tasks:
+                yield _select_pathways(appraisal_index, mapped, first, task_count, window_bytes, step_bytes)
+        return
+    with multiprocessing.get_context(start_method).Pool(workers, _init_worker, (_index_data(appraisal_index),)) as pool:
+        yield from pool.imap(_appraise_windows, tasks)
+
+
+def trajectory(pathway_ids, emotion_ai=None, decay_ticks=1.0, appraisal_index=None, intensities=None):
+    """
+    Accumulated intensities after each window, as a (windows x emotions) float64 array: each window's pathway
+    adds its intensity like generate_emotion_path, and decay_ticks of emotion_ai's decay apply between windows.
+    intensities is the state before the first window (default: zeros); pass the last row of the previous
+    chunk's trajectory to continue it.
+    """
+    emotion_ai = emotion_ai or EmotionAI_PathBased_DynamicIntensity_V3()
+    appraisal_index = appraisal_index or get_appraisal_index()
+    decay = np.array([emotion_ai.intensity_decay_rates[emotion] for emotion in EMOTION_CATEGORIES]) * decay_ticks
+    delta_table = np.zeros((len(appraisal_index.pathway_table) + 1, len(EMOTION_CATEGORIES))) # Last row: unknown (-1)
+    for record in appraisal_index.pathway_table:
+        if record.emotion is not None:
+            delta_table[record.index, record.emotion_index] = record.intensity_delta(emotion_ai.appraisal_intensity_multiplier)
+
+    rows = np.empty((len(pathway_ids), len(EMOTION_CATEGORIES)))
+    state = None if intensities is None else np.array(intensities, dtype=np.float64)
+    for row, deltas in enumerate(delta_table[pathway_ids]):
+        state = deltas.copy() if state is None else np.maximum(state - decay, 0.0) + deltas
+        rows[row] = state
+    return rows
+
+
+def appraise_document(path, window_bytes=DEFAULT_WINDOW_BYTES, step_bytes=None, workers=None, emotion_ai=None,
+                      decay_ticks=1.0, appraisal_index=None):
+    """
+    Appraises a (possibly very large) text file in sliding windows.
+    Returns (pathway_ids, intensities): an int32 array of each window's pathway id (see appraisal_index.pathway_names)
+    and the (windows x emotions) trajectory of accumulated intensities. Memory is bounded by the output
+    (68 bytes per window), not by the document.
+    """
+    appraisal_index = appraisal_index or get_appraisal_index()
+    pathway_chunks, intensity_chunks = [], []
+    for pathway_ids in iter_document_pathways(path, window_bytes, step_bytes, workers, appraisal_index=appraisal_index):
+        previous = intensity_chunks[-1][-1] if intensity_chunks else None
+        pathway_chunks.append(pathway_ids)
+        intensity_chunks.append(trajectory(pathway_ids, emotion_ai, decay_ticks, appraisal_index, previous))
+    if not pathway_chunks:
+        return np.zeros(0, dtype=np.int32), np.zeros((0, len(EMOTION_CATEGORIES)))
+    return np.concatenate(pathway_chunks), np.concatenate(intensity_chunks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Appraise a long text file in sliding windows and write its emotion trajectory.")
+    parser.add_argument("input", help="Text file (UTF-8)")
+    parser.add_argument("-o", "--output", help="Write pathway_ids, intensities and the name tables to this .npz file")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW_BYTES, help="Window size in bytes")
+    parser.add_argument("--step", type=int, help="Bytes between window starts (default: half a window)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU, 1 = in-process)")
+    parser.add_argument("--decay-ticks", type=float, default=1.0, help="Decay ticks applied between windows")
+    args = parser.parse_args()
+
+    appraisal_index = get_appraisal_index()
+    pathway_ids, intensities = appraise_document(args.input, args.window, args.step, args.workers,
+                                                 decay_ticks=args.decay_ticks, appraisal_index=appraisal_index)
+    if args.output:
+        np.savez(args.output, pathway_ids=pathway_ids, intensities=intensities,
+                 pathway_names=np.array(appraisal_index.pathway_names), emotion_categories=np.array(EMOTION_CATEGORIES))
+    names = appraisal_index.pathway_names
+    counts = {}
+    for pathway_id, count in zip(*np.unique(pathway_ids, return_counts=True)):
+        counts[names[pathway_id] if pathway_id >= 0 else None] = int(count)
+    print(json.dumps({
+        "windows": len(pathway_ids),
+        "pathways": counts,
+        "final_intensities": dict(zip(EMOTION_CATEGORIES, intensities[-1].tolist())) if len(intensities) else {},
+        "peak_intensities": dict(zip(EMOTION_CATEGORIES, intensities.max(axis=0).tolist())) if len(intensities) else {},
+    }))
+
+
+if __name__ == "__main__":
+    main()
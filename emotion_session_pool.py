@@ -0,0 +1,236 @@
+# emotion_session_pool.py
+import numpy as np
+
+from cadence_clock import SYSTEM_CLOCK
+from emotional_ai_module import EmotionAI_PathBased_DynamicIntensity_V3
+
+
+class EmotionSessionPool:
+    """
+    Emotion state for many sessions, kept in one contiguous (sessions x emotions) array.
+    Appraisal rules and parameters are shared; each session only owns one row of intensities.
+    In "lazy" decay mode each row also keeps a last-updated time and is only decayed when touched.
+    appraisal_mode is the emotion AI's: "multi" blends every matched pathway into the row.
+    """
+    def __init__(self, intensity_decay_rates=None, appraisal_intensity_multiplier=1.2, initial_capacity=1024,
+                 decay_mode="tick", decay_tick_seconds=1.0, clock=None, appraisal_mode="single"):
+        # Template instance: shared categories, decay rates, multiplier and appraisal
+        self.emotion_ai = EmotionAI_PathBased_DynamicIntensity_V3(intensity_decay_rates, appraisal_intensity_multiplier,
+                                                                  appraisal_mode=appraisal_mode)
+        self.appraisal_mode = appraisal_mode
+        self.emotion_categories = self.emotion_ai.emotion_categories
+        self.emotion_columns = {emotion: i for i, emotion in enumerate(self.emotion_categories)}
+        self.decay_rates = np.array(
+            [self.emotion_ai.intensity_decay_rates[emotion] for emotion in self.emotion_categories], dtype=np.float64
+        )
+
+        if decay_mode not in ("tick", "lazy"):
+            raise ValueError(f"Unknown decay mode: {decay_mode!r}")
+        self.decay_mode = decay_mode
+        self.decay_tick_seconds = decay_tick_seconds
+        self.clock = clock or SYSTEM_CLOCK
+        self._time_offset = 0.0 # Seconds skipped ahead by advance() in lazy mode
+
+        self._intensities = np.zeros((max(initial_capacity, 1), len(self.emotion_categories)), dtype=np.float64)
+        self._last_updated = np.zeros(len(self._intensities), dtype=np.float64)
+        self._session_rows = {} # session id -> row index
+        self._row_sessions = [] # row index -> session id, rows [0, len) are live
+
+    @classmethod
+    def from_arrays(cls, session_ids, intensities, intensity_decay_rates=None, appraisal_intensity_multiplier=1.2,
+                    decay_mode="tick", decay_tick_seconds=1.0, clock=None, appraisal_mode="single"):
+        """
+        Builds a pool around an existing (sessions x emotions) float64 array, which is used as is (not copied),
+        e.g. a copy-on-write memory map. Lazy-mode sessions start owing no decay.
+        """
+        pool = cls(intensity_decay_rates, appraisal_intensity_multiplier, initial_capacity=1,
+                   decay_mode=decay_mode, decay_tick_seconds=decay_tick_seconds, clock=clock, appraisal_mode=appraisal_mode)
+        session_ids = list(session_ids)
+        if len(intensities) != len(session_ids) or intensities.shape[1:] != (len(pool.emotion_categories),):
+            raise ValueError("intensities must have one row per session and one column per emotion")
+        if session_ids:
+            pool._intensities = intensities
+            pool._last_updated = np.full(len(session_ids), pool._now())
+        pool._session_rows = dict(zip(session_ids, range(len(session_ids))))
+        pool._row_sessions = session_ids
+        return pool
+
+    def __len__(self):
+        return len(self._row_sessions)
+
+    def __contains__(self, session_id):
+        return session_id in self._session_rows
+
+    @property
+    def intensities(self):
+        """(sessions x emotions) view of the live rows, in row order (see session_ids)."""
+        if self.decay_mode == "lazy":
+            self.settle_all()
+        return self._intensities[:len(self._row_sessions)]
+
+    @property
+    def session_ids(self):
+        return list(self._row_sessions)
+
+    def add_session(self, session_id):
+        """Adds a session with zero intensities and returns its view. Amortized O(1)."""
+        if session_id in self._session_rows:
+            raise KeyError(f"Session already exists: {session_id!r}")
+        row = len(self._row_sessions)
+        if row == len(self._intensities):
+            self._grow()
+        self._intensities[row] = 0.0
+        self._last_updated[row] = self._now()
+        self._session_rows[session_id] = row
+        self._row_sessions.append(session_id)
+        return SessionEmotionView(self, session_id)
+
+    def remove_session(self, session_id):
+        """Removes a session in O(1) by moving the last row into its slot."""
+        row = self._session_rows.pop(session_id)
+        last_row = len(self._row_sessions) - 1
+        if row != last_row:
+            moved_session = self._row_sessions[last_row]
+            self._intensities[row] = self._intensities[last_row]
+            self._last_updated[row] = self._last_updated[last_row]
+            self._row_sessions[row] = moved_session
+            self._session_rows[moved_session] = row
+        self._row_sessions.pop()
+
+    def session(self, session_id):
+        """Returns the view for an existing session."""
+        if session_id not in self._session_rows:
+            raise KeyError(f"Unknown session: {session_id!r}")
+        return SessionEmotionView(self, session_id)
+
+    def row(self, session_id):
+        return self._session_rows[session_id]
+
+    def tick(self):
+        """Decays every session by one step in a single clamped vectorized operation."""
+        self.advance(1)
+
+    def advance(self, ticks=1):
+        """
+        Applies n decay ticks to every session in O(1) of n.
+        Tick mode decays all rows now; lazy mode just moves the pool clock, rows settle when touched.
+        """
+        if ticks <= 0:
+            return
+        if self.decay_mode == "lazy":
+            self._time_offset += ticks * self.decay_tick_seconds
+            return
+        active = self._intensities[:len(self._row_sessions)]
+        active -= self.decay_rates * ticks
+        np.maximum(active, 0.0, out=active) # Ensure intensity doesn't go negative
+
+    def settle_all(self):
+        """Lazy mode: applies the decay every session owes, in one vectorized operation."""
+        count = len(self._row_sessions)
+        now = self._now()
+        elapsed_ticks = (now - self._last_updated[:count]) / self.decay_tick_seconds
+        active = self._intensities[:count]
+        active -= elapsed_ticks[:, None] * self.decay_rates
+        np.maximum(active, 0.0, out=active)
+        self._last_updated[:count] = now
+
+    def _settle(self, rows):
+        """Lazy mode: applies the decay owed by the given row index or index array."""
+        now = self._now()
+        elapsed_ticks = (now - self._last_updated[rows]) / self.decay_tick_seconds
+        decayed = self._intensities[rows] - np.multiply.outer(elapsed_ticks, self.decay_rates)
+        self._intensities[rows] = np.maximum(decayed, 0.0)
+        self._last_updated[rows] = now
+
+    def _now(self):
+        return self.clock.monotonic() + self._time_offset
+
+    def appraise_batch(self, session_ids, stimulus_texts):
+        """
+        Appraises one stimulus per session id and applies all intensity deltas in one vectorized add.
+        Returns the pathway ids from generate_emotion_paths.
+        """
+        pathway_ids, intensity_deltas = self.emotion_ai.generate_emotion_paths(stimulus_texts)
+        rows = np.fromiter((self._session_rows[session_id] for session_id in session_ids), dtype=np.intp)
+        if self.decay_mode == "lazy":
+            self._settle(rows)
+        np.add.at(self._intensities, rows, intensity_deltas) # add.at so repeated sessions accumulate
+        return pathway_ids
+
+    def _grow(self):
+        grown = np.zeros((len(self._intensities) * 2, len(self.emotion_categories)), dtype=np.float64)
+        grown[:len(self._intensities)] = self._intensities
+        self._intensities = grown
+        self._last_updated = np.resize(self._last_updated, len(grown))
+
+
+class SessionEmotionView:
+    """
+    One session of an EmotionSessionPool, usable where an EmotionAI_PathBased_DynamicIntensity_V3 is expected.
+    Emotion timelines can't be attached: the pool changes rows in bulk (tick, appraise_batch) without events.
+    """
+    __slots__ = ("pool", "session_id", "last_pathway", "last_pathway_weights")
+
+    def __init__(self, pool, session_id):
+        self.pool = pool
+        self.session_id = session_id
+        self.last_pathway = None
+        self.last_pathway_weights = None
+
+    @property
+    def emotion_categories(self):
+        return self.pool.emotion_categories
+
+    @property
+    def intensity_decay_rates(self):
+        return self.pool.emotion_ai.intensity_decay_rates
+
+    @property
+    def appraisal_mode(self):
+        return self.pool.appraisal_mode
+
+    @property
+    def timeline(self):
+        return None
+
+    @timeline.setter
+    def timeline(self, timeline):
+        if timeline is not None:
+            raise ValueError("Pooled sessions don't support emotion timelines")
+
+    @property
+    def emotion_intensity_levels(self):
+        return self.get_emotion_intensity()
+
+    def _row(self):
+        # Looked up every time: rows move when other sessions are removed
+        row = self.pool._session_rows[self.session_id]
+        if self.pool.decay_mode == "lazy":
+            self.pool._settle(row)
+        return self.pool._intensities[row]
+
+    def generate_emotion_path(self, stimulus_text):
+        """Generates an emotion path and applies its intensity to this session's row."""
+        if self.pool.appraisal_mode == "multi":
+            self.last_pathway_weights, emotion_path, intensity_deltas = self.pool.emotion_ai.appraise_multi(stimulus_text)
+            self.last_pathway = next(iter(self.last_pathway_weights))
+        else:
+            self.last_pathway, emotion_path, triggered_emotion, intensity_value = self.pool.emotion_ai.appraise(stimulus_text)
+            intensity_deltas = {triggered_emotion: intensity_value}
+        columns = [(self.pool.emotion_columns[emotion], value) for emotion, value in intensity_deltas.items() if emotion in self.pool.emotion_columns]
+        if columns:
+            row = self._row()
+            for column, intensity_value in columns:
+                row[column] += intensity_value
+        return emotion_path
+
+    def update_emotion_intensity(self):
+        """Decays only this session by one step (lazy mode: settles the decay owed so far)."""
+        row = self._row()
+        if self.pool.decay_mode == "tick":
+            row -= self.pool.decay_rates
+            np.maximum(row, 0.0, out=row)
+
+    def get_emotion_intensity(self):
+        """Returns current emotion intensity levels as a dict, like the single-session class."""
+        return dict(zip(self.pool.emotion_categories, self._row().tolist()))
@@ -0,0 +1,191 @@
+# emotion_timeline.py
+import bisect
+
+import numpy as np
+
+from cadence_clock import SYSTEM_CLOCK
+from emotional_ai_module import EMOTION_CATEGORIES
+
+# One event per appraisal (pathway code >= 0, emotion column or -1, intensity added) or decay (pathway -1, ticks)
+EVENT_DTYPE = np.dtype([("time", "<f8"), ("pathway", "<i2"), ("emotion", "i1"), ("value", "<f8")])
+DECAY_EVENT = -1
+
+
+class SessionTimeline:
+    """
+    Event log of one session's emotion intensities, with a checkpoint of the full intensity vector
+    every checkpoint_every events. The state at any retained time is the nearest earlier checkpoint
+    plus a replay of at most checkpoint_every events, applied exactly as the emotion AI applies them.
+    """
+    def __init__(self, timeline, intensities, decay_rates):
+        self.timeline = timeline
+        self.decay_rates = [decay_rates.get(emotion, 0.0) for emotion in EMOTION_CATEGORIES]
+        self.state = [intensities.get(emotion, 0.0) for emotion in EMOTION_CATEGORIES] # As of the last event
+        self._events = np.zeros(max(timeline.checkpoint_every, 16), dtype=EVENT_DTYPE)
+        self._start = 0 # Index of the oldest retained event
+        self._size = 0 # End of the recorded events
+        self._base = 0 # Events dropped by retention before _events[0]; event numbers are absolute
+        # Checkpoints: state after event number n (n events applied); the first one is the starting state
+        self._checkpoint_events = [0]
+        self._checkpoint_times = [timeline.clock.time()]
+        self._checkpoint_states = [list(self.state)]
+
+    def __len__(self):
+        """Number of retained events."""
+        return self._size - self._start
+
+    @property
+    def retained_since(self):
+        """Earliest time that can be queried."""
+        return self._checkpoint_times[0]
+
+    def record_appraisal(self, pathway, emotion, intensity_delta):
+        column = EMOTION_CATEGORIES.index(emotion) if emotion in EMOTION_CATEGORIES else -1
+        if column >= 0:
+            self.state[column] += intensity_delta
+        self._append(self.timeline.pathway_code(pathway), column, intensity_delta if column >= 0 else 0.0)
+
+    def record_decay(self, ticks):
+        self._decay(self.state, ticks)
+        self._append(DECAY_EVENT, -1, ticks)
+
+    def events(self):
+        """Retained events, oldest first, as a structured array (EVENT_DTYPE)."""
+        return self._events[self._start:self._size].copy()
+
+    def intensities_at(self, timestamp):
+        """Intensity vector (one value per EMOTION_CATEGORIES entry) at timestamp, after events at that time."""
+        return self.intensities_at_times([timestamp])[0]
+
+    def intensities_at_times(self, timestamps):
+        """(n x emotions) array of the intensities at each of n timestamps (any order)."""
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if len(timestamps) and timestamps.min() < self.retained_since:
+            raise ValueError(f"Timeline only retains history since {self.retained_since}")
+        events = self._events[self._start:self._size]
+        # Number of events at or before each requested time, as absolute event numbers
+        event_counts = np.searchsorted(events["time"], timestamps, side="right") + self._base + self._start
+        states = np.zeros((len(timestamps), len(EMOTION_CATEGORIES)))
+        state, position = None, None
+        for row in np.argsort(event_counts, kind="stable").tolist():
+            target = int(event_counts[row])
+            checkpoint = bisect.bisect_right(self._checkpoint_events, target) - 1
+            if position is None or position < self._checkpoint_events[checkpoint] or position > target:
+                position, state = self._checkpoint_events[checkpoint], list(self._checkpoint_states[checkpoint])
+            self._replay(state, position, target)
+            position = target
+            states[row] = state
+        return states
+
+    def intensities_between(self, start, end):
+        """
+        Event times in [start, end] and the intensities right after each of them, as (times, (n x emotions) array),
+        preceded by the state at start.
+        """
+        events = self._events[self._start:self._size]
+        first, last = np.searchsorted(events["time"], [start, end], side="right")
+        times = np.concatenate(([start], events["time"][first:last]))
+        return times, self.intensities_at_times(times)
+
+    def _replay(self, state, position, target):
+        """Applies events position..target-1 (absolute numbers) to state in place."""
+        offset = self._base
+        for event_time, pathway, column, value in self._events[position - offset:target - offset].tolist():
+            if pathway == DECAY_EVENT:
+                self._decay(state, value)
+            elif column >= 0:
+                state[column] += value
+
+    def _decay(self, state, ticks):
+        # Same arithmetic as EmotionAI_PathBased_DynamicIntensity_V3.advance, so replays are exact
+        for column, rate in enumerate(self.decay_rates):
+            if state[column] > 0:
+                state[column] -= rate * ticks
+                if state[column] < 0:
+                    state[column] = 0.0
+
+    def _append(self, pathway, column, value):
+        if self._size == len(self._events):
+            self._make_room()
+        now = self.timeline.clock.time()
+        self._events[self._size] = (now, pathway, column, value)
+        self._size += 1
+        if (self._size + self._base) - self._checkpoint_events[-1] >= self.timeline.checkpoint_every:
+            self._checkpoint_events.append(self._size + self._base)
+            self._checkpoint_times.append(now)
+            self._checkpoint_states.append(list(self.state))
+            self._apply_retention(now)
+
+    def _apply_retention(self, now):
+        """Drops whole checkpoint intervals that fall outside the retention window."""
+        timeline = self.timeline
+        keep = 0
+        for checkpoint in range(1, len(self._checkpoint_events)):
+            retained_events = self._size + self._base - self._checkpoint_events[checkpoint]
+            too_old = timeline.retention_seconds is not None and self._checkpoint_times[checkpoint] <= now - timeline.retention_seconds
+            too_many = timeline.max_events is not None and retained_events >= timeline.max_events
+            if too_old or too_many:
+                keep = checkpoint
+        if keep:
+            del self._checkpoint_events[:keep], self._checkpoint_times[:keep], self._checkpoint_states[:keep]
+            self._start = self._checkpoint_events[0] - self._base
+
+    def _make_room(self):
+        retained = self._size - self._start
+        if self._start >= retained: # At least half the buffer is dropped history: compact in place
+            self._events[:retained] = self._events[self._start:self._size]
+        else:
+            grown = np.zeros(len(self._events) * 2, dtype=EVENT_DTYPE)
+            grown[:retained] = self._events[self._start:self._size]
+            self._events = grown
+        self._base += self._start
+        self._size, self._start = retained, 0
+
+
+class EmotionTimeline:
+    """
+    Optional recorder of per-session emotion timelines for point-in-time audits.
+
+    attach() hooks a session's emotion AI: from then on each appraisal and each decay step is logged as a
+    compact event, and the intensity vector is checkpointed every checkpoint_every events. Retention keeps
+    at least retention_seconds of history and/or at most about max_events events per session (rounded to
+    whole checkpoint intervals).
+    """
+    def __init__(self, checkpoint_every=64, retention_seconds=None, max_events=None, clock=None):
+        self.checkpoint_every = checkpoint_every
+        self.retention_seconds = retention_seconds
+        self.max_events = max_events
+        self.clock = clock or SYSTEM_CLOCK # Event times are clock.time()
+        self.sessions = {} # session id -> SessionTimeline
+        self.pathway_names = [] # pathway code -> name
+        self._pathway_codes = {}
+
+    def attach(self, session_id, emotion_ai):
+        """Starts recording an emotion AI as session_id, from its current intensities."""
+        session = SessionTimeline(self, emotion_ai.get_emotion_intensity(), emotion_ai.intensity_decay_rates)
+        emotion_ai.timeline = session # First: emotion AIs that can't be recorded refuse it
+        self.sessions[session_id] = session
+        return session
+
+    def detach(self, session_id, emotion_ai=None):
+        session = self.sessions.pop(session_id)
+        if emotion_ai is not None and emotion_ai.timeline is session:
+            emotion_ai.timeline = None
+        return session
+
+    def session(self, session_id):
+        return self.sessions[session_id]
+
+    def intensities_at(self, session_id, timestamp):
+        """{emotion: intensity} of a session at timestamp."""
+        return dict(zip(EMOTION_CATEGORIES, self.sessions[session_id].intensities_at(timestamp).tolist()))
+
+    def intensities_between(self, session_id, start, end):
+        return self.sessions[session_id].intensities_between(start, end)
+
+    def pathway_code(self, pathway):
+        code = self._pathway_codes.get(pathway)
+        if code is None:
+            code = self._pathway_codes[pathway] = len(self.pathway_names)
+            self.pathway_names.append(pathway)
+        return code
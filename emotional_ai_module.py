@@ -1,484 +1,1007 @@
 # emotional_ai_module.py
-import time
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+
+from cadence_clock import SYSTEM_CLOCK
+
+# Core emotion categories (Plutchik's Wheel)
+EMOTION_CATEGORIES = ("JOY", "SADNESS", "ANGER", "FEAR", "TRUST", "DISGUST", "ANTICIPATION", "SURPRISE")
+PATHWAY_STAGES = ("valence", "relevance", "physiological", "expression", "emotion", "intensity") # Emotion path order
+
+# Intensity level -> (base intensity, whether appraisal_intensity_multiplier applies)
+INTENSITY_LEVELS = {
+    "VERY_LOW": (0.1, False),
+    "LOW": (0.2, False),
+    "MEDIUM": (0.35, True), # Adjusted base, multiplier applied
+    "HIGH": (0.6, True), # Adjusted base, multiplier applied
+    "VERY_HIGH": (0.85, True), # Adjusted base, multiplier applied
+}
+
+# Emotion pathways - simplified examples, can be expanded
+_EMOTION_PATHWAY_LITERALS = {
+    "positive_stimulus": {
+        "valence": "[APPRAISAL_VALENCE_POSITIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_GOAL]",
+        "physiological": "[PHYSIO_AROUSAL_LOW]",
+        "expression": "[EXPR_SMILE]",
+        "emotion": "[EMOTION_JOY]",
+        "intensity": "[INTENSITY_MEDIUM]"
+    },
+    "negative_stimulus_threat": {
+        "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_THREAT]",
+        "physiological": "[PHYSIO_AROUSAL_HIGH]",
+        "expression": "[EXPR_FROWN]",
+        "emotion": "[EMOTION_FEAR]",
+        "intensity": "[INTENSITY_HIGH]"
+    },
+     "social_positive_feedback": {
+        "valence": "[APPRAISAL_VALENCE_POSITIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_SOCIAL]",
+        "physiological": "[PHYSIO_AROUSAL_LOW]",
+        "expression": "[EXPR_SMILE_NOD]",
+        "emotion": "[EMOTION_TRUST]", # Or JOY, depending on nuance
+        "intensity": "[INTENSITY_MEDIUM]"
+    },
+    "social_negative_feedback": {
+        "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_SOCIAL]",
+        "physiological": "[PHYSIO_AROUSAL_MEDIUM]",
+        "expression": "[EXPR_FROWN_SHAKE_HEAD]",
+        "emotion": "[EMOTION_SADNESS]", # Or ANGER/FEAR depending on context
+        "intensity": "[INTENSITY_MEDIUM]"
+    },
+    "neutral_stimulus": {
+        "valence": "[APPRAISAL_VALENCE_NEUTRAL]",
+        "relevance": "[APPRAISAL_RELEVANCE_NONE]",
+        "physiological": "[PHYSIO_AROUSAL_NONE]",
+        "expression": "[EXPR_NEUTRAL]",
+        "emotion": "[EMOTION_NONE]",
+        "intensity": "[INTENSITY_NONE]"
+    },
+    "intellectual_stimulus": { # Stimulus that is thought-provoking
+        "valence": "[APPRAISAL_VALENCE_NEUTRAL]", # Could be positive if curious, negative if confusing
+        "relevance": "[APPRAISAL_RELEVANCE_COGNITIVE]",
+        "physiological": "[PHYSIO_AROUSAL_LOW]", # Or medium if very engaging
+        "expression": "[EXPR_THINKING]",
+        "emotion": "[EMOTION_ANTICIPATION]", # Or SURPRISE/INTEREST
+        "intensity": "[INTENSITY_LOW]" # Or medium
+    },
+    "aesthetic_positive": { # e.g., beautiful music, art
+        "valence": "[APPRAISAL_VALENCE_POSITIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_AESTHETIC]",
+        "physiological": "[PHYSIO_AROUSAL_MEDIUM]", # Or low, depending on intensity
+        "expression": "[EXPR_APPRECIATION]",
+        "emotion": "[EMOTION_JOY]", # Or TRUST, SURPRISE, depending on art form
+        "intensity": "[INTENSITY_MEDIUM]"
+    },
+    "moral_violation": { # e.g., witnessing injustice
+        "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_MORAL]",
+        "physiological": "[PHYSIO_AROUSAL_HIGH]",
+        "expression": "[EXPR_ANGER_FROWN]",
+        "emotion": "[EMOTION_ANGER]", # Or DISGUST, SADNESS
+        "intensity": "[INTENSITY_HIGH]"
+    },
+     "stimulus_fear": { # Explicit fear stimulus
+        "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_THREAT]",
+        "physiological": "[PHYSIO_AROUSAL_VERY_HIGH]",
+        "expression": "[EXPR_EYES_WIDEN_MOUTH_OPEN]",
+        "emotion": "[EMOTION_FEAR]",
+        "intensity": "[INTENSITY_VERY_HIGH]"
+    },
+    "stimulus_sadness": { # Explicit sadness stimulus
+        "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_LOSS]",
+        "physiological": "[PHYSIO_AROUSAL_LOW]",
+        "expression": "[EXPR_SAD_FACE]",
+        "emotion": "[EMOTION_SADNESS]",
+        "intensity": "[INTENSITY_MEDIUM]"
+    },
+     "stimulus_joy": { # Explicit joy stimulus
+        "valence": "[APPRAISAL_VALENCE_POSITIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_GOAL_ACHIEVED]",
+        "physiological": "[PHYSIO_AROUSAL_MEDIUM]",
+        "expression": "[EXPR_WIDE_SMILE_LAUGH]",
+        "emotion": "[EMOTION_JOY]",
+        "intensity": "[INTENSITY_HIGH]"
+    },
+     "stimulus_anger": { # Explicit anger stimulus - provocation
+        "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_OFFENSIVE_AGENT]",
+        "physiological": "[PHYSIO_AROUSAL_HIGH]",
+        "expression": "[EXPR_FROWN_CLENCHED_JAW]",
+        "emotion": "[EMOTION_ANGER]",
+        "intensity": "[INTENSITY_HIGH]"
+    },
+    "stimulus_disgust": { # Explicit disgust stimulus - something offensive
+        "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_OFFENSIVE_OBJECT]",
+        "physiological": "[PHYSIO_AROUSAL_MEDIUM]", # or low, depending on disgust type
+        "expression": "[EXPR_NOSE_WRINKLE_LIP_CURL]",
+        "emotion": "[EMOTION_DISGUST]",
+        "intensity": "[INTENSITY_MEDIUM]"
+    },
+     "stimulus_surprise": { # Explicit surprise stimulus - unexpected event
+        "valence": "[APPRAISAL_VALENCE_NEUTRAL]", # Surprise itself is valence neutral
+        "relevance": "[APPRAISAL_RELEVANCE_UNEXPECTED_EVENT]",
+        "physiological": "[PHYSIO_AROUSAL_MEDIUM_HIGH]", # Surprise can be arousing
+        "expression": "[EXPR_EYEBROWS_RAISED_MOUTH_OPEN_SIGHTLY]",
+        "emotion": "[EMOTION_SURPRISE]",
+        "intensity": "[INTENSITY_MEDIUM]"
+    },
+     "stimulus_trust": { # Explicit trust/bond stimulus - positive social connection
+        "valence": "[APPRAISAL_VALENCE_POSITIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_SOCIAL_BOND]",
+        "physiological": "[PHYSIO_AROUSAL_LOW]",
+        "expression": "[EXPR_WARM_SMILE_EYE_CONTACT]",
+        "emotion": "[EMOTION_TRUST]",
+        "intensity": "[INTENSITY_MEDIUM]"
+    },
+    "stimulus_anticipation": { # Explicit anticipation stimulus - upcoming event
+        "valence": "[APPRAISAL_VALENCE_NEUTRAL]", # Anticipation can be positive or negative leaning
+        "relevance": "[APPRAISAL_RELEVANCE_FUTURE_EVENT]",
+        "physiological": "[PHYSIO_AROUSAL_MEDIUM]", # Arousal depends on what is anticipated
+        "expression": "[EXPR_ATTENTIVE_LOOK]",
+        "emotion": "[EMOTION_ANTICIPATION]",
+        "intensity": "[INTENSITY_MEDIUM]"
+    },
+    "stimulus_sad_news": {
+        "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_LOSS]",
+        "physiological": "[PHYSIO_AROUSAL_LOW]",
+        "expression": "[EXPR_SAD_FACE_TEARS]",
+        "emotion": "[EMOTION_SADNESS]",
+        "intensity": "[INTENSITY_HIGH]"
+    },
+    "stimulus_good_news": {
+        "valence": "[APPRAISAL_VALENCE_POSITIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_GOAL_ACHIEVED]",
+        "physiological": "[PHYSIO_AROUSAL_MEDIUM]",
+        "expression": "[EXPR_BRIGHT_SMILE_EXCITED]",
+        "emotion": "[EMOTION_JOY]",
+        "intensity": "[INTENSITY_HIGH]"
+    },
+    "stimulus_threat_imminent": {
+        "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_IMMINENT_DANGER]",
+        "physiological": "[PHYSIO_AROUSAL_VERY_HIGH]",
+        "expression": "[EXPR_PANICKED_LOOK]",
+        "emotion": "[EMOTION_FEAR]",
+        "intensity": "[INTENSITY_VERY_HIGH]"
+    },
+    "stimulus_insult": {
+        "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_SOCIAL_OFFENSE]",
+        "physiological": "[PHYSIO_AROUSAL_MEDIUM_HIGH]",
+        "expression": "[EXPR_FROWN_GLARE]",
+        "emotion": "[EMOTION_ANGER]",
+        "intensity": "[INTENSITY_MEDIUM_HIGH]"
+    },
+     "stimulus_social_praise": {
+        "valence": "[APPRAISAL_VALENCE_POSITIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_SOCIAL_APPROVAL]",
+        "physiological": "[PHYSIO_AROUSAL_LOW]",
+        "expression": "[EXPR_SMILE_NOD_APPROVINGLY]",
+        "emotion": "[EMOTION_JOY]", # or TRUST, PRIDE
+        "intensity": "[INTENSITY_MEDIUM]"
+    },
+    "stimulus_social_rejection": {
+        "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_SOCIAL_DISAPPROVAL]",
+        "physiological": "[PHYSIO_AROUSAL_MEDIUM]",
+        "expression": "[EXPR_SAD_FACE_AVOID_EYE_CONTACT]",
+        "emotion": "[EMOTION_SADNESS]", # or ANGER, FEAR depending on context
+        "intensity": "[INTENSITY_MEDIUM]"
+    },
+     "stimulus_unfairness": {
+        "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_MORAL_VIOLATION]", # Unfairness is a moral violation
+        "physiological": "[PHYSIO_AROUSAL_MEDIUM_HIGH]",
+        "expression": "[EXPR_FROWN_DISAPPROVAL]",
+        "emotion": "[EMOTION_ANGER]", # or DISGUST
+        "intensity": "[INTENSITY_MEDIUM_HIGH]"
+    },
+     "stimulus_betrayal": {
+        "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_SOCIAL_BETRAYAL]",
+        "physiological": "[PHYSIO_AROUSAL_HIGH]",
+        "expression": "[EXPR_SAD_ANGER_MIXED]", # Complex expression
+        "emotion": "[EMOTION_ANGER]", # or SADNESS, TRUST broken
+        "intensity": "[INTENSITY_HIGH]"
+    },
+     "stimulus_disappointment": {
+        "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_UNMET_EXPECTATION]",
+        "physiological": "[PHYSIO_AROUSAL_LOW]",
+        "expression": "[EXPR_SAD_FACE_SLIGHT]",
+        "emotion": "[EMOTION_SADNESS]", # or ANGER if expectation violated by agent
+        "intensity": "[INTENSITY_LOW]"
+    },
+     "stimulus_challenge": {
+        "valence": "[APPRAISAL_VALENCE_NEUTRAL]", # Challenge can be positive or negative depending on framing
+        "relevance": "[APPRAISAL_RELEVANCE_TASK_DIFFICULTY]",
+        "physiological": "[PHYSIO_AROUSAL_MEDIUM]", # Arousal for focus/effort
+        "expression": "[EXPR_CONCENTRATION]",
+        "emotion": "[EMOTION_ANTICIPATION]", # or SURPRISE, depending on nature of challenge
+        "intensity": "[INTENSITY_MEDIUM]"
+    },
+     "stimulus_confusion": {
+        "valence": "[APPRAISAL_VALENCE_NEGATIVE]", # Confusion is often negatively valenced
+        "relevance": "[APPRAISAL_RELEVANCE_UNCERTAINTY]",
+        "physiological": "[PHYSIO_AROUSAL_LOW_MEDIUM]", # Mild arousal, cognitive effort
+        "expression": "[EXPR_CONFUSED_LOOK]",
+        "emotion": "[EMOTION_FEAR]", # or SURPRISE, depending on context of confusion
+        "intensity": "[INTENSITY_LOW]"
+    },
+     "stimulus_boredom": {
+        "valence": "[APPRAISAL_VALENCE_NEGATIVE]", # Boredom is negative valence
+        "relevance": "[APPRAISAL_RELEVANCE_LACK_OF_STIMULATION]",
+        "physiological": "[PHYSIO_AROUSAL_VERY_LOW]", # Low arousal
+        "expression": "[EXPR_LISTLESS_LOOK_YAWN]",
+        "emotion": "[EMOTION_DISGUST]", # or SADNESS, ANGER (at situation)
+        "intensity": "[INTENSITY_LOW]"
+    },
+    "stimulus_overload": {
+        "valence": "[APPRAISAL_VALENCE_NEGATIVE]", # Overload is negative
+        "relevance": "[APPRAISAL_RELEVANCE_PROCESSING_LIMIT_EXCEEDED]",
+        "physiological": "[PHYSIO_AROUSAL_HIGH]", # High arousal, stress response
+        "expression": "[EXPR_STRESSED_LOOK]",
+        "emotion": "[EMOTION_FEAR]", # or ANGER, SADNESS
+        "intensity": "[INTENSITY_HIGH]"
+    },
+     "stimulus_frustration": {
+        "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_GOAL_BLOCKAGE]", # Goal is blocked
+        "physiological": "[PHYSIO_AROUSAL_MEDIUM_HIGH]", # Arousal from blocked goal
+        "expression": "[EXPR_FROWN_CLENCHED_FIST]",
+        "emotion": "[EMOTION_ANGER]", # or SADNESS, depending on type of blockage
+        "intensity": "[INTENSITY_MEDIUM_HIGH]"
+    },
+     "stimulus_social_connection": {
+        "valence": "[APPRAISAL_VALENCE_POSITIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_SOCIAL_BONDING]",
+        "physiological": "[PHYSIO_AROUSAL_LOW]",
+        "expression": "[EXPR_WARM_SMILE_RELAXED]",
+        "emotion": "[EMOTION_TRUST]", # or JOY, LOVE
+        "intensity": "[INTENSITY_MEDIUM]"
+    },
+     "stimulus_achievement": {
+        "valence": "[APPRAISAL_VALENCE_POSITIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_GOAL_ACHIEVED]",
+        "physiological": "[PHYSIO_AROUSAL_MEDIUM]",
+        "expression": "[EXPR_PROUD_SMILE]",
+        "emotion": "[EMOTION_JOY]", # or PRIDE, TRUST in self
+        "intensity": "[INTENSITY_MEDIUM]"
+    },
+     "stimulus_curiosity": {
+        "valence": "[APPRAISAL_VALENCE_NEUTRAL]", # Curiosity itself neutral, can be positive or negative context
+        "relevance": "[APPRAISAL_RELEVANCE_NEW_INFORMATION]",
+        "physiological": "[PHYSIO_AROUSAL_MEDIUM]", # Arousal for attention, exploration
+        "expression": "[EXPR_INTERESTED_LOOK]",
+        "emotion": "[EMOTION_ANTICIPATION]", # or SURPRISE, depending on what is discovered
+        "intensity": "[INTENSITY_MEDIUM]"
+    },
+     "stimulus_humor": {
+        "valence": "[APPRAISAL_VALENCE_POSITIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_FUNNY]",
+        "physiological": "[PHYSIO_AROUSAL_MEDIUM]", # Arousal from laughter, amusement
+        "expression": "[EXPR_SMILE_LAUGH]",
+        "emotion": "[EMOTION_JOY]", # or SURPRISE, if humor is unexpected
+        "intensity": "[INTENSITY_MEDIUM]"
+    },
+     "stimulus_challenge_met": {
+        "valence": "[APPRAISAL_VALENCE_POSITIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_TASK_COMPLETED]", # Overcoming challenge
+        "physiological": "[PHYSIO_AROUSAL_LOW_MEDIUM]", # Arousal subsides after challenge met
+        "expression": "[EXPR_SATISFIED_SMILE]",
+        "emotion": "[EMOTION_JOY]", # or PRIDE, RELIEF
+        "intensity": "[INTENSITY_MEDIUM]"
+    },
+     "stimulus_social_cue": { # Generic social cue, e.g., greeting, positive tone
+        "valence": "[APPRAISAL_VALENCE_POSITIVE]", # Social cues often positive unless negative tone
+        "relevance": "[APPRAISAL_RELEVANCE_SOCIAL_INTERACTION]",
+        "physiological": "[PHYSIO_AROUSAL_LOW]", # Social interaction baseline arousal
+        "expression": "[EXPR_NEUTRAL_NOD]", # Or smile if positive cue
+        "emotion": "[EMOTION_TRUST]", # Baseline social trust
+        "intensity": "[INTENSITY_LOW]"
+    },
+    "stimulus_reassurance": {
+        "valence": "[APPRAISAL_VALENCE_POSITIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_THREAT_REMOVED]", # Reassurance removes threat
+        "physiological": "[PHYSIO_AROUSAL_LOWERED]", # Arousal decreases
+        "expression": "[EXPR_RELIEF_SMILE]",
+        "emotion": "[EMOTION_JOY]", # or TRUST, RELIEF
+        "intensity": "[INTENSITY_MEDIUM]"
+    },
+     "stimulus_comfort": {
+        "valence": "[APPRAISAL_VALENCE_POSITIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_WELLBEING]", # Comfort related to wellbeing
+        "physiological": "[PHYSIO_AROUSAL_VERY_LOW]", # Very low arousal, relaxation
+        "expression": "[EXPR_RELAXED_SMILE]",
+        "emotion": "[EMOTION_JOY]", # or TRUST, CONTENTMENT
+        "intensity": "[INTENSITY_LOW]"
+    },
+     "stimulus_gratitude": {
+        "valence": "[APPRAISAL_VALENCE_POSITIVE]",
+        "relevance": "[APPRAISAL_RELEVANCE_BENEFIT_RECEIVED]", # Gratitude for benefit
+        "physiological": "[PHYSIO_AROUSAL_LOW]", # Low arousal, warm feeling
+        "expression": "[EXPR_GRATEFUL_SMILE]",
+        "emotion": "[EMOTION_TRUST]", # or JOY, LOVE, depending on depth of gratitude
+        "intensity": "[INTENSITY_MEDIUM]"
+    },
+}
+
+
+class PathwayRecord:
+    """
+    One compiled emotion pathway: its tags in emotion path order plus the precomputed intensity effect.
+    """
+    __slots__ = ("name", "index", "tags", "emotion", "emotion_index", "base_intensity", "scaled")
+
+    def __init__(self, name, index, stages):
+        self.name = name
+        self.index = index
+        self.tags = tuple(sys.intern(stages[stage]) for stage in PATHWAY_STAGES)
+        emotion = stages["emotion"][len("[EMOTION_"):-1]
+        self.emotion = emotion if emotion in EMOTION_CATEGORIES else None
+        self.emotion_index = EMOTION_CATEGORIES.index(emotion) if self.emotion else -1
+        intensity_level = stages["intensity"][len("[INTENSITY_"):-1]
+        # Levels outside the ladder (e.g. MEDIUM_HIGH) add no intensity
+        self.base_intensity, self.scaled = INTENSITY_LEVELS.get(intensity_level, (0.0, False)) if self.emotion else (0.0, False)
+
+    def intensity_delta(self, appraisal_intensity_multiplier):
+        """Intensity this pathway adds to its emotion."""
+        return self.base_intensity * appraisal_intensity_multiplier if self.scaled else self.base_intensity
+
+
+def _compile_pathways(pathway_literals):
+    table = tuple(PathwayRecord(name, index, stages) for index, (name, stages) in enumerate(pathway_literals.items()))
+    read_only = MappingProxyType({name: MappingProxyType(dict(stages)) for name, stages in pathway_literals.items()})
+    return table, read_only
+
+
+# Compiled once at import and shared by every instance
+PATHWAY_TABLE, EMOTION_PATHWAYS = _compile_pathways(_EMOTION_PATHWAY_LITERALS)
+PATHWAYS_BY_NAME = {record.name: record for record in PATHWAY_TABLE}
+PATHWAY_NAMES = tuple(PATHWAYS_BY_NAME)
+PATHWAY_IDS = {record.name: record.index for record in PATHWAY_TABLE}
+
+# Appraisal rules, in cascade order. Each entry is
+# (category keywords, default pathway, ((sub keywords, sub pathway), ...)).
+# The first category with any keyword present wins; inside it the first matching
+# sub rule refines the pathway, otherwise the default is used.
+DEFAULT_APPRAISAL_RULES = (
+    (("excellent", "good job", "doing well", "validated", "praise", "thank you", "joyful", "won an award", "surprise party", "good news", "social praise", "challenge met", "social connection", "achievement", "humor", "comfort", "gratitude", "reassurance"),
+     "positive_stimulus", ( # Default positive, more specific paths below
+        (("excellent", "good job", "doing well", "validated", "praise", "social praise", "thank you", "gratitude"), "stimulus_social_praise"),
+        (("joyful", "won award", "good news"), "stimulus_good_news"),
+        (("surprise party", "surprise"), "stimulus_surprise"),
+        (("challenge met",), "stimulus_challenge_met"),
+        (("social connection",), "stimulus_social_connection"),
+        (("achievement",), "stimulus_achievement"),
+        (("humor",), "stimulus_humor"),
+        (("comfort",), "stimulus_comfort"),
+        (("reassurance",), "stimulus_reassurance"),
+    )),
+    (("scary", "threat", "danger", "fear", "scared", "afraid", "threat imminent", "overload", "confusion"),
+     "negative_stimulus_threat", ( # Default threat, more specific paths below
+        (("scary threat", "threat imminent", "danger", "threat", "fear", "afraid"), "stimulus_threat_imminent"),
+        (("confusion",), "stimulus_confusion"),
+        (("overload",), "stimulus_overload"),
+    )),
+    (("sad", "loss", "disappointed", "sad news", "betrayal", "social rejection", "boredom", "disappointment"),
+     "stimulus_sadness", ( # Default sadness, more specific paths below
+        (("sad news", "loss", "sad"), "stimulus_sad_news"),
+        (("betrayal",), "stimulus_betrayal"),
+        (("social rejection",), "stimulus_social_rejection"),
+        (("boredom",), "stimulus_boredom"),
+        (("disappointment", "disappointed"), "stimulus_disappointment"),
+    )),
+    (("angry", "insult", "unfair", "frustrated", "anger", "disgust", "disgusting", "moral violation", "stimulus_anger", "stimulus_disgust", "unfairness", "frustration"),
+     "moral_violation", ( # Default anger/disgust, more specific paths below
+        (("angry", "insult", "anger", "stimulus_anger"), "stimulus_insult"), # Or stimulus_anger
+        (("unfair", "unfairness", "moral violation"), "stimulus_unfairness"), # Or moral_violation
+        (("disgust", "disgusting", "stimulus_disgust"), "stimulus_disgust"),
+        (("frustrated", "frustration"), "stimulus_frustration"),
+    )),
+    (("interesting", "question", "intellectual", "curious", "challenge"),
+     "intellectual_stimulus", ( # Default intellectual, more specific paths below
+        (("interesting question", "question", "intellectual"), "intellectual_stimulus"),
+        (("curious", "curiosity"), "stimulus_curiosity"),
+        (("challenge",), "stimulus_challenge"),
+    )),
+    (("mozart", "music", "aesthetic", "beautiful", "art", "song"),
+     "aesthetic_positive", (
+        (("mozart", "music", "song"), "aesthetic_positive"), # More specific music path if needed
+    )),
+    (("constitution", "law", "government", "justice", "liberty", "tranquility", "welfare"),
+     "social_positive_feedback", ()), # Could be refined, using social_positive for now as placeholder
+    (("bible", "king james version", "genesis", "exodus", "psalms", "gospels", "revelation", "christian"),
+     "intellectual_stimulus", ()), # Broader religious/spiritual stimuli, could create a "spiritual_stimulus" path
+    (("tell-tale heart", "edgar allan poe", "horror", "dark", "disturbing", "unsettling", "madness", "murder", "fearful", "vulture eye"),
+     "stimulus_fear", ()), # Or could create a "fiction_horror_stimulus" path
+    (("hello", "hi", "greetings", "how are you", "cadence", "gemini"),
+     "stimulus_social_cue", ()), # Social greeting/cue
+)
+DEFAULT_PATHWAY = "neutral_stimulus" # Used when no category matches
+MULTI_LABEL_MEMO_SIZE = 4096 # Distinct keyword hit sets, and texts, whose multi-label results each index remembers
+MULTI_LABEL_MEMO_TEXT_LENGTH = 256 # Longer texts are not memoized by text
+
+
+class KeywordMatcher:
+    """
+    Finds every keyword occurring as a substring of a text in a single regex pass.
+    """
+    def __init__(self, keywords, compiled=None):
+        self.keywords = frozenset(keywords)
+        if compiled is None:
+            compiled = self.compile(self.keywords)
+        self._prefix_closure = {keyword: frozenset(prefixes) for keyword, prefixes in compiled["prefix_closure"].items()}
+        self._pattern = re.compile(compiled["pattern"]) if compiled["pattern"] else None
+
+    @classmethod
+    def compile(cls, keywords):
+        """
+        The JSON-serializable compiled form of a keyword set: the trie regex source and the prefix closure.
+        """
+        keywords = sorted(set(keywords))
+        return {
+            # Zero-width lookahead so overlapping and nested keywords are all visited
+            "pattern": "(?=(%s))" % cls._trie_regex(keywords) if keywords else None,
+            # A keyword can only share a start position with the keywords that are its prefixes,
+            # so the longest hit at each position is enough to recover all of them.
+            "prefix_closure": {keyword: [other for other in keywords if keyword.startswith(other)] for keyword in keywords},
+        }
+
+    @classmethod
+    def _trie_regex(cls, keywords):
+        """Builds a regex for the longest keyword match, shaped like a trie so each position is cheap to test."""
+        terminal = "" in keywords
+        branches = {}
+        for keyword in keywords:
+            if keyword:
+                branches.setdefault(keyword[0], []).append(keyword[1:])
+        alternatives = [re.escape(first) + cls._trie_regex(rests) for first, rests in sorted(branches.items())]
+        if not alternatives:
+            return ""
+        group = alternatives[0] if len(alternatives) == 1 else "(?:%s)" % "|".join(alternatives)
+        if terminal:
+            return "(?:%s)?" % group # Greedy, so the longer keyword is preferred
+        return group
+
+    def find_all(self, text, stop_keywords=frozenset()):
+        """
+        Returns the set of keywords present in text.
+        Scanning stops early once any of stop_keywords is found, since the caller can't use more hits.
+        """
+        found = set()
+        if self._pattern is None:
+            return found
+        for match in self._pattern.finditer(text):
+            hit_keywords = self._prefix_closure[match.group(1)]
+            found |= hit_keywords
+            if stop_keywords and not hit_keywords.isdisjoint(stop_keywords):
+                break
+        return found
+
+
+class AppraisalIndex:
+    """
+    Compiled form of an appraisal rule table: one keyword matcher plus the cascade as set lookups,
+    and the pathway table the selected pathways resolve to. Immutable once built, so it can be shared
+    and swapped as a whole (see set_appraisal_index).
+    """
+    def __init__(self, rules=DEFAULT_APPRAISAL_RULES, default_pathway=DEFAULT_PATHWAY, pathways=None, compiled_matcher=None):
+        self.rules = rules
+        self.default_pathway = default_pathway
+        if pathways is None:
+            self.pathway_table, self.emotion_pathways = PATHWAY_TABLE, EMOTION_PATHWAYS
+        else:
+            self.pathway_table, self.emotion_pathways = _compile_pathways(pathways)
+        self.pathways_by_name = {record.name: record for record in self.pathway_table}
+        self.pathway_names = tuple(self.pathways_by_name)
+        self.pathway_ids = {record.name: record.index for record in self.pathway_table}
+
+        self.cascade = tuple(
+            (frozenset(category_keywords), category_pathway,
+             tuple((frozenset(sub_keywords), sub_pathway) for sub_keywords, sub_pathway in sub_rules))
+            for category_keywords, category_pathway, sub_rules in rules
+        )
+        keywords = set()
+        for category_keywords, _, sub_rules in self.cascade:
+            keywords |= category_keywords
+            for sub_keywords, _ in sub_rules:
+                keywords |= sub_keywords
+        self.matcher = KeywordMatcher(keywords, compiled_matcher)
+        # keyword -> ((category, sub rule or -1), ...) of the rules listing it, for select_pathways
+        keyword_rules = {}
+        for category, (category_keywords, _, sub_rules) in enumerate(self.cascade):
+            for keyword in category_keywords:
+                keyword_rules.setdefault(keyword, []).append((category, -1))
+            for sub_rule, (sub_keywords, _) in enumerate(sub_rules):
+                for keyword in sub_keywords:
+                    keyword_rules.setdefault(keyword, []).append((category, sub_rule))
+        self.keyword_rules = {keyword: tuple(rules) for keyword, rules in keyword_rules.items()}
+        self._weights_by_hits = {} # frozenset of matched keywords -> select_pathways result; few distinct sets recur
+        self._multi_label_by_text = {} # Short lowercased text -> multi_label result; repeated messages skip the keyword pass
+        # Keywords that settle the cascade outright: they hit the first category and its first sub rule
+        self.decisive_keywords = frozenset()
+        if self.cascade:
+            first_keywords, _, first_sub_rules = self.cascade[0]
+            self.decisive_keywords = first_keywords & first_sub_rules[0][0] if first_sub_rules else first_keywords
+
+    def select_pathway(self, stimulus_text_lower):
+        """Returns the pathway name the cascade selects for already lowercased text."""
+        hits = self.matcher.find_all(stimulus_text_lower, self.decisive_keywords)
+        if not hits:
+            return self.default_pathway
+        for category_keywords, category_pathway, sub_rules in self.cascade:
+            if not hits.isdisjoint(category_keywords):
+                for sub_keywords, sub_pathway in sub_rules:
+                    if not hits.isdisjoint(sub_keywords):
+                        return sub_pathway
+                return category_pathway
+        return self.default_pathway
+
+    def select_pathways(self, stimulus_text_lower):
+        """
+        Multi-label selection from one full keyword pass: every pathway the cascade would reach through any
+        matched category (each matched sub rule, or the category pathway when none matches), weighted by
+        its number of matched keywords. Returns {pathway: weight} with weights summing to 1, strongest first
+        (ties in cascade order); {default_pathway: 1.0} when nothing matches.
+
+        Unlike select_pathway, the keyword pass can't stop at a decisive keyword, so a text seen for the first
+        time costs a full scan; results for texts up to MULTI_LABEL_MEMO_TEXT_LENGTH are memoized, so repeated
+        messages cost a lookup.
+        """
+        return dict(self.multi_label(stimulus_text_lower)[0])
+
+    def multi_label(self, stimulus_text_lower):
+        """
+        Memoized multi-label result: (pathway weights, emotion path of the strongest pathway, blend terms), where
+        the blend terms are (emotion, weight, pathway record) for each weighted pathway with an emotion to raise.
+        Shared between calls: callers must not modify it.
+        """
+        result = self._multi_label_by_text.get(stimulus_text_lower)
+        if result is not None:
+            return result
+        hits = frozenset(self.matcher.find_all(stimulus_text_lower))
+        weights = self._weights_by_hits.get(hits)
+        if weights is None:
+            if len(self._weights_by_hits) >= MULTI_LABEL_MEMO_SIZE:
+                self._weights_by_hits.clear()
+            weights = self._weights_by_hits[hits] = self._weigh_pathways(hits)
+        records = [(self.pathways_by_name.get(pathway), weight) for pathway, weight in weights.items()]
+        strongest = records[0][0]
+        result = (weights, tuple(strongest.tags) if strongest is not None else (), tuple(
+            (record.emotion, weight, record) for record, weight in records
+            if record is not None and record.emotion is not None and record.base_intensity
+        ))
+        if len(stimulus_text_lower) <= MULTI_LABEL_MEMO_TEXT_LENGTH:
+            if len(self._multi_label_by_text) >= MULTI_LABEL_MEMO_SIZE:
+                self._multi_label_by_text.clear()
+            self._multi_label_by_text[stimulus_text_lower] = result
+        return result
+
+    def _weigh_pathways(self, hits):
+        category_hits, sub_rule_hits = {}, {}
+        for keyword in hits:
+            for category, sub_rule in self.keyword_rules[keyword]:
+                if sub_rule < 0:
+                    category_hits[category] = category_hits.get(category, 0) + 1
+                else:
+                    sub_rule_hits[category, sub_rule] = sub_rule_hits.get((category, sub_rule), 0) + 1
+        if not category_hits:
+            return {self.default_pathway: 1.0}
+        matches = [] # (-count, category, sub rule or -1, pathway)
+        for (category, sub_rule), count in sub_rule_hits.items():
+            if category in category_hits: # Sub rules only refine a matched category
+                matches.append((-count, category, sub_rule, self.cascade[category][2][sub_rule][1]))
+        refined = {category for _, category, _, _ in matches}
+        for category, count in category_hits.items():
+            if category not in refined:
+                matches.append((-count, category, -1, self.cascade[category][1]))
+        counts = {}
+        for negative_count, _, _, pathway in sorted(matches): # Cascade order, so ties keep it below
+            counts[pathway] = counts.get(pathway, 0) - negative_count
+        total = sum(counts.values())
+        return {pathway: count / total for pathway, count in sorted(counts.items(), key=lambda item: -item[1])}
+
+
+RULES_FORMAT_VERSION = 1
+COMPILED_INDEX_FORMAT = 1 # Bump when KeywordMatcher.compile() output changes, to invalidate cached indexes
+
+
+def rules_to_data(rules=DEFAULT_APPRAISAL_RULES, default_pathway=DEFAULT_PATHWAY, pathways=None):
+    """The data-file (JSON) form of a rule table and pathway table; defaults to the built-in rules."""
+    return {
+        "version": RULES_FORMAT_VERSION,
+        "default_pathway": default_pathway,
+        "pathways": {name: dict(stages) for name, stages in (pathways or _EMOTION_PATHWAY_LITERALS).items()},
+        "rules": [
+            {"keywords": list(category_keywords), "pathway": category_pathway,
+             "refinements": [{"keywords": list(sub_keywords), "pathway": sub_pathway} for sub_keywords, sub_pathway in sub_rules]}
+            for category_keywords, category_pathway, sub_rules in rules
+        ],
+    }
+
+
+def rules_from_data(data):
+    """
+    Validates rule data (see rules_to_data) and returns (rules, default_pathway, pathways).
+    Without a "pathways" table the built-in pathways are used (pathways is None). Every pathway named by a
+    rule, refinement or default_pathway must be in the pathway table; any malformed entry raises ValueError.
+    """
+    if not isinstance(data, dict) or data.get("version") != RULES_FORMAT_VERSION:
+        raise ValueError(f"Expected appraisal rules version {RULES_FORMAT_VERSION}")
+    pathways = data.get("pathways")
+    if pathways is not None:
+        if not isinstance(pathways, dict) or not pathways:
+            raise ValueError("\"pathways\" must be a non-empty object of pathway name -> stages")
+        for name, stages in pathways.items():
+            if not isinstance(stages, dict):
+                raise ValueError(f"Pathway {name!r} must be an object of stage -> tag")
+            missing = [stage for stage in PATHWAY_STAGES if not isinstance(stages.get(stage), str)]
+            if missing:
+                raise ValueError(f"Pathway {name!r} is missing stages: {', '.join(missing)}")
+    pathway_names = _EMOTION_PATHWAY_LITERALS if pathways is None else pathways
+
+    def known(pathway, context):
+        if not isinstance(pathway, str) or pathway not in pathway_names:
+            raise ValueError(f"{context} names an unknown pathway: {pathway!r}")
+        return pathway
+
+    def rule(entry):
+        if not isinstance(entry, dict):
+            raise ValueError(f"Every rule must be an object: {entry!r}")
+        pathway = known(entry.get("pathway"), "Rule")
+        if not isinstance(entry.get("keywords"), list) or not all(isinstance(keyword, str) and keyword for keyword in entry["keywords"]):
+            raise ValueError(f"Rule for {pathway!r} needs a list of non-empty keyword strings")
+        return tuple(keyword.lower() for keyword in entry["keywords"]), pathway
+
+    def refinements(category):
+        sub_rules = category.get("refinements", [])
+        if not isinstance(sub_rules, list):
+            raise ValueError(f"Refinements of {category['pathway']!r} must be a list")
+        return tuple(rule(sub_rule) for sub_rule in sub_rules)
+
+    if not isinstance(data.get("rules"), list):
+        raise ValueError("\"rules\" must be a list of rules")
+    rules = tuple(rule(category) + (refinements(category),) for category in data["rules"])
+    return rules, known(data.get("default_pathway", DEFAULT_PATHWAY), "default_pathway"), pathways
+
+
+def dump_appraisal_rules(path, rules=DEFAULT_APPRAISAL_RULES, default_pathway=DEFAULT_PATHWAY, pathways=None):
+    """Writes a rules data file, by default the built-in rules, as a starting point for tuning."""
+    with open(path, "w", encoding="utf-8") as rules_file:
+        json.dump(rules_to_data(rules, default_pathway, pathways), rules_file, indent=2)
+        rules_file.write("\n")
+
+
+def load_appraisal_index(path, cache_dir=None):
+    """
+    Compiles the rules in a JSON data file into an AppraisalIndex. With a cache_dir, the compiled keyword
+    matcher is stored there under the SHA-256 of the file's content, and reused instead of recompiled.
+    """
+    with open(path, "rb") as rules_file:
+        content = rules_file.read()
+    rules, default_pathway, pathways = rules_from_data(json.loads(content))
+    if cache_dir is None:
+        return AppraisalIndex(rules, default_pathway, pathways)
+
+    content_hash = hashlib.sha256(b"%d\0" % COMPILED_INDEX_FORMAT + content).hexdigest()
+    cache_path = os.path.join(cache_dir, f"appraisal-{content_hash}.json")
+    try:
+        with open(cache_path, encoding="utf-8") as cache_file:
+            return AppraisalIndex(rules, default_pathway, pathways, compiled_matcher=json.load(cache_file))
+    except (FileNotFoundError, ValueError, KeyError):
+        pass # Not cached yet, or unreadable: compile and (re)write it
+    index = AppraisalIndex(rules, default_pathway, pathways)
+    os.makedirs(cache_dir, exist_ok=True)
+    temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as cache_file:
+        json.dump(index.matcher.compile(index.matcher.keywords), cache_file)
+    os.replace(temporary_path, cache_path)
+    return index
+
+
+_appraisal_index = AppraisalIndex() # Compiled once, shared by every instance
+if os.environ.get("CADENCE_APPRAISAL_RULES"): # Rules data file to use instead of the built-in rules
+    _appraisal_index = load_appraisal_index(os.environ["CADENCE_APPRAISAL_RULES"], os.environ.get("CADENCE_RULES_CACHE_DIR"))
+
+
+def get_appraisal_index():
+    """Returns the AppraisalIndex currently used for appraisal."""
+    return _appraisal_index
+
+
+def set_appraisal_index(appraisal_index):
+    """
+    Atomically replaces the rules used by every instance and returns the previous index.
+    Appraisals read the index once per call, so turns in flight finish on the index they started with
+    and the per-turn path needs no lock.
+    """
+    global _appraisal_index
+    previous, _appraisal_index = _appraisal_index, appraisal_index
+    return previous
+
+
+def reload_appraisal_rules(path, cache_dir=None):
+    """Compiles a rules data file and swaps it in. On error the current rules stay in effect."""
+    return set_appraisal_index(load_appraisal_index(path, cache_dir))
+
+
+class AppraisalCache:
+    """
+    Bounded LRU map from lowercased stimulus text to the pathway the appraisal index selects for it.
+    Entries belong to the index they were computed with and are dropped when a different index is used.
+    Texts longer than max_text_length are never cached.
+    """
+    def __init__(self, capacity=4096, max_text_length=256):
+        if capacity < 1:
+            raise ValueError("Appraisal cache capacity must be at least 1")
+        self.capacity = capacity
+        self.max_text_length = max_text_length
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._index = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def select_pathway(self, appraisal_index, stimulus_text_lower):
+        """appraisal_index.select_pathway(stimulus_text_lower), answered from the cache when possible."""
+        if len(stimulus_text_lower) > self.max_text_length:
+            return appraisal_index.select_pathway(stimulus_text_lower)
+        with self._lock:
+            if appraisal_index is not self._index:
+                self._entries.clear()
+                self._index = appraisal_index
+            pathway = self._entries.get(stimulus_text_lower)
+            if pathway is not None:
+                self._entries.move_to_end(stimulus_text_lower)
+                self.hits += 1
+                return pathway
+            self.misses += 1
+
+        pathway = appraisal_index.select_pathway(stimulus_text_lower) # Outside the lock
+        with self._lock:
+            if appraisal_index is self._index:
+                self._entries[stimulus_text_lower] = pathway
+                if len(self._entries) > self.capacity:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return pathway
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_appraisal_cache = None # Process-wide AppraisalCache shared by every instance, None = disabled
+
+
+def enable_appraisal_cache(capacity=4096, max_text_length=256):
+    """Turns on the shared appraisal cache (replacing any existing one) and returns it."""
+    global _appraisal_cache
+    _appraisal_cache = AppraisalCache(capacity, max_text_length)
+    return _appraisal_cache
+
+
+def disable_appraisal_cache():
+    global _appraisal_cache
+    _appraisal_cache = None
+
+
+def get_appraisal_cache():
+    """Returns the shared AppraisalCache, or None when caching is disabled."""
+    return _appraisal_cache
+
+
+def select_pathway(stimulus_text_lower, appraisal_index=None):
+    """Pathway selection for lowercased text (by default through the current index), using the appraisal cache if enabled."""
+    if appraisal_index is None:
+        appraisal_index = _appraisal_index
+    cache = _appraisal_cache
+    if cache is None:
+        return appraisal_index.select_pathway(stimulus_text_lower)
+    return cache.select_pathway(appraisal_index, stimulus_text_lower)
+
+
+def select_pathways(stimulus_text_lower, appraisal_index=None):
+    """Multi-label pathway weights for lowercased text (see AppraisalIndex.select_pathways), by default through the current index."""
+    return (appraisal_index or _appraisal_index).select_pathways(stimulus_text_lower)
+
 
 class EmotionAI_PathBased_DynamicIntensity_V3:
     """
     Emotion AI module using path-based emotion generation and dynamic intensity.
     Version 3: Intensity decay and appraisal intensity multipliers added.
     """
-    def __init__(self, intensity_decay_rates=None, appraisal_intensity_multiplier=1.2):
+    def __init__(self, intensity_decay_rates=None, appraisal_intensity_multiplier=1.2, decay_mode="tick", decay_tick_seconds=1.0, clock=None,
+                 appraisal_mode="single"):
         # Core emotion categories (Plutchik's Wheel)
-        self.emotion_categories = ["JOY", "SADNESS", "ANGER", "FEAR", "TRUST", "DISGUST", "ANTICIPATION", "SURPRISE"]
+        self.emotion_categories = list(EMOTION_CATEGORIES)
         self.emotion_intensity_levels = {emotion: 0.0 for emotion in self.emotion_categories}
         self.intensity_decay_rates = intensity_decay_rates if intensity_decay_rates else {emotion: 0.01 for emotion in self.emotion_categories} # Default decay rate
         self.appraisal_intensity_multiplier = appraisal_intensity_multiplier # Multiplier for appraisal intensity
 
-        # Emotion pathways - simplified examples, can be expanded
-        self.emotion_pathways = {
-            "positive_stimulus": {
-                "valence": "[APPRAISAL_VALENCE_POSITIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_GOAL]",
-                "physiological": "[PHYSIO_AROUSAL_LOW]",
-                "expression": "[EXPR_SMILE]",
-                "emotion": "[EMOTION_JOY]",
-                "intensity": "[INTENSITY_MEDIUM]"
-            },
-            "negative_stimulus_threat": {
-                "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_THREAT]",
-                "physiological": "[PHYSIO_AROUSAL_HIGH]",
-                "expression": "[EXPR_FROWN]",
-                "emotion": "[EMOTION_FEAR]",
-                "intensity": "[INTENSITY_HIGH]"
-            },
-             "social_positive_feedback": {
-                "valence": "[APPRAISAL_VALENCE_POSITIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_SOCIAL]",
-                "physiological": "[PHYSIO_AROUSAL_LOW]",
-                "expression": "[EXPR_SMILE_NOD]",
-                "emotion": "[EMOTION_TRUST]", # Or JOY, depending on nuance
-                "intensity": "[INTENSITY_MEDIUM]"
-            },
-            "social_negative_feedback": {
-                "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_SOCIAL]",
-                "physiological": "[PHYSIO_AROUSAL_MEDIUM]",
-                "expression": "[EXPR_FROWN_SHAKE_HEAD]",
-                "emotion": "[EMOTION_SADNESS]", # Or ANGER/FEAR depending on context
-                "intensity": "[INTENSITY_MEDIUM]"
-            },
-            "neutral_stimulus": {
-                "valence": "[APPRAISAL_VALENCE_NEUTRAL]",
-                "relevance": "[APPRAISAL_RELEVANCE_NONE]",
-                "physiological": "[PHYSIO_AROUSAL_NONE]",
-                "expression": "[EXPR_NEUTRAL]",
-                "emotion": "[EMOTION_NONE]",
-                "intensity": "[INTENSITY_NONE]"
-            },
-            "intellectual_stimulus": { # Stimulus that is thought-provoking
-                "valence": "[APPRAISAL_VALENCE_NEUTRAL]", # Could be positive if curious, negative if confusing
-                "relevance": "[APPRAISAL_RELEVANCE_COGNITIVE]",
-                "physiological": "[PHYSIO_AROUSAL_LOW]", # Or medium if very engaging
-                "expression": "[EXPR_THINKING]",
-                "emotion": "[EMOTION_ANTICIPATION]", # Or SURPRISE/INTEREST
-                "intensity": "[INTENSITY_LOW]" # Or medium
-            },
-            "aesthetic_positive": { # e.g., beautiful music, art
-                "valence": "[APPRAISAL_VALENCE_POSITIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_AESTHETIC]",
-                "physiological": "[PHYSIO_AROUSAL_MEDIUM]", # Or low, depending on intensity
-                "expression": "[EXPR_APPRECIATION]",
-                "emotion": "[EMOTION_JOY]", # Or TRUST, SURPRISE, depending on art form
-                "intensity": "[INTENSITY_MEDIUM]"
-            },
-            "moral_violation": { # e.g., witnessing injustice
-                "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_MORAL]",
-                "physiological": "[PHYSIO_AROUSAL_HIGH]",
-                "expression": "[EXPR_ANGER_FROWN]",
-                "emotion": "[EMOTION_ANGER]", # Or DISGUST, SADNESS
-                "intensity": "[INTENSITY_HIGH]"
-            },
-             "stimulus_fear": { # Explicit fear stimulus
-                "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_THREAT]",
-                "physiological": "[PHYSIO_AROUSAL_VERY_HIGH]",
-                "expression": "[EXPR_EYES_WIDEN_MOUTH_OPEN]",
-                "emotion": "[EMOTION_FEAR]",
-                "intensity": "[INTENSITY_VERY_HIGH]"
-            },
-            "stimulus_sadness": { # Explicit sadness stimulus
-                "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_LOSS]",
-                "physiological": "[PHYSIO_AROUSAL_LOW]",
-                "expression": "[EXPR_SAD_FACE]",
-                "emotion": "[EMOTION_SADNESS]",
-                "intensity": "[INTENSITY_MEDIUM]"
-            },
-             "stimulus_joy": { # Explicit joy stimulus
-                "valence": "[APPRAISAL_VALENCE_POSITIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_GOAL_ACHIEVED]",
-                "physiological": "[PHYSIO_AROUSAL_MEDIUM]",
-                "expression": "[EXPR_WIDE_SMILE_LAUGH]",
-                "emotion": "[EMOTION_JOY]",
-                "intensity": "[INTENSITY_HIGH]"
-            },
-             "stimulus_anger": { # Explicit anger stimulus - provocation
-                "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_OFFENSIVE_AGENT]",
-                "physiological": "[PHYSIO_AROUSAL_HIGH]",
-                "expression": "[EXPR_FROWN_CLENCHED_JAW]",
-                "emotion": "[EMOTION_ANGER]",
-                "intensity": "[INTENSITY_HIGH]"
-            },
-            "stimulus_disgust": { # Explicit disgust stimulus - something offensive
-                "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_OFFENSIVE_OBJECT]",
-                "physiological": "[PHYSIO_AROUSAL_MEDIUM]", # or low, depending on disgust type
-                "expression": "[EXPR_NOSE_WRINKLE_LIP_CURL]",
-                "emotion": "[EMOTION_DISGUST]",
-                "intensity": "[INTENSITY_MEDIUM]"
-            },
-             "stimulus_surprise": { # Explicit surprise stimulus - unexpected event
-                "valence": "[APPRAISAL_VALENCE_NEUTRAL]", # Surprise itself is valence neutral
-                "relevance": "[APPRAISAL_RELEVANCE_UNEXPECTED_EVENT]",
-                "physiological": "[PHYSIO_AROUSAL_MEDIUM_HIGH]", # Surprise can be arousing
-                "expression": "[EXPR_EYEBROWS_RAISED_MOUTH_OPEN_SIGHTLY]",
-                "emotion": "[EMOTION_SURPRISE]",
-                "intensity": "[INTENSITY_MEDIUM]"
-            },
-             "stimulus_trust": { # Explicit trust/bond stimulus - positive social connection
-                "valence": "[APPRAISAL_VALENCE_POSITIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_SOCIAL_BOND]",
-                "physiological": "[PHYSIO_AROUSAL_LOW]",
-                "expression": "[EXPR_WARM_SMILE_EYE_CONTACT]",
-                "emotion": "[EMOTION_TRUST]",
-                "intensity": "[INTENSITY_MEDIUM]"
-            },
-            "stimulus_anticipation": { # Explicit anticipation stimulus - upcoming event
-                "valence": "[APPRAISAL_VALENCE_NEUTRAL]", # Anticipation can be positive or negative leaning
-                "relevance": "[APPRAISAL_RELEVANCE_FUTURE_EVENT]",
-                "physiological": "[PHYSIO_AROUSAL_MEDIUM]", # Arousal depends on what is anticipated
-                "expression": "[EXPR_ATTENTIVE_LOOK]",
-                "emotion": "[EMOTION_ANTICIPATION]",
-                "intensity": "[INTENSITY_MEDIUM]"
-            },
-            "stimulus_sad_news": {
-                "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_LOSS]",
-                "physiological": "[PHYSIO_AROUSAL_LOW]",
-                "expression": "[EXPR_SAD_FACE_TEARS]",
-                "emotion": "[EMOTION_SADNESS]",
-                "intensity": "[INTENSITY_HIGH]"
-            },
-            "stimulus_good_news": {
-                "valence": "[APPRAISAL_VALENCE_POSITIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_GOAL_ACHIEVED]",
-                "physiological": "[PHYSIO_AROUSAL_MEDIUM]",
-                "expression": "[EXPR_BRIGHT_SMILE_EXCITED]",
-                "emotion": "[EMOTION_JOY]",
-                "intensity": "[INTENSITY_HIGH]"
-            },
-            "stimulus_threat_imminent": {
-                "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_IMMINENT_DANGER]",
-                "physiological": "[PHYSIO_AROUSAL_VERY_HIGH]",
-                "expression": "[EXPR_PANICKED_LOOK]",
-                "emotion": "[EMOTION_FEAR]",
-                "intensity": "[INTENSITY_VERY_HIGH]"
-            },
-            "stimulus_insult": {
-                "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_SOCIAL_OFFENSE]",
-                "physiological": "[PHYSIO_AROUSAL_MEDIUM_HIGH]",
-                "expression": "[EXPR_FROWN_GLARE]",
-                "emotion": "[EMOTION_ANGER]",
-                "intensity": "[INTENSITY_MEDIUM_HIGH]"
-            },
-             "stimulus_social_praise": {
-                "valence": "[APPRAISAL_VALENCE_POSITIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_SOCIAL_APPROVAL]",
-                "physiological": "[PHYSIO_AROUSAL_LOW]",
-                "expression": "[EXPR_SMILE_NOD_APPROVINGLY]",
-                "emotion": "[EMOTION_JOY]", # or TRUST, PRIDE
-                "intensity": "[INTENSITY_MEDIUM]"
-            },
-            "stimulus_social_rejection": {
-                "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_SOCIAL_DISAPPROVAL]",
-                "physiological": "[PHYSIO_AROUSAL_MEDIUM]",
-                "expression": "[EXPR_SAD_FACE_AVOID_EYE_CONTACT]",
-                "emotion": "[EMOTION_SADNESS]", # or ANGER, FEAR depending on context
-                "intensity": "[INTENSITY_MEDIUM]"
-            },
-             "stimulus_unfairness": {
-                "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_MORAL_VIOLATION]", # Unfairness is a moral violation
-                "physiological": "[PHYSIO_AROUSAL_MEDIUM_HIGH]",
-                "expression": "[EXPR_FROWN_DISAPPROVAL]",
-                "emotion": "[EMOTION_ANGER]", # or DISGUST
-                "intensity": "[INTENSITY_MEDIUM_HIGH]"
-            },
-             "stimulus_betrayal": {
-                "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_SOCIAL_BETRAYAL]",
-                "physiological": "[PHYSIO_AROUSAL_HIGH]",
-                "expression": "[EXPR_SAD_ANGER_MIXED]", # Complex expression
-                "emotion": "[EMOTION_ANGER]", # or SADNESS, TRUST broken
-                "intensity": "[INTENSITY_HIGH]"
-            },
-             "stimulus_disappointment": {
-                "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_UNMET_EXPECTATION]",
-                "physiological": "[PHYSIO_AROUSAL_LOW]",
-                "expression": "[EXPR_SAD_FACE_SLIGHT]",
-                "emotion": "[EMOTION_SADNESS]", # or ANGER if expectation violated by agent
-                "intensity": "[INTENSITY_LOW]"
-            },
-             "stimulus_challenge": {
-                "valence": "[APPRAISAL_VALENCE_NEUTRAL]", # Challenge can be positive or negative depending on framing
-                "relevance": "[APPRAISAL_RELEVANCE_TASK_DIFFICULTY]",
-                "physiological": "[PHYSIO_AROUSAL_MEDIUM]", # Arousal for focus/effort
-                "expression": "[EXPR_CONCENTRATION]",
-                "emotion": "[EMOTION_ANTICIPATION]", # or SURPRISE, depending on nature of challenge
-                "intensity": "[INTENSITY_MEDIUM]"
-            },
-             "stimulus_confusion": {
-                "valence": "[APPRAISAL_VALENCE_NEGATIVE]", # Confusion is often negatively valenced
-                "relevance": "[APPRAISAL_RELEVANCE_UNCERTAINTY]",
-                "physiological": "[PHYSIO_AROUSAL_LOW_MEDIUM]", # Mild arousal, cognitive effort
-                "expression": "[EXPR_CONFUSED_LOOK]",
-                "emotion": "[EMOTION_FEAR]", # or SURPRISE, depending on context of confusion
-                "intensity": "[INTENSITY_LOW]"
-            },
-             "stimulus_boredom": {
-                "valence": "[APPRAISAL_VALENCE_NEGATIVE]", # Boredom is negative valence
-                "relevance": "[APPRAISAL_RELEVANCE_LACK_OF_STIMULATION]",
-                "physiological": "[PHYSIO_AROUSAL_VERY_LOW]", # Low arousal
-                "expression": "[EXPR_LISTLESS_LOOK_YAWN]",
-                "emotion": "[EMOTION_DISGUST]", # or SADNESS, ANGER (at situation)
-                "intensity": "[INTENSITY_LOW]"
-            },
-            "stimulus_overload": {
-                "valence": "[APPRAISAL_VALENCE_NEGATIVE]", # Overload is negative
-                "relevance": "[APPRAISAL_RELEVANCE_PROCESSING_LIMIT_EXCEEDED]",
-                "physiological": "[PHYSIO_AROUSAL_HIGH]", # High arousal, stress response
-                "expression": "[EXPR_STRESSED_LOOK]",
-                "emotion": "[EMOTION_FEAR]", # or ANGER, SADNESS
-                "intensity": "[INTENSITY_HIGH]"
-            },
-             "stimulus_frustration": {
-                "valence": "[APPRAISAL_VALENCE_NEGATIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_GOAL_BLOCKAGE]", # Goal is blocked
-                "physiological": "[PHYSIO_AROUSAL_MEDIUM_HIGH]", # Arousal from blocked goal
-                "expression": "[EXPR_FROWN_CLENCHED_FIST]",
-                "emotion": "[EMOTION_ANGER]", # or SADNESS, depending on type of blockage
-                "intensity": "[INTENSITY_MEDIUM_HIGH]"
-            },
-             "stimulus_social_connection": {
-                "valence": "[APPRAISAL_VALENCE_POSITIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_SOCIAL_BONDING]",
-                "physiological": "[PHYSIO_AROUSAL_LOW]",
-                "expression": "[EXPR_WARM_SMILE_RELAXED]",
-                "emotion": "[EMOTION_TRUST]", # or JOY, LOVE
-                "intensity": "[INTENSITY_MEDIUM]"
-            },
-             "stimulus_achievement": {
-                "valence": "[APPRAISAL_VALENCE_POSITIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_GOAL_ACHIEVED]",
-                "physiological": "[PHYSIO_AROUSAL_MEDIUM]",
-                "expression": "[EXPR_PROUD_SMILE]",
-                "emotion": "[EMOTION_JOY]", # or PRIDE, TRUST in self
-                "intensity": "[INTENSITY_MEDIUM]"
-            },
-             "stimulus_curiosity": {
-                "valence": "[APPRAISAL_VALENCE_NEUTRAL]", # Curiosity itself neutral, can be positive or negative context
-                "relevance": "[APPRAISAL_RELEVANCE_NEW_INFORMATION]",
-                "physiological": "[PHYSIO_AROUSAL_MEDIUM]", # Arousal for attention, exploration
-                "expression": "[EXPR_INTERESTED_LOOK]",
-                "emotion": "[EMOTION_ANTICIPATION]", # or SURPRISE, depending on what is discovered
-                "intensity": "[INTENSITY_MEDIUM]"
-            },
-             "stimulus_humor": {
-                "valence": "[APPRAISAL_VALENCE_POSITIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_FUNNY]",
-                "physiological": "[PHYSIO_AROUSAL_MEDIUM]", # Arousal from laughter, amusement
-                "expression": "[EXPR_SMILE_LAUGH]",
-                "emotion": "[EMOTION_JOY]", # or SURPRISE, if humor is unexpected
-                "intensity": "[INTENSITY_MEDIUM]"
-            },
-             "stimulus_challenge_met": {
-                "valence": "[APPRAISAL_VALENCE_POSITIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_TASK_COMPLETED]", # Overcoming challenge
-                "physiological": "[PHYSIO_AROUSAL_LOW_MEDIUM]", # Arousal subsides after challenge met
-                "expression": "[EXPR_SATISFIED_SMILE]",
-                "emotion": "[EMOTION_JOY]", # or PRIDE, RELIEF
-                "intensity": "[INTENSITY_MEDIUM]"
-            },
-             "stimulus_social_cue": { # Generic social cue, e.g., greeting, positive tone
-                "valence": "[APPRAISAL_VALENCE_POSITIVE]", # Social cues often positive unless negative tone
-                "relevance": "[APPRAISAL_RELEVANCE_SOCIAL_INTERACTION]",
-                "physiological": "[PHYSIO_AROUSAL_LOW]", # Social interaction baseline arousal
-                "expression": "[EXPR_NEUTRAL_NOD]", # Or smile if positive cue
-                "emotion": "[EMOTION_TRUST]", # Baseline social trust
-                "intensity": "[INTENSITY_LOW]"
-            },
-            "stimulus_reassurance": {
-                "valence": "[APPRAISAL_VALENCE_POSITIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_THREAT_REMOVED]", # Reassurance removes threat
-                "physiological": "[PHYSIO_AROUSAL_LOWERED]", # Arousal decreases
-                "expression": "[EXPR_RELIEF_SMILE]",
-                "emotion": "[EMOTION_JOY]", # or TRUST, RELIEF
-                "intensity": "[INTENSITY_MEDIUM]"
-            },
-             "stimulus_comfort": {
-                "valence": "[APPRAISAL_VALENCE_POSITIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_WELLBEING]", # Comfort related to wellbeing
-                "physiological": "[PHYSIO_AROUSAL_VERY_LOW]", # Very low arousal, relaxation
-                "expression": "[EXPR_RELAXED_SMILE]",
-                "emotion": "[EMOTION_JOY]", # or TRUST, CONTENTMENT
-                "intensity": "[INTENSITY_LOW]"
-            },
-             "stimulus_gratitude": {
-                "valence": "[APPRAISAL_VALENCE_POSITIVE]",
-                "relevance": "[APPRAISAL_RELEVANCE_BENEFIT_RECEIVED]", # Gratitude for benefit
-                "physiological": "[PHYSIO_AROUSAL_LOW]", # Low arousal, warm feeling
-                "expression": "[EXPR_GRATEFUL_SMILE]",
-                "emotion": "[EMOTION_TRUST]", # or JOY, LOVE, depending on depth of gratitude
-                "intensity": "[INTENSITY_MEDIUM]"
-            },
-        }
+        # Decay mode: "tick" decays once per update_emotion_intensity() call, "lazy" decays by elapsed
+        # time (one tick per decay_tick_seconds), settled whenever intensities are read or updated
+        if decay_mode not in ("tick", "lazy"):
+            raise ValueError(f"Unknown decay mode: {decay_mode!r}")
+        self.decay_mode = decay_mode
+        self.decay_tick_seconds = decay_tick_seconds
+        self.clock = clock or SYSTEM_CLOCK # Lazy decay reads clock.monotonic(); a VirtualClock fast-forwards it
+        self.last_decay_time = self.clock.monotonic()
+        # Appraisal mode: "single" applies the one pathway the cascade selects, "multi" blends every matched
+        # pathway by weight (see appraise_multi)
+        if appraisal_mode not in ("single", "multi"):
+            raise ValueError(f"Unknown appraisal mode: {appraisal_mode!r}")
+        self.appraisal_mode = appraisal_mode
+        self.last_pathway = None # Pathway selected by the latest generate_emotion_path call (the strongest in multi mode)
+        self.last_pathway_weights = None # {pathway: weight} of the latest multi-label appraisal
+        self.timeline = None # Optional emotion_timeline.SessionTimeline recording appraisals and decay
+
+    @property
+    def emotion_pathways(self):
+        """Pathway definitions of the rules in effect (shared, read-only)."""
+        return _appraisal_index.emotion_pathways
+
+    @property
+    def pathway_names(self):
+        """Order used by generate_emotion_paths ids, for the rules in effect."""
+        return _appraisal_index.pathway_names
 
 
     def generate_emotion_path(self, stimulus_text):
         """
         Generates an emotion path based on keywords in the stimulus text and updates emotion intensities.
         """
-        stimulus_text_lower = stimulus_text.lower()
-        emotion_path = []
-
-        # Appraisal - Simplified keyword-based appraisal for demonstration
-        if any(keyword in stimulus_text_lower for keyword in ["excellent", "good job", "doing well", "validated", "praise", "thank you", "joyful", "won an award", "surprise party", "good news", "social praise", "challenge met", "social connection", "achievement", "humor", "comfort", "gratitude", "reassurance"]):
-            pathway = "positive_stimulus" # Default positive, more specific paths below
-            if any(keyword in stimulus_text_lower for keyword in ["excellent", "good job", "doing well", "validated", "praise",  "social praise", "thank you", "gratitude"]):
-                pathway = "stimulus_social_praise"
-            elif "joyful" in stimulus_text_lower or "won award" in stimulus_text_lower or "good news" in stimulus_text_lower:
-                pathway = "stimulus_good_news"
-            elif "surprise party" in stimulus_text_lower or "surprise" in stimulus_text_lower:
-                pathway = "stimulus_surprise"
-            elif "challenge met" in stimulus_text_lower:
-                pathway = "stimulus_challenge_met"
-            elif "social connection" in stimulus_text_lower:
-                pathway = "stimulus_social_connection"
-            elif "achievement" in stimulus_text_lower:
-                pathway = "stimulus_achievement"
-            elif "humor" in stimulus_text_lower:
-                pathway = "stimulus_humor"
-            elif "comfort" in stimulus_text_lower:
-                pathway = "stimulus_comfort"
-            elif "reassurance" in stimulus_text_lower:
-                pathway = "stimulus_reassurance"
-
-
-        elif any(keyword in stimulus_text_lower for keyword in ["scary", "threat", "danger", "fear", "scared", "afraid", "threat imminent", "overload", "confusion"]):
-             pathway = "negative_stimulus_threat" # Default threat, more specific paths below
-             if "scary threat" in stimulus_text_lower or "threat imminent" in stimulus_text_lower or "danger" in stimulus_text_lower or "threat" in stimulus_text_lower or "fear" in stimulus_text_lower or "afraid" in stimulus_text_lower:
-                 pathway = "stimulus_threat_imminent"
-             elif "confusion" in stimulus_text_lower:
-                 pathway = "stimulus_confusion"
-             elif "overload" in stimulus_text_lower:
-                 pathway = "stimulus_overload"
-
-
-        elif any(keyword in stimulus_text_lower for keyword in ["sad", "loss", "disappointed", "sad news", "betrayal", "social rejection", "boredom", "disappointment"]):
-            pathway = "stimulus_sadness" # Default sadness, more specific paths below
-            if "sad news" in stimulus_text_lower or "loss" in stimulus_text_lower or "sad" in stimulus_text_lower:
-                pathway = "stimulus_sad_news"
-            elif "betrayal" in stimulus_text_lower:
-                pathway = "stimulus_betrayal"
-            elif "social rejection" in stimulus_text_lower:
-                pathway = "stimulus_social_rejection"
-            elif "boredom" in stimulus_text_lower:
-                pathway = "stimulus_boredom"
-            elif "disappointment" in stimulus_text_lower or "disappointed" in stimulus_text_lower:
-                pathway = "stimulus_disappointment"
-
-
-        elif any(keyword in stimulus_text_lower for keyword in ["angry", "insult", "unfair", "frustrated", "anger", "disgust", "disgusting", "moral violation", "stimulus_anger", "stimulus_disgust", "unfairness", "frustration"]):
-            pathway = "moral_violation" # Default anger/disgust, more specific paths below
-            if "angry" in stimulus_text_lower or "insult" in stimulus_text_lower or "anger" in stimulus_text_lower or "stimulus_anger" in stimulus_text_lower:
-                pathway = "stimulus_insult" # Or stimulus_anger
-            elif "unfair" in stimulus_text_lower or "unfairness" in stimulus_text_lower or "moral violation" in stimulus_text_lower:
-                 pathway = "stimulus_unfairness" # Or moral_violation
-            elif "disgust" in stimulus_text_lower or "disgusting" in stimulus_text_lower or "stimulus_disgust" in stimulus_text_lower:
-                pathway = "stimulus_disgust"
-            elif "frustrated" in stimulus_text_lower or "frustration" in stimulus_text_lower:
-                pathway = "stimulus_frustration"
-
-
-        elif any(keyword in stimulus_text_lower for keyword in ["interesting", "question", "intellectual", "curious", "challenge"]):
-            pathway = "intellectual_stimulus" # Default intellectual, more specific paths below
-            if "interesting question" in stimulus_text_lower or "question" in stimulus_text_lower or "intellectual" in stimulus_text_lower:
-                pathway = "intellectual_stimulus"
-            elif "curious" in stimulus_text_lower or "curiosity" in stimulus_text_lower:
-                pathway = "stimulus_curiosity"
-            elif "challenge" in stimulus_text_lower:
-                pathway = "stimulus_challenge"
-
-
-        elif any(keyword in stimulus_text_lower for keyword in ["mozart", "music", "aesthetic", "beautiful", "art", "song"]):
-            pathway = "aesthetic_positive"
-            if "mozart" in stimulus_text_lower or "music" in stimulus_text_lower or "song" in stimulus_text_lower:
-                pathway = "aesthetic_positive" # More specific music path if needed
-
-
-        elif any(keyword in stimulus_text_lower for keyword in ["constitution", "law", "government", "justice", "liberty", "tranquility", "welfare"]):
-            pathway = "social_positive_feedback" # Could be refined, using social_positive for now as placeholder
-
-
-        elif any(keyword in stimulus_text_lower for keyword in ["bible", "king james version", "genesis", "exodus", "psalms", "gospels", "revelation", "christian"]): # Broader religious/spiritual stimuli
-            pathway = "intellectual_stimulus" # Or could create a "spiritual_stimulus" path
-
-
-        elif any(keyword in stimulus_text_lower for keyword in ["tell-tale heart", "edgar allan poe", "horror", "dark", "disturbing", "unsettling", "madness", "murder", "fearful", "vulture eye"]):
-            pathway = "stimulus_fear" # Or could create a "fiction_horror_stimulus" path
-
-
-        elif any(keyword in stimulus_text_lower for keyword in ["hello", "hi", "greetings", "how are you", "cadence", "gemini"]):
-            pathway = "stimulus_social_cue" # Social greeting/cue
-
-
+        if self.appraisal_mode == "multi":
+            self.last_pathway_weights, emotion_path, intensity_deltas = self.appraise_multi(stimulus_text)
+            self.last_pathway = next(iter(self.last_pathway_weights))
         else:
-            pathway = "neutral_stimulus" # Default neutral pathway
-
-
-        if pathway in self.emotion_pathways:
-            selected_path = self.emotion_pathways[pathway]
-            emotion_path.extend([
-                selected_path["valence"],
-                selected_path["relevance"],
-                selected_path["physiological"],
-                selected_path["expression"],
-                selected_path["emotion"],
-                selected_path["intensity"]
-            ])
-            # Dynamic Intensity Adjustment - Apply intensity and decay only if emotion is triggered
-            triggered_emotion = selected_path["emotion"].strip("[]EMOTION_") # Extract emotion name
-            intensity_level_str = selected_path["intensity"].strip("[]INTENSITY_") # Extract intensity level
-
-            if triggered_emotion and triggered_emotion.lower() != 'none':
-                intensity_value = 0.0
-                if intensity_level_str.lower() == "very_low":
-                    intensity_value = 0.1
-                elif intensity_level_str.lower() == "low":
-                    intensity_value = 0.2
-                elif intensity_level_str.lower() == "medium":
-                    intensity_value = 0.35 * self.appraisal_intensity_multiplier # Adjusted base, multiplier applied
-                elif intensity_level_str.lower() == "high":
-                    intensity_value = 0.6 * self.appraisal_intensity_multiplier # Adjusted base, multiplier applied
-                elif intensity_level_str.lower() == "very_high":
-                    intensity_value = 0.85 * self.appraisal_intensity_multiplier # Adjusted base, multiplier applied
-
-
-                if triggered_emotion.upper() in self.emotion_intensity_levels:
-                    self.emotion_intensity_levels[triggered_emotion.upper()] += intensity_value # Apply intensity
+            self.last_pathway, emotion_path, triggered_emotion, intensity_value = self.appraise(stimulus_text)
+            intensity_deltas = {triggered_emotion: intensity_value}
+        if self.decay_mode == "lazy":
+            self._settle_decay()
+
+        # Dynamic Intensity Adjustment - Apply intensity only if emotion is triggered
+        for triggered_emotion, intensity_value in intensity_deltas.items():
+            if triggered_emotion in self.emotion_intensity_levels:
+                self.emotion_intensity_levels[triggered_emotion] += intensity_value # Apply intensity
+            if self.timeline is not None:
+                self.timeline.record_appraisal(self.last_pathway, triggered_emotion, intensity_value)
 
         return emotion_path
 
 
+    def appraise(self, stimulus_text):
+        """
+        Selects the pathway for a stimulus without touching intensity levels.
+        Returns (pathway, emotion_path, triggered emotion or None, intensity increase).
+        """
+        # Appraisal - Simplified keyword-based appraisal, every keyword found in one pass
+        appraisal_index = _appraisal_index # Read once: a concurrent rule reload can't split this appraisal
+        pathway = select_pathway(stimulus_text.lower(), appraisal_index)
+
+        record = appraisal_index.pathways_by_name.get(pathway)
+        if record is None:
+            return pathway, [], None, 0.0
+        return pathway, list(record.tags), record.emotion, record.intensity_delta(self.appraisal_intensity_multiplier)
+
+
+    def appraise_multi(self, stimulus_text):
+        """
+        Multi-label appraisal in one keyword pass, without touching intensity levels.
+        Returns (pathway weights, emotion_path of the strongest pathway, {emotion: blended intensity increase}),
+        where each matched pathway contributes its intensity increase times its weight; emotions with no
+        increase are left out.
+        """
+        appraisal_index = _appraisal_index # Read once: a concurrent rule reload can't split this appraisal
+        weights, emotion_path, blend_terms = appraisal_index.multi_label(stimulus_text.lower())
+        intensity_deltas = {}
+        for emotion, weight, record in blend_terms:
+            intensity_deltas[emotion] = intensity_deltas.get(emotion, 0.0) + weight * record.intensity_delta(self.appraisal_intensity_multiplier)
+        return dict(weights), list(emotion_path), intensity_deltas
+
+
+    def generate_emotion_paths(self, stimulus_texts):
+        """
+        Batch appraisal of many stimuli without touching instance state.
+        Returns (pathway_ids, intensity_deltas): an int32 array indexing self.pathway_names
+        (-1 if the selected pathway is unknown) and an (N x len(emotion_categories)) float32
+        array of the intensity increase each stimulus would apply, one column per emotion category.
+        In multi appraisal mode the ids are the strongest pathways and the rows blend every matched pathway.
+        """
+        import numpy as np
+
+        appraisal_index = _appraisal_index # One rule set for the whole batch
+        if self.appraisal_mode == "multi":
+            stimulus_texts = list(stimulus_texts)
+            pathway_ids = np.empty(len(stimulus_texts), dtype=np.int32)
+            intensity_deltas = np.zeros((len(stimulus_texts), len(self.emotion_categories))) # Summed in float64, like appraise_multi
+            for row, stimulus_text in enumerate(stimulus_texts):
+                weights, emotion_path, blend_terms = appraisal_index.multi_label(stimulus_text.lower())
+                pathway_ids[row] = appraisal_index.pathway_ids.get(next(iter(weights)), -1)
+                for emotion, weight, record in blend_terms:
+                    if emotion in self.emotion_categories:
+                        intensity_deltas[row, self.emotion_categories.index(emotion)] += weight * record.intensity_delta(self.appraisal_intensity_multiplier)
+            return pathway_ids, intensity_deltas.astype(np.float32)
+
+        # One extra all-zero row at the end, so unknown pathways (id -1) contribute nothing
+        delta_table = np.zeros((len(appraisal_index.pathway_table) + 1, len(self.emotion_categories)), dtype=np.float32)
+        for record in appraisal_index.pathway_table:
+            if record.emotion in self.emotion_categories:
+                delta_table[record.index, self.emotion_categories.index(record.emotion)] = record.intensity_delta(self.appraisal_intensity_multiplier)
+
+        pathway_ids = np.fromiter(
+            (appraisal_index.pathway_ids.get(select_pathway(text.lower(), appraisal_index), -1) for text in stimulus_texts),
+            dtype=np.int32
+        )
+        return pathway_ids, delta_table[pathway_ids]
+
+
     def update_emotion_intensity(self):
         """
         Decays emotion intensity levels over time.
+        In lazy mode this only settles the decay owed for the time elapsed since the last update.
+        """
+        if self.decay_mode == "lazy":
+            self._settle_decay()
+        else:
+            self.advance(1)
+
+
+    def advance(self, ticks=1):
+        """
+        Applies n decay ticks at once, in closed form: intensity - n * rate, floored at zero.
         """
+        if ticks <= 0:
+            return
         for emotion in self.emotion_categories:
             if self.emotion_intensity_levels[emotion] > 0:
-                self.emotion_intensity_levels[emotion] -= self.intensity_decay_rates[emotion]
+                self.emotion_intensity_levels[emotion] -= self.intensity_decay_rates[emotion] * ticks
                 if self.emotion_intensity_levels[emotion] < 0:
                     self.emotion_intensity_levels[emotion] = 0.0 # Ensure intensity doesn't go negative
+        if self.timeline is not None:
+            self.timeline.record_decay(ticks)
+
+
+    def _settle_decay(self):
+        """Applies the (possibly fractional) ticks elapsed since the last settlement."""
+        now = self.clock.monotonic()
+        self.advance((now - self.last_decay_time) / self.decay_tick_seconds)
+        self.last_decay_time = now
 
 
     def get_emotion_intensity(self):
         """
         Returns current emotion intensity levels.
         """
-        return self.emotion_intensity_levels
\ No newline at end of file
+        if self.decay_mode == "lazy":
+            self._settle_decay()
+        return self.emotion_intensity_levels
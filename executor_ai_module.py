@@ -1,41 +1,113 @@
 # executor_ai_module.py
-from emotional_ai_module import EmotionAI_PathBased_DynamicIntensity_V3 # Import EmotionAI
+from functools import lru_cache
+
+import numpy as np
+
+from emotional_ai_module import EmotionAI_PathBased_DynamicIntensity_V3, EMOTION_CATEGORIES # Import EmotionAI
 from mind_ai_module import MindAI_Learning # Import MindAI (though not directly used in function, module is needed for type hinting/structure if desired)
 
+EMOTION_TAGS = tuple(f"[EMOTION_{emotion}]" for emotion in EMOTION_CATEGORIES)
+
 
-def executor_ai_decision_dynamic_intensity(mind_ai_options, emotion_path, emotion_intensity_levels, mind_ai_learner):
+class ExecutorScoringModel:
     """
-    Executor AI decision making using dynamic intensity and Mind AI learning.
+    Option scoring as data, for any number of options:
+
+        scores = base_priority + path_weights @ flags + override_weights @ (flags & (intensities > override_thresholds))
+
+    flags marks which emotions are on the emotion path; path_weights and override_weights are
+    (options x emotions) matrices, override_thresholds has one intensity threshold per emotion.
     """
-    chosen_option = None
-    priority_score = {"Option A": 0, "Option B": 0, "Option C": 0}
-    mind_ai_priority = {"Option A": 5, "Option B": 7, "Option C": 3}
+    def __init__(self, options, path_weights=None, override_weights=None, override_thresholds=None):
+        self.options = list(options)
+        emotion_count = len(EMOTION_CATEGORIES)
+        # Both weight matrices live in one (2 * emotions x options) array so scoring is a single matmul;
+        # path_weights and override_weights are writable (options x emotions) views into it
+        self._stacked_weights = np.zeros((2 * emotion_count, len(self.options)))
+        self.path_weights = self._stacked_weights[:emotion_count].T
+        self.override_weights = self._stacked_weights[emotion_count:].T
+        if path_weights is not None:
+            self.path_weights[...] = path_weights
+        if override_weights is not None:
+            self.override_weights[...] = override_weights
+        self.override_thresholds = (np.full(emotion_count, np.inf) if override_thresholds is None
+                                    else np.array(override_thresholds, dtype=np.float64))
 
-    mind_ai_options, mind_ai_priority = mind_ai_learner.analyze_options("Current situation", emotion_path) # Pass emotion_path to MindAI
+    @classmethod
+    def default(cls, options=("Option A", "Option B", "Option C")):
+        """
+        The classic Cadence rules, applied by option position (A, B, C = first, second, third):
+        FEAR on the path lowers the third option by 3, JOY raises the second by 2, and
+        FEAR above 0.5 intensity activates the emotion override, giving the third option 2 back.
+        """
+        model = cls(options)
+        fear, joy = EMOTION_CATEGORIES.index("FEAR"), EMOTION_CATEGORIES.index("JOY")
+        if len(model.options) > 2:
+            model.path_weights[2, fear] = -3
+            model.override_weights[2, fear] = 2
+            model.override_thresholds[fear] = 0.5
+        if len(model.options) > 1:
+            model.path_weights[1, joy] = 2
+        return model
 
-    for option in ["Option A", "Option B", "Option C"]:
-        priority_score[option] += mind_ai_priority[option]
+    @staticmethod
+    def path_flags(emotion_path):
+        """1.0 for each emotion whose tag is on the emotion path."""
+        return np.array([tag in emotion_path for tag in EMOTION_TAGS], dtype=np.float64)
 
-    emotion_override_active = False
+    @staticmethod
+    def intensity_vector(emotion_intensity_levels):
+        return np.array([emotion_intensity_levels.get(emotion, 0.0) for emotion in EMOTION_CATEGORIES], dtype=np.float64)
 
-    if "[EMOTION_FEAR]" in emotion_path:
-        priority_score["Option C"] -= 3
+    def score(self, base_priority, flags, intensities):
+        """
+        Scores options for one turn (1-d inputs) or many turns at once (2-d inputs, one row per turn).
+        base_priority is (..., options), flags and intensities are (..., emotions).
+        """
+        override_flags = flags * (intensities > self.override_thresholds)
+        return base_priority + np.concatenate((flags, override_flags), axis=-1) @ self._stacked_weights
 
-        if emotion_intensity_levels["FEAR"] > 0.5:
-            emotion_override_active = True
+    def choose(self, base_priority, flags, intensities):
+        """Returns (index of the best option per turn, scores). Ties go to the earliest option."""
+        scores = self.score(base_priority, flags, intensities)
+        return np.argmax(scores, axis=-1), scores
 
 
-    if "[EMOTION_JOY]" in emotion_path: # Changed to JOY to match Plutchik
-        priority_score["Option B"] += 2
+DEFAULT_MODEL_CACHE_SIZE = 32 # Distinct option lists whose default scoring model is kept
 
 
-    if emotion_override_active:
-        if "[EMOTION_FEAR]" in emotion_path:
-            priority_score["Option C"] += 2
+@lru_cache(maxsize=DEFAULT_MODEL_CACHE_SIZE)
+def _default_model(options):
+    return ExecutorScoringModel.default(options)
+
+
+def executor_ai_decision_dynamic_intensity(mind_ai_options, emotion_path, emotion_intensity_levels, mind_ai_learner, scoring_model=None, instrumentation=None):
+    """
+    Executor AI decision making using dynamic intensity and Mind AI learning, over the caller's mind_ai_options.
+    instrumentation (a cadence_metrics.PipelineMetrics) times the mind, executor and record stages.
+    """
+    mind_ai_options, mind_ai_priority = mind_ai_learner.analyze_options("Current situation", emotion_path, mind_ai_options) # Pass emotion_path to MindAI
+    if instrumentation is not None:
+        instrumentation.lap("mind")
+
+    if scoring_model is None:
+        scoring_model = _default_model(tuple(mind_ai_options))
+    elif sorted(scoring_model.options) != sorted(mind_ai_priority):
+        raise ValueError(f"scoring_model options {scoring_model.options} don't match mind_ai_options {list(mind_ai_priority)}")
 
-    chosen_option = max(priority_score, key=priority_score.get)
+    base_priority = np.array([mind_ai_priority[option] for option in scoring_model.options], dtype=np.float64)
+    chosen_index, scores = scoring_model.choose(
+        base_priority, scoring_model.path_flags(emotion_path), scoring_model.intensity_vector(emotion_intensity_levels)
+    )
+    chosen_option = scoring_model.options[chosen_index]
+    priority_score = dict(zip(scoring_model.options, scores.tolist()))
+    if instrumentation is not None:
+        instrumentation.lap("executor")
 
-    outcome_example = "positive" if chosen_option == "Option B" else "neutral"
+    # Positive when the emotions left the Mind AI's top choice standing (the second option, "Option B", by default)
+    outcome_example = "positive" if chosen_index == np.argmax(base_priority) else "neutral"
     mind_ai_learner.record_decision_outcome(emotion_path, chosen_option, outcome_example)
+    if instrumentation is not None:
+        instrumentation.lap("record")
 
-    return chosen_option, priority_score
\ No newline at end of file
+    return chosen_option, priority_score
@@ -2,65 +2,112 @@
 from emotional_ai_module import EmotionAI_PathBased_DynamicIntensity_V3
 from mind_ai_module import MindAI_Learning
 from executor_ai_module import executor_ai_decision_dynamic_intensity
-import time
+from cadence_clock import SYSTEM_CLOCK, VirtualClock
+from cadence_events import ConsoleSink
 
-def main():
+# Example options relevant to user interaction - can be more complex in real application
+MIND_AI_OPTIONS = ["Provide a helpful response", "Ask clarifying questions", "Offer a concise answer"]
+
+# Simulated AI responses per chosen option (replace with actual response generation logic in real system)
+AI_RESPONSES = {
+    "Provide a helpful response": "I will do my best to provide a helpful and detailed response.",
+    "Ask clarifying questions": "To best assist you, could you please provide more details about your request?",
+    "Offer a concise answer": "Understood. I will provide a concise answer to your question.",
+}
+DEFAULT_AI_RESPONSE = "I am processing your request..." # Default fallback
+
+
+def run_turn(emotion_ai, mind_ai_learner, user_input, instrumentation=None, session_id=None, events=None):
+    """
+    Runs one turn of the Cadence pipeline (appraisal, Mind AI, executor, response, decay) without any I/O.
+    Returns the turn's emotion path, intensities (as of appraisal), decision scores, chosen option and response.
+    instrumentation is an optional cadence_metrics.PipelineMetrics recording the turn under session_id;
+    events is an optional cadence_events.EventSink receiving the result.
+    """
+    if instrumentation is not None:
+        instrumentation.start()
+
+    # 1. Emotion AI processes input and generates emotion path
+    emotion_path = emotion_ai.generate_emotion_path(user_input)
+    emotion_intensity_levels = emotion_ai.get_emotion_intensity() # Get current intensities
+    emotion_intensities = dict(emotion_intensity_levels) # Snapshot, decay below updates the live dict
+    if instrumentation is not None:
+        instrumentation.lap("appraisal")
+
+    # 2./3. Mind AI analyzes options and the Executor AI makes a decision based on emotions and Mind AI
+    chosen_option, decision_scores = executor_ai_decision_dynamic_intensity(
+        MIND_AI_OPTIONS, emotion_path, emotion_intensity_levels, mind_ai_learner, instrumentation=instrumentation
+    )
+
+    # 4. Simulate AI response
+    ai_response = AI_RESPONSES.get(chosen_option, DEFAULT_AI_RESPONSE)
+
+    # 5. Emotion intensity decay over time (simulating emotional dynamics)
+    emotion_ai.update_emotion_intensity()
+    if instrumentation is not None:
+        instrumentation.lap("decay")
+        instrumentation.record_turn(emotion_ai, mind_ai_learner, session_id)
+
+    turn = {
+        "emotion_path": emotion_path,
+        "emotion_intensities": emotion_intensities,
+        "decision_scores": decision_scores,
+        "chosen_option": chosen_option,
+        "ai_response": ai_response,
+    }
+    if events is not None:
+        events.record_turn(dict(turn), session_id) # Shallow copy: callers may add keys to the result
+    return turn
+
+
+def simulate(user_inputs, turn_interval=60.0, clock=None, emotion_ai=None, mind_ai_learner=None):
+    """
+    Runs a scripted conversation on simulated time and yields (timestamp, run_turn result) per input.
+    The clock (a fresh VirtualClock by default) advances turn_interval seconds before each turn, and the
+    default Emotion AI decays lazily on that clock, so a week of conversation takes as long as its turns
+    compute and repeated runs give identical results.
+    """
+    if clock is None:
+        clock = VirtualClock()
+    if emotion_ai is None:
+        emotion_ai = EmotionAI_PathBased_DynamicIntensity_V3(decay_mode="lazy", clock=clock)
+    if mind_ai_learner is None:
+        mind_ai_learner = MindAI_Learning(clock=clock)
+    for user_input in user_inputs:
+        clock.sleep(turn_interval)
+        yield clock.time(), run_turn(emotion_ai, mind_ai_learner, user_input)
+
+
+def main(clock=None, events=None):
     """
     Main function to run the integrated AI system with Emotion AI, Mind AI, and Executor AI.
     """
+    if clock is None:
+        clock = SYSTEM_CLOCK # Paces the loop; a VirtualClock skips the pauses
+    if events is None:
+        events = ConsoleSink(clock=clock) # Per-turn output, formatted and written off the turn path
+
     # Initialize Emotion AI, Mind AI
-    emotion_ai = EmotionAI_PathBased_DynamicIntensity_V3()
-    mind_ai_learner = MindAI_Learning()
+    emotion_ai = EmotionAI_PathBased_DynamicIntensity_V3(clock=clock)
+    mind_ai_learner = MindAI_Learning(clock=clock)
 
     # Example interaction loop
     print("Starting AI System Interaction...")
     user_input_history = []
 
     while True:
+        events.flush() # Previous turn's output before the next prompt
         user_input = input("User: ")
         user_input_history.append(user_input) # Keep history
 
-        # 1. Emotion AI processes input and generates emotion path
-        emotion_path = emotion_ai.generate_emotion_path(user_input)
-        emotion_intensity_levels = emotion_ai.get_emotion_intensity() # Get current intensities
-
-        print("Emotion Path:", emotion_path) # Output emotion path for this turn
-        print("Current Emotion Intensities:", emotion_intensity_levels) # Output current emotion intensities
-
-
-        # 2. Mind AI analyzes options (example options) - can be more complex in real application
-        mind_ai_options = ["Provide a helpful response", "Ask clarifying questions", "Offer a concise answer"] # Example options relevant to user interaction
-
-        # 3. Executor AI makes decision based on emotions and Mind AI
-        chosen_option, decision_scores = executor_ai_decision_dynamic_intensity(
-            mind_ai_options, emotion_path, emotion_intensity_levels, mind_ai_learner
-        )
-
-        print("Decision Scores:", decision_scores) # Output decision scores
-        print("Chosen Option:", chosen_option) # Output chosen option
-
-        # 4. Simulate AI response (replace with actual response generation logic in real system)
-        if chosen_option == "Provide a helpful response":
-            ai_response = "I will do my best to provide a helpful and detailed response."
-        elif chosen_option == "Ask clarifying questions":
-            ai_response = "To best assist you, could you please provide more details about your request?"
-        elif chosen_option == "Offer a concise answer":
-            ai_response = "Understood. I will provide a concise answer to your question."
-        else:
-            ai_response = "I am processing your request..." # Default fallback
-
-        print(f"AI Response: {ai_response}")
-
-        # 5. Emotion intensity decay over time (simulating emotional dynamics)
-        emotion_ai.update_emotion_intensity()
-
+        run_turn(emotion_ai, mind_ai_learner, user_input, events=events)
 
         if user_input.lower() == "exit":
+            events.close()
             print("Ending interaction.")
             break
-        print("\n")
-        time.sleep(0.5) # Pause for readability
+        clock.sleep(0.5) # Pause for readability
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,31 +1,104 @@
 # mind_ai_module.py
-import time
+from array import array
+
+from cadence_clock import SYSTEM_CLOCK
+
+DEFAULT_OPTIONS = ("Option A", "Option B", "Option C")
+BASE_PRIORITIES = (5, 7, 3) # By option position; options past the third start at 0
+PENALTY_CACHE_STEPS = 4096 # Penalized values cached per (start, step), 32 KB; see _penalized_priority
 
 class MindAI_Learning:
     """
     Mind AI module with basic learning capabilities.
     """
-    def __init__(self):
-        self.decision_history = []
+    def __init__(self, decision_history=None, decision_log=None, clock=None):
+        # List of dict records by default; a ColumnarDecisionHistory stores the same records compactly
+        self.decision_history = decision_history if decision_history is not None else []
+        self.decision_log = decision_log # Optional DecisionLog that persists every recorded decision
+        self.clock = clock or SYSTEM_CLOCK # Timestamps decision records
         self.learning_rate = 0.1
+        # (emotion tag, chosen option, outcome) -> count, updated with every recorded list record
+        self.outcome_counts = {}
+        # (start, step) -> [array of the values after 1, 2, ... steps, furthest count past them, its value]
+        self._penalty_cache = {}
+        if isinstance(self.decision_history, list):
+            for record in self.decision_history: # A prefilled list history
+                self.count_decision(record["emotion_path"], record["chosen_option"], record["outcome"])
 
-    def analyze_options(self, stimulus_text, emotion_path_from_executor): # Added emotion_path input for context
-        """Analyzes options with basic learning adjustment."""
-        options = ["Option A", "Option B", "Option C"]
-        base_priority = {"Option A": 5, "Option B": 7, "Option C": 3}
+    def analyze_options(self, stimulus_text, emotion_path_from_executor, options=DEFAULT_OPTIONS): # Added emotion_path input for context
+        """
+        Analyzes options with basic learning adjustment. Base priorities go by position (BASE_PRIORITIES);
+        under FEAR the third option loses learning_rate * 2 per negative outcome it had under FEAR.
+        """
+        options = list(options)
+        base_priority = {option: BASE_PRIORITIES[index] if index < len(BASE_PRIORITIES) else 0
+                         for index, option in enumerate(options)}
 
-        if "[EMOTION_FEAR]" in emotion_path_from_executor:
-            for history_item in self.decision_history:
-                if "[EMOTION_FEAR]" in history_item["emotion_path"] and history_item["chosen_option"] == "Option C" and history_item["outcome"] == "negative":
-                    base_priority["Option C"] -= self.learning_rate * 2
+        if "[EMOTION_FEAR]" in emotion_path_from_executor and len(options) > 2:
+            third_option = options[2]
+            negative_fear_count = self.count_outcomes("[EMOTION_FEAR]", third_option, "negative")
+            base_priority[third_option] = self._penalized_priority(base_priority[third_option], self.learning_rate * 2, negative_fear_count)
 
         return options, base_priority
 
+    def count_outcomes(self, emotion_tag, chosen_option, outcome):
+        """Number of recorded decisions with this emotion tag, option and outcome, without scanning the history."""
+        if isinstance(self.decision_history, list):
+            return self.outcome_counts.get((emotion_tag, chosen_option, outcome), 0)
+        return self.decision_history.count(emotion_tag, chosen_option, outcome)
+
+    def _penalized_priority(self, start, step, count):
+        """
+        Returns start with step subtracted count times, exactly as repeated subtraction would round
+        (start - step * count can differ in the last bit). The first PENALTY_CACHE_STEPS values are cached
+        by count, so those counts are lookups, also when a count goes down (e.g. a capacity-bound history).
+        Past them only the furthest count reached is kept, so a growing count pays for its new steps alone,
+        and memory stays bounded however many negative outcomes are recorded.
+        """
+        if count <= 0:
+            return start
+        entry = self._penalty_cache.get((start, step))
+        if entry is None:
+            entry = self._penalty_cache[(start, step)] = [array("d"), 0, start]
+        values = entry[0]
+        if count <= len(values):
+            return values[count - 1]
+        if len(values) < PENALTY_CACHE_STEPS:
+            value = values[-1] if values else start
+            for _ in range(min(count, PENALTY_CACHE_STEPS) - len(values)):
+                value -= step
+                values.append(value)
+            if count == len(values):
+                return value
+
+        reached, value = entry[1], entry[2]
+        if not len(values) <= reached <= count: # Start over from the last cached value
+            reached, value = len(values), values[-1]
+        for _ in range(count - reached):
+            value -= step
+        entry[1], entry[2] = count, value
+        return value
+
     def record_decision_outcome(self, emotion_path, chosen_option, outcome):
         """Records decision and outcome for learning."""
+        timestamp = self.clock.time()
+        if self.decision_log is not None:
+            self.decision_log.append(emotion_path, chosen_option, outcome, timestamp)
+        if not isinstance(self.decision_history, list):
+            self.decision_history.append(emotion_path, chosen_option, outcome, timestamp)
+            return
+
         self.decision_history.append({
             "emotion_path": emotion_path,
             "chosen_option": chosen_option,
             "outcome": outcome,
-            "timestamp": time.time()
-        })
\ No newline at end of file
+            "timestamp": timestamp
+        })
+        self.count_decision(emotion_path, chosen_option, outcome)
+
+    def count_decision(self, emotion_path, chosen_option, outcome):
+        """Adds one list-history record to outcome_counts."""
+        for emotion_tag in set(emotion_path):
+            if emotion_tag.startswith("[EMOTION_"):
+                key = (emotion_tag, chosen_option, outcome)
+                self.outcome_counts[key] = self.outcome_counts.get(key, 0) + 1
@@ -0,0 +1,254 @@
+# session_paging.py
+import json
+import sqlite3
+import struct
+import time
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+from cadence_metrics import LatencyHistogram, emotion_state_bytes, mind_state_bytes
+from cadence_snapshot import append_list_record
+from decision_history_store import ColumnarDecisionHistory
+from emotional_ai_module import EmotionAI_PathBased_DynamicIntensity_V3, EMOTION_CATEGORIES
+from mind_ai_module import MindAI_Learning
+
+SESSION_OVERHEAD_BYTES = 512 # Instance objects and attribute dicts not counted by the state estimates
+_HEADER_LENGTH = struct.Struct("<I")
+_EMOTION_PARAMETERS = ("last_pathway_weights", "intensity_decay_rates", "appraisal_intensity_multiplier", "decay_mode",
+                       "decay_tick_seconds", "appraisal_mode")
+
+
+def encode_session(emotion_ai, mind_ai_learner, evicted_at):
+    """
+    Compact form of a session's state: a JSON header (intensities, emotion parameters and modes, learning
+    rate, history code tables) followed by the decision history as code and timestamp columns, zlib-compressed.
+    The clock and timeline are not stored: they come from the factories the session is rehydrated with.
+    """
+    levels = emotion_ai.get_emotion_intensity() # Settles lazy decay first
+    history = mind_ai_learner.decision_history
+    header = {
+        "evicted_at": evicted_at,
+        "intensities": [levels.get(emotion, 0.0) for emotion in EMOTION_CATEGORIES],
+        "last_pathway": emotion_ai.last_pathway,
+        "last_pathway_weights": emotion_ai.last_pathway_weights,
+        "intensity_decay_rates": emotion_ai.intensity_decay_rates,
+        "appraisal_intensity_multiplier": emotion_ai.appraisal_intensity_multiplier,
+        "decay_mode": emotion_ai.decay_mode,
+        "decay_tick_seconds": emotion_ai.decay_tick_seconds,
+        "appraisal_mode": emotion_ai.appraisal_mode,
+        "learning_rate": mind_ai_learner.learning_rate,
+    }
+    if isinstance(history, list):
+        path_codes, option_codes, outcome_codes = {}, {}, {}
+        columns = (
+            np.array([_code(path_codes, tuple(record["emotion_path"])) for record in history], dtype=np.int32),
+            np.array([_code(option_codes, record["chosen_option"]) for record in history], dtype=np.int32),
+            np.array([_code(outcome_codes, record["outcome"]) for record in history], dtype=np.int32),
+            np.array([record["timestamp"] for record in history], dtype=np.float64),
+        )
+        header.update(history="list", paths=[list(path) for path in path_codes], options=list(option_codes), outcomes=list(outcome_codes))
+    else:
+        columns = history.columns()
+        header.update(history="columnar", capacity=history.capacity, paths=[list(path) for path in history.paths],
+                      options=history.options, outcomes=history.outcomes)
+    header["records"] = len(columns[3])
+    encoded_header = json.dumps(header).encode("utf-8")
+    body = b"".join(np.ascontiguousarray(column).tobytes() for column in columns)
+    return zlib.compress(_HEADER_LENGTH.pack(len(encoded_header)) + encoded_header + body, 1)
+
+
+def decode_session(blob, emotion_ai, mind_ai_learner):
+    """Restores encode_session() state into freshly made instances. Returns the time the session was evicted."""
+    data = zlib.decompress(blob)
+    header_length, = _HEADER_LENGTH.unpack_from(data)
+    offset = _HEADER_LENGTH.size + header_length
+    header = json.loads(data[_HEADER_LENGTH.size:offset])
+    emotion_ai.emotion_intensity_levels = dict(zip(EMOTION_CATEGORIES, header["intensities"]))
+    emotion_ai.last_pathway = header["last_pathway"]
+    for name in _EMOTION_PARAMETERS:
+        if name in header: # Blobs from before these were stored keep the factory's values
+            setattr(emotion_ai, name, header[name])
+    mind_ai_learner.learning_rate = header["learning_rate"]
+
+    count = header["records"]
+    columns = []
+    for dtype in (np.int32, np.int32, np.int32, np.float64):
+        columns.append(np.frombuffer(data, dtype=dtype, count=count, offset=offset))
+        offset += count * np.dtype(dtype).itemsize
+    paths, options, outcomes = header["paths"], header["options"], header["outcomes"]
+    if header["history"] == "list":
+        mind_ai_learner.decision_history = []
+        mind_ai_learner.outcome_counts = {}
+        for path_code, option_code, outcome_code, timestamp in zip(*(column.tolist() for column in columns)):
+            append_list_record(mind_ai_learner, list(paths[path_code]), options[option_code], outcomes[outcome_code], timestamp)
+    else:
+        mind_ai_learner.decision_history = ColumnarDecisionHistory.from_columns(
+            paths, options, outcomes, *columns, capacity=header["capacity"]
+        )
+    return header["evicted_at"]
+
+
+def _code(codes, value):
+    code = codes.get(value)
+    if code is None:
+        code = codes[value] = len(codes)
+    return code
+
+
+class PagedSessions:
+    """
+    Session id -> (emotion_ai, mind_ai_learner) with a memory budget, usable where a dict of sessions is
+    (get, [], in, assignment), e.g. as CadenceServer.sessions.
+
+    Resident sessions are kept in least-recently-used order. When their estimated size exceeds memory_budget
+    bytes, the least recently used ones are encoded (encode_session) into a SQLite store at path and dropped.
+    get() pages an evicted session back in through the factories, applying the decay it owes for the idle
+    time in lazy decay mode (tick-mode sessions only decay per turn, resident or not). Idle time is measured
+    on the session's own clock (emotion_ai.clock, the one its lazy decay reads): time() spans the page-out,
+    since the store outlives the process, and monotonic() restarts lazy decay on page-in. Sizes are
+    re-estimated each time a session is accessed, so they trail its latest turn by one. Writes are committed
+    every commit_every evictions and by flush()/close().
+    """
+    def __init__(self, path, memory_budget=256 << 20, emotion_ai_factory=EmotionAI_PathBased_DynamicIntensity_V3,
+                 mind_ai_factory=MindAI_Learning, commit_every=256):
+        self.path = path
+        self.memory_budget = memory_budget
+        self.emotion_ai_factory = emotion_ai_factory
+        self.mind_ai_factory = mind_ai_factory
+        self.commit_every = commit_every
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, state BLOB NOT NULL)")
+        self._resident = OrderedDict() # session id -> [state, estimated bytes], least recently used first
+        self.resident_bytes = 0
+        self._uncommitted = 0
+
+        self.hits = 0 # get() of a resident session
+        self.misses = 0 # get() that paged a session in
+        self.unknown = 0 # get() of a session neither resident nor stored
+        self.evictions = 0
+        self.page_in_latency = LatencyHistogram()
+        self.page_out_latency = LatencyHistogram()
+
+    def __len__(self):
+        """Sessions known, resident or stored."""
+        return len(self._resident) + self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def __contains__(self, session_id):
+        return session_id in self._resident or self._load(session_id) is not None
+
+    def __getitem__(self, session_id):
+        state = self.get(session_id)
+        if state is None:
+            raise KeyError(session_id)
+        return state
+
+    def __setitem__(self, session_id, state):
+        """Adds or replaces a session as the most recently used, evicting others if over budget."""
+        self._forget(session_id)
+        self._db.execute("DELETE FROM sessions WHERE id = ?", (_key(session_id),))
+        self._admit(session_id, state)
+
+    def get(self, session_id, default=None):
+        """The session's state, paged in if it was evicted; default if the session is unknown."""
+        entry = self._resident.get(session_id)
+        if entry is not None:
+            self.hits += 1
+            self._resident.move_to_end(session_id)
+            size = _state_bytes(entry[0])
+            self.resident_bytes += size - entry[1]
+            entry[1] = size
+            self._enforce_budget()
+            return entry[0]
+
+        started = time.perf_counter_ns()
+        blob = self._load(session_id)
+        if blob is None:
+            self.unknown += 1
+            return default
+        state = (self.emotion_ai_factory(), self.mind_ai_factory())
+        evicted_at = decode_session(blob, *state)
+        emotion_ai = state[0]
+        if emotion_ai.decay_mode == "lazy":
+            emotion_ai.advance((emotion_ai.clock.time() - evicted_at) / emotion_ai.decay_tick_seconds) # Decay owed while paged out
+            emotion_ai.last_decay_time = emotion_ai.clock.monotonic()
+        self._db.execute("DELETE FROM sessions WHERE id = ?", (_key(session_id),))
+        self._count_write()
+        self._admit(session_id, state)
+        self.misses += 1
+        self.page_in_latency.record(time.perf_counter_ns() - started)
+        return state
+
+    def evict(self, session_id):
+        """Pages a resident session out now."""
+        entry = self._resident.pop(session_id)
+        self.resident_bytes -= entry[1]
+        started = time.perf_counter_ns()
+        self._db.execute("INSERT OR REPLACE INTO sessions (id, state) VALUES (?, ?)",
+                         (_key(session_id), encode_session(*entry[0], entry[0][0].clock.time())))
+        self._count_write()
+        self.evictions += 1
+        self.page_out_latency.record(time.perf_counter_ns() - started)
+
+    def flush(self):
+        self._db.commit()
+        self._uncommitted = 0
+
+    def close(self, persist=True):
+        """Closes the store, first paging every resident session out unless persist is False."""
+        if persist:
+            for session_id in list(self._resident):
+                self.evict(session_id)
+        self.flush()
+        self._db.close()
+
+    def stats(self):
+        return {
+            "resident": len(self._resident),
+            "resident_bytes": self.resident_bytes,
+            "memory_budget": self.memory_budget,
+            "stored": self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0],
+            "hits": self.hits,
+            "misses": self.misses,
+            "unknown": self.unknown,
+            "evictions": self.evictions,
+            "page_in_latency": self.page_in_latency.snapshot(),
+            "page_out_latency": self.page_out_latency.snapshot(),
+        }
+
+    def _admit(self, session_id, state):
+        size = _state_bytes(state)
+        self._resident[session_id] = [state, size]
+        self.resident_bytes += size
+        self._enforce_budget()
+
+    def _forget(self, session_id):
+        entry = self._resident.pop(session_id, None)
+        if entry is not None:
+            self.resident_bytes -= entry[1]
+
+    def _enforce_budget(self):
+        # The most recently used session always stays: it is the one being served
+        while self.resident_bytes > self.memory_budget and len(self._resident) > 1:
+            self.evict(next(iter(self._resident)))
+
+    def _load(self, session_id):
+        row = self._db.execute("SELECT state FROM sessions WHERE id = ?", (_key(session_id),)).fetchone()
+        return row[0] if row is not None else None
+
+    def _count_write(self):
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self.flush()
+
+
+def _key(session_id):
+    """Store key of a session id; JSON keeps 1 and "1" apart."""
+    return json.dumps(session_id)
+
+
+def _state_bytes(state):
+    return emotion_state_bytes(state[0]) + mind_state_bytes(state[1]) + SESSION_OVERHEAD_BYTES
@@ -0,0 +1,150 @@
+# test_appraisal_equivalence.py
+import random
+import unittest
+
+from emotional_ai_module import EmotionAI_PathBased_DynamicIntensity_V3, AppraisalIndex
+
+CORPUS_SIZE = 100000
+FILLER_WORDS = (
+    "the", "a", "of", "and", "to", "in", "it", "we", "you", "they", "was", "is", "on", "for", "with",
+    "today", "report", "meeting", "weather", "code", "review", "train", "coffee", "window", "number",
+    "sadly", "therapy", "artist", "cheat", "thigh", "harmony", "lawn", "lossy", "feared", "darkness",
+)
+PATHWAY_STAGES = ("valence", "relevance", "physiological", "expression", "emotion", "intensity") # Emotion path order
+SEPARATORS = (" ", " ", " ", "", "-", "_", ", ", ".\n")
+
+
+def baseline_pathway(stimulus_text):
+    """
+    The if/elif keyword cascade generate_emotion_path used before the compiled matcher, kept verbatim
+    as the reference the AppraisalIndex must agree with.
+    """
+    stimulus_text_lower = stimulus_text.lower()
+
+    # Appraisal - Simplified keyword-based appraisal for demonstration
+    if any(keyword in stimulus_text_lower for keyword in ["excellent", "good job", "doing well", "validated", "praise", "thank you", "joyful", "won an award", "surprise party", "good news", "social praise", "challenge met", "social connection", "achievement", "humor", "comfort", "gratitude", "reassurance"]):
+        pathway = "positive_stimulus" # Default positive, more specific paths below
+        if any(keyword in stimulus_text_lower for keyword in ["excellent", "good job", "doing well", "validated", "praise",  "social praise", "thank you", "gratitude"]):
+            pathway = "stimulus_social_praise"
+        elif "joyful" in stimulus_text_lower or "won award" in stimulus_text_lower or "good news" in stimulus_text_lower:
+            pathway = "stimulus_good_news"
+        elif "surprise party" in stimulus_text_lower or "surprise" in stimulus_text_lower:
+            pathway = "stimulus_surprise"
+        elif "challenge met" in stimulus_text_lower:
+            pathway = "stimulus_challenge_met"
+        elif "social connection" in stimulus_text_lower:
+            pathway = "stimulus_social_connection"
+        elif "achievement" in stimulus_text_lower:
+            pathway = "stimulus_achievement"
+        elif "humor" in stimulus_text_lower:
+            pathway = "stimulus_humor"
+        elif "comfort" in stimulus_text_lower:
+            pathway = "stimulus_comfort"
+        elif "reassurance" in stimulus_text_lower:
+            pathway = "stimulus_reassurance"
+
+    elif any(keyword in stimulus_text_lower for keyword in ["scary", "threat", "danger", "fear", "scared", "afraid", "threat imminent", "overload", "confusion"]):
+         pathway = "negative_stimulus_threat" # Default threat, more specific paths below
+         if "scary threat" in stimulus_text_lower or "threat imminent" in stimulus_text_lower or "danger" in stimulus_text_lower or "threat" in stimulus_text_lower or "fear" in stimulus_text_lower or "afraid" in stimulus_text_lower:
+             pathway = "stimulus_threat_imminent"
+         elif "confusion" in stimulus_text_lower:
+             pathway = "stimulus_confusion"
+         elif "overload" in stimulus_text_lower:
+             pathway = "stimulus_overload"
+
+    elif any(keyword in stimulus_text_lower for keyword in ["sad", "loss", "disappointed", "sad news", "betrayal", "social rejection", "boredom", "disappointment"]):
+        pathway = "stimulus_sadness" # Default sadness, more specific paths below
+        if "sad news" in stimulus_text_lower or "loss" in stimulus_text_lower or "sad" in stimulus_text_lower:
+            pathway = "stimulus_sad_news"
+        elif "betrayal" in stimulus_text_lower:
+            pathway = "stimulus_betrayal"
+        elif "social rejection" in stimulus_text_lower:
+            pathway = "stimulus_social_rejection"
+        elif "boredom" in stimulus_text_lower:
+            pathway = "stimulus_boredom"
+        elif "disappointment" in stimulus_text_lower or "disappointed" in stimulus_text_lower:
+            pathway = "stimulus_disappointment"
+
+    elif any(keyword in stimulus_text_lower for keyword in ["angry", "insult", "unfair", "frustrated", "anger", "disgust", "disgusting", "moral violation", "stimulus_anger", "stimulus_disgust", "unfairness", "frustration"]):
+        pathway = "moral_violation" # Default anger/disgust, more specific paths below
+        if "angry" in stimulus_text_lower or "insult" in stimulus_text_lower or "anger" in stimulus_text_lower or "stimulus_anger" in stimulus_text_lower:
+            pathway = "stimulus_insult" # Or stimulus_anger
+        elif "unfair" in stimulus_text_lower or "unfairness" in stimulus_text_lower or "moral violation" in stimulus_text_lower:
+             pathway = "stimulus_unfairness" # Or moral_violation
+        elif "disgust" in stimulus_text_lower or "disgusting" in stimulus_text_lower or "stimulus_disgust" in stimulus_text_lower:
+            pathway = "stimulus_disgust"
+        elif "frustrated" in stimulus_text_lower or "frustration" in stimulus_text_lower:
+            pathway = "stimulus_frustration"
+
+    elif any(keyword in stimulus_text_lower for keyword in ["interesting", "question", "intellectual", "curious", "challenge"]):
+        pathway = "intellectual_stimulus" # Default intellectual, more specific paths below
+        if "interesting question" in stimulus_text_lower or "question" in stimulus_text_lower or "intellectual" in stimulus_text_lower:
+            pathway = "intellectual_stimulus"
+        elif "curious" in stimulus_text_lower or "curiosity" in stimulus_text_lower:
+            pathway = "stimulus_curiosity"
+        elif "challenge" in stimulus_text_lower:
+            pathway = "stimulus_challenge"
+
+    elif any(keyword in stimulus_text_lower for keyword in ["mozart", "music", "aesthetic", "beautiful", "art", "song"]):
+        pathway = "aesthetic_positive"
+        if "mozart" in stimulus_text_lower or "music" in stimulus_text_lower or "song" in stimulus_text_lower:
+            pathway = "aesthetic_positive" # More specific music path if needed
+
+    elif any(keyword in stimulus_text_lower for keyword in ["constitution", "law", "government", "justice", "liberty", "tranquility", "welfare"]):
+        pathway = "social_positive_feedback" # Could be refined, using social_positive for now as placeholder
+
+    elif any(keyword in stimulus_text_lower for keyword in ["bible", "king james version", "genesis", "exodus", "psalms", "gospels", "revelation", "christian"]): # Broader religious/spiritual stimuli
+        pathway = "intellectual_stimulus" # Or could create a "spiritual_stimulus" path
+
+    elif any(keyword in stimulus_text_lower for keyword in ["tell-tale heart", "edgar allan poe", "horror", "dark", "disturbing", "unsettling", "madness", "murder", "fearful", "vulture eye"]):
+        pathway = "stimulus_fear" # Or could create a "fiction_horror_stimulus" path
+
+    elif any(keyword in stimulus_text_lower for keyword in ["hello", "hi", "greetings", "how are you", "cadence", "gemini"]):
+        pathway = "stimulus_social_cue" # Social greeting/cue
+
+    else:
+        pathway = "neutral_stimulus" # Default neutral pathway
+
+    return pathway
+
+
+def generate_corpus(keywords, size, seed=20240611):
+    """Messages mixing keywords (some uppercased, some cut short), near-miss filler words and separators."""
+    rng = random.Random(seed)
+    keywords = sorted(keywords)
+    corpus = []
+    for _ in range(size):
+        parts = []
+        for _ in range(rng.randint(0, 12)):
+            roll = rng.random()
+            if roll < 0.35:
+                keyword = rng.choice(keywords)
+                parts.append(keyword.upper() if rng.random() < 0.1 else keyword)
+            elif roll < 0.45:
+                keyword = rng.choice(keywords)
+                parts.append(keyword[:rng.randint(0, len(keyword))])
+            else:
+                parts.append(rng.choice(FILLER_WORDS))
+        corpus.append(rng.choice(SEPARATORS).join(parts))
+    return corpus
+
+
+class AppraisalEquivalenceTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.appraisal_index = AppraisalIndex()
+        cls.corpus = generate_corpus(cls.appraisal_index.matcher.keywords, CORPUS_SIZE)
+
+    def test_select_pathway_matches_the_cascade(self):
+        for text in self.corpus:
+            self.assertEqual(self.appraisal_index.select_pathway(text.lower()), baseline_pathway(text), text)
+
+    def test_generate_emotion_path_matches_the_cascade(self):
+        emotion_ai = EmotionAI_PathBased_DynamicIntensity_V3()
+        for text in self.corpus[:CORPUS_SIZE // 10]:
+            stages = emotion_ai.emotion_pathways[baseline_pathway(text)]
+            self.assertEqual(emotion_ai.generate_emotion_path(text), [stages[stage] for stage in PATHWAY_STAGES], text)
+
+
+if __name__ == "__main__":
+    unittest.main()
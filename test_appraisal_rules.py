@@ -0,0 +1,45 @@
+# test_appraisal_rules.py
+import copy
+import unittest
+
+from emotional_ai_module import DEFAULT_APPRAISAL_RULES, DEFAULT_PATHWAY, rules_from_data, rules_to_data
+
+
+class RulesFromDataTest(unittest.TestCase):
+    def setUp(self):
+        self.data = rules_to_data()
+
+    def assertRejected(self, change):
+        data = copy.deepcopy(self.data)
+        change(data)
+        with self.assertRaises(ValueError):
+            rules_from_data(data)
+
+    def test_round_trip(self):
+        rules, default_pathway, pathways = rules_from_data(self.data)
+        self.assertEqual(rules, DEFAULT_APPRAISAL_RULES)
+        self.assertEqual(default_pathway, DEFAULT_PATHWAY)
+        self.assertEqual(set(pathways), set(self.data["pathways"]))
+
+    def test_missing_pathways_use_the_built_in_table(self):
+        del self.data["pathways"]
+        self.assertIsNone(rules_from_data(self.data)[2])
+
+    def test_unknown_pathways_are_rejected(self):
+        self.assertRejected(lambda data: data["rules"][0].update(pathway="positive_stimulsu"))
+        self.assertRejected(lambda data: data["rules"][0]["refinements"].append({"keywords": ["wow"], "pathway": "nope"}))
+        self.assertRejected(lambda data: data.update(default_pathway="nope"))
+
+    def test_malformed_shapes_are_rejected(self):
+        self.assertRejected(lambda data: data.update(pathways=[]))
+        self.assertRejected(lambda data: data.update(pathways={}))
+        self.assertRejected(lambda data: data["pathways"].update(broken="neutral"))
+        self.assertRejected(lambda data: data.update(rules={}))
+        self.assertRejected(lambda data: data.pop("rules"))
+        self.assertRejected(lambda data: data["rules"].append(["happy"]))
+        self.assertRejected(lambda data: data["rules"][0].update(refinements="surprise"))
+        self.assertRejected(lambda data: data["rules"][0].update(keywords="happy"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+# test_cadence_loadgen.py
+import random
+import unittest
+
+from cadence_loadgen import StimulusGenerator, filler_words, stimulus_vocabulary
+from emotional_ai_module import get_appraisal_index
+
+
+class StimulusGeneratorTest(unittest.TestCase):
+    def test_messages_appraise_as_their_category(self):
+        appraisal_index = get_appraisal_index()
+        pathways = {"neutral": {appraisal_index.default_pathway}}
+        for _, category_pathway, sub_rules in appraisal_index.rules:
+            pathways.setdefault(category_pathway, {category_pathway}).update(sub_pathway for _, sub_pathway in sub_rules)
+        vocabulary = stimulus_vocabulary(appraisal_index)
+        filler = filler_words(appraisal_index)
+        for category in vocabulary:
+            generate = StimulusGenerator({category: 1.0}, vocabulary, random.Random(category), filler=filler)
+            for _ in range(500):
+                message = generate()
+                self.assertIn(appraisal_index.select_pathway(message.lower()), pathways[category], message)
+
+    def test_refinement_only_keywords_are_left_out(self):
+        keywords = {keyword for category_keywords in stimulus_vocabulary().values() for keyword in category_keywords}
+        self.assertNotIn("surprise", keywords)
+        self.assertNotIn("won award", keywords)
+        self.assertNotIn("curiosity", keywords)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+# test_cadence_server.py
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from cadence_server import CadenceServer
+
+
+class FailingSessions(dict):
+    """Session map whose "broken" session fails like an unreadable session store."""
+    def get(self, session_id, default=None):
+        if session_id == "broken":
+            raise sqlite3.OperationalError("database is locked")
+        return super().get(session_id, default)
+
+
+class CadenceServerTest(unittest.TestCase):
+    def test_failed_turn_is_answered_and_the_connection_keeps_working(self):
+        async def exchange(path):
+            server = CadenceServer(unix_path=path, sessions=FailingSessions(), max_pending=2)
+            await server.start()
+            reader, writer = await asyncio.open_unix_connection(path)
+            requests = [{"session": "broken", "text": "hello", "id": 1}] * 4 + [{"session": "ok", "text": "hello", "id": 2}]
+            writer.write(b"".join(json.dumps(request).encode("utf-8") + b"\n" for request in requests))
+            await writer.drain()
+            responses = [json.loads(await asyncio.wait_for(reader.readline(), 5)) for _ in requests]
+            writer.close()
+            await server.shutdown()
+            return responses
+
+        with tempfile.TemporaryDirectory() as directory:
+            responses = asyncio.run(exchange(os.path.join(directory, "cadence.sock")))
+        self.assertEqual(responses[:4], [{"error": "database is locked", "id": 1}] * 4)
+        self.assertEqual(responses[4]["id"], 2)
+        self.assertIn("chosen_option", responses[4])
+
+
+if __name__ == "__main__":
+    unittest.main()
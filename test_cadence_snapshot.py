@@ -0,0 +1,122 @@
+# test_cadence_snapshot.py
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import cadence_snapshot
+from cadence_clock import VirtualClock
+from cadence_snapshot import load_sessions, load_snapshot, save_sessions, save_snapshot
+from decision_history_store import ColumnarDecisionHistory
+from emotion_session_pool import EmotionSessionPool
+from emotional_ai_module import EmotionAI_PathBased_DynamicIntensity_V3, EMOTION_CATEGORIES
+from main_ai_system import run_turn
+from mind_ai_module import MindAI_Learning
+
+TEXTS = ("I am scared of the storm", "What a wonderful happy day", "The weekly report", "I am scared and angry")
+EMOTION_PARAMETERS = ("intensity_decay_rates", "appraisal_intensity_multiplier", "decay_mode", "decay_tick_seconds", "appraisal_mode")
+
+
+class SnapshotRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "sessions.snap")
+        self.clock = VirtualClock()
+
+    def make_sessions(self):
+        sessions = {
+            "multi": (EmotionAI_PathBased_DynamicIntensity_V3({emotion: 0.05 for emotion in EMOTION_CATEGORIES}, 1.5, "lazy", 2.0,
+                                                              self.clock, "multi"), MindAI_Learning(clock=self.clock)),
+            "columnar": (EmotionAI_PathBased_DynamicIntensity_V3(clock=self.clock),
+                         MindAI_Learning(ColumnarDecisionHistory(capacity=3), clock=self.clock)),
+            "empty": (EmotionAI_PathBased_DynamicIntensity_V3(clock=self.clock), MindAI_Learning(clock=self.clock)),
+        }
+        for text in TEXTS:
+            for session_id in ("multi", "columnar"):
+                run_turn(*sessions[session_id], text)
+            self.clock.advance(1.0)
+        sessions["multi"][1].learning_rate = 0.3
+        return sessions
+
+    def history_records(self, mind_ai_learner):
+        return [(tuple(record["emotion_path"]), record["chosen_option"], record["outcome"], record["timestamp"])
+                for record in mind_ai_learner.decision_history]
+
+    def assert_same_sessions(self, restored, sessions):
+        self.assertEqual(list(restored), list(sessions))
+        for session_id, (emotion_ai, mind_ai_learner) in sessions.items():
+            restored_emotion_ai, restored_learner = restored[session_id]
+            for name in EMOTION_PARAMETERS:
+                self.assertEqual(getattr(restored_emotion_ai, name), getattr(emotion_ai, name), name)
+            self.assertEqual(restored_emotion_ai.get_emotion_intensity(), emotion_ai.get_emotion_intensity())
+            self.assertEqual(type(restored_learner.decision_history), type(mind_ai_learner.decision_history))
+            self.assertEqual(self.history_records(restored_learner), self.history_records(mind_ai_learner))
+            self.assertEqual(restored_learner.outcome_counts, mind_ai_learner.outcome_counts)
+            self.assertEqual(restored_learner.learning_rate, mind_ai_learner.learning_rate)
+            self.assertEqual(restored_learner.analyze_options("Current situation", ["[EMOTION_FEAR]"]),
+                             mind_ai_learner.analyze_options("Current situation", ["[EMOTION_FEAR]"]))
+        # Restored sessions keep behaving the same, multi-label blending included
+        for text in TEXTS:
+            for session_id in sessions:
+                self.assertEqual(run_turn(*restored[session_id], text), run_turn(*sessions[session_id], text))
+            self.clock.advance(1.0)
+
+    def test_sessions_round_trip(self):
+        sessions = self.make_sessions()
+        save_sessions(self.path, sessions)
+        self.assert_same_sessions(load_sessions(self.path, self.clock), sessions)
+
+    def test_history_columns_are_copy_on_write_maps(self):
+        save_sessions(self.path, self.make_sessions())
+        snapshot = load_snapshot(self.path)
+        paths = snapshot.array("mind.history_path")
+        self.assertIsInstance(paths, np.memmap)
+        self.assertEqual(paths.mode, "c")
+        saved = paths.tolist()
+        paths[:] = -1
+        self.assertEqual(load_snapshot(self.path).array("mind.history_path").tolist(), saved)
+
+    def test_counts_only_snapshot_keeps_outcome_counts(self):
+        sessions = self.make_sessions()
+        save_sessions(self.path, sessions, include_history=False)
+        restored = load_sessions(self.path, self.clock)
+        for session_id in ("multi", "empty"):
+            self.assertEqual(restored[session_id][1].outcome_counts, sessions[session_id][1].outcome_counts)
+        self.assertEqual(restored["columnar"][1].count_outcomes("[EMOTION_FEAR]", "Option B", "positive"),
+                         sessions["columnar"][1].count_outcomes("[EMOTION_FEAR]", "Option B", "positive"))
+
+    def test_pool_intensities_stay_mapped(self):
+        pool = EmotionSessionPool({emotion: 0.05 for emotion in EMOTION_CATEGORIES}, 1.5, clock=self.clock, appraisal_mode="multi")
+        for session_id in ("a", "b"):
+            pool.add_session(session_id)
+        pool.appraise_batch(["a", "b", "a"], TEXTS[:3])
+        save_snapshot(self.path, pool=pool)
+        restored = load_snapshot(self.path).pool(self.clock)
+        self.assertIsInstance(restored._intensities, np.memmap)
+        np.testing.assert_array_equal(restored.intensities, pool.intensities)
+        self.assertEqual(restored.session_ids, pool.session_ids)
+        self.assertEqual(restored.appraisal_mode, "multi")
+        restored.tick()
+        np.testing.assert_array_equal(load_snapshot(self.path).pool(self.clock).intensities, pool.intensities)
+
+    def test_version_1_snapshot_restores_single_appraisal(self):
+        sessions = self.make_sessions()
+        with mock.patch.object(cadence_snapshot, "SNAPSHOT_VERSION", 1):
+            save_sessions(self.path, sessions)
+        snapshot = load_snapshot(self.path)
+        self.assertEqual(snapshot.header["version"], 1)
+        del snapshot.header["arrays"]["emotion.parameter_multi_label"] # Version 1 files don't have it
+        self.assertEqual(snapshot.emotion_ais(self.clock)["multi"].appraisal_mode, "single")
+
+    def test_unknown_version_is_rejected(self):
+        with mock.patch.object(cadence_snapshot, "SNAPSHOT_VERSION", 99):
+            save_sessions(self.path, self.make_sessions())
+        with self.assertRaises(ValueError):
+            load_snapshot(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
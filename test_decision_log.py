@@ -0,0 +1,74 @@
+# test_decision_log.py
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from decision_history_store import ColumnarDecisionHistory
+from decision_log import DecisionLog
+from mind_ai_module import MindAI_Learning
+
+
+class DecisionLogRestoreTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "decisions.log")
+        with DecisionLog(self.path) as decision_log:
+            mind_ai_learner = MindAI_Learning(decision_log=decision_log)
+            for _ in range(7):
+                mind_ai_learner.record_decision_outcome(["[EMOTION_FEAR]"], "Option C", "negative")
+
+    def restored_priority(self, decision_history):
+        with DecisionLog(self.path) as decision_log:
+            mind_ai_learner = decision_log.restore(MindAI_Learning(decision_history=decision_history))
+        return mind_ai_learner.analyze_options("Current situation", ["[EMOTION_FEAR]"])[1]["Option C"]
+
+    def test_list_history_restores_counts(self):
+        self.assertAlmostEqual(self.restored_priority(None), 1.6)
+
+    def test_columnar_history_restores_counts(self):
+        self.assertAlmostEqual(self.restored_priority(ColumnarDecisionHistory()), 1.6)
+
+    def test_columnar_history_keeps_its_capacity(self):
+        self.assertAlmostEqual(self.restored_priority(ColumnarDecisionHistory(capacity=5)), 2.0)
+
+    def test_non_empty_columnar_history_is_rejected(self):
+        history = ColumnarDecisionHistory()
+        history.append(["[EMOTION_JOY]"], "Option A", "positive", 0.0)
+        with self.assertRaises(ValueError):
+            self.restored_priority(history)
+
+
+class DecisionLogWriterTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "decisions.log")
+
+    def test_close_writes_a_checkpoint(self):
+        with DecisionLog(self.path, background=False) as decision_log:
+            for _ in range(5):
+                decision_log.append(["[EMOTION_JOY]"], "Option B", "positive", 0.0)
+        with open(self.path + ".ckpt", encoding="utf-8") as checkpoint_file:
+            self.assertEqual(json.load(checkpoint_file)["records"], 5)
+        with DecisionLog(self.path) as decision_log:
+            self.assertEqual(list(decision_log.outcome_counts().values()), [5])
+
+    def test_full_group_is_written_off_the_appending_thread(self):
+        with DecisionLog(self.path, group_size=4, flush_interval=60.0) as decision_log:
+            for _ in range(5):
+                decision_log.append(["[EMOTION_JOY]"], "Option B", "positive", 0.0)
+            self.assertEqual(len(decision_log), 5)
+            deadline = time.monotonic() + 5.0
+            while len(decision_log.records()) < 4 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertGreaterEqual(len(decision_log.records()), 4)
+        with DecisionLog(self.path) as decision_log:
+            self.assertEqual(len(decision_log), 5)
+            self.assertEqual(decision_log.load_history().count("[EMOTION_JOY]", "Option B", "positive"), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
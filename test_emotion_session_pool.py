@@ -0,0 +1,114 @@
+# test_emotion_session_pool.py
+import unittest
+
+from cadence_clock import VirtualClock
+from emotion_session_pool import EmotionSessionPool
+from emotion_timeline import EmotionTimeline
+from emotional_ai_module import EmotionAI_PathBased_DynamicIntensity_V3, EMOTION_CATEGORIES
+
+TEXTS = ("I am scared of the storm", "What a wonderful happy day", "The weekly report", "I am scared and angry",
+         "I love this, thank you", "This is disgusting")
+DECAY_RATES = {emotion: 0.05 for emotion in EMOTION_CATEGORIES}
+
+
+class EmotionSessionPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = VirtualClock()
+
+    def make(self, session_ids, decay_mode="tick", appraisal_mode="single"):
+        """A pool and one standalone emotion AI per session with the same parameters."""
+        pool = EmotionSessionPool(DECAY_RATES, 1.5, initial_capacity=2, decay_mode=decay_mode, decay_tick_seconds=2.0,
+                                  clock=self.clock, appraisal_mode=appraisal_mode)
+        instances = {}
+        for session_id in session_ids:
+            pool.add_session(session_id)
+            instances[session_id] = EmotionAI_PathBased_DynamicIntensity_V3(dict(DECAY_RATES), 1.5, decay_mode, 2.0, self.clock, appraisal_mode)
+        return pool, instances
+
+    def assert_same_intensities(self, pool, instances):
+        self.assertEqual(sorted(pool.session_ids), sorted(instances))
+        for session_id, emotion_ai in instances.items():
+            pooled = pool.session(session_id).get_emotion_intensity()
+            for emotion, level in emotion_ai.get_emotion_intensity().items():
+                self.assertAlmostEqual(pooled[emotion], level, places=6, msg=(session_id, emotion))
+
+    def test_add_session_starts_at_zero(self):
+        pool, instances = self.make(["a", "b", "c"]) # Grows past initial_capacity
+        self.assertEqual(len(pool), 3)
+        self.assertIn("c", pool)
+        self.assert_same_intensities(pool, instances)
+        with self.assertRaises(KeyError):
+            pool.add_session("a")
+
+    def test_swap_remove_keeps_the_other_sessions(self):
+        pool, instances = self.make(["a", "b", "c", "d"])
+        for session_id, text in zip(instances, TEXTS):
+            pool.session(session_id).generate_emotion_path(text)
+            instances[session_id].generate_emotion_path(text)
+        view = pool.session("d")
+        pool.remove_session("a")
+        del instances["a"]
+        self.assertEqual(pool.row("d"), 0) # The last row moved into the freed slot
+        self.assertNotIn("a", pool)
+        self.assert_same_intensities(pool, instances)
+        self.assertEqual(view.get_emotion_intensity(), pool.session("d").get_emotion_intensity())
+        with self.assertRaises(KeyError):
+            pool.session("a")
+
+    def test_tick_matches_per_session_decay(self):
+        pool, instances = self.make(["a", "b"])
+        for text in TEXTS:
+            for session_id in instances:
+                pool.session(session_id).generate_emotion_path(text)
+                instances[session_id].generate_emotion_path(text)
+            pool.tick()
+            for emotion_ai in instances.values():
+                emotion_ai.update_emotion_intensity()
+            self.assert_same_intensities(pool, instances)
+        pool.advance(7)
+        for emotion_ai in instances.values():
+            emotion_ai.advance(7)
+        self.assert_same_intensities(pool, instances)
+
+    def test_lazy_rows_settle_like_lazy_instances(self):
+        pool, instances = self.make(["a", "b"], decay_mode="lazy")
+        for text in TEXTS:
+            pool.session("a").generate_emotion_path(text)
+            instances["a"].generate_emotion_path(text)
+            self.clock.advance(1.5)
+        self.assert_same_intensities(pool, instances)
+        self.clock.advance(3.0)
+        pool.settle_all()
+        self.assert_same_intensities(pool, instances)
+
+    def test_appraise_batch_matches_per_session_appraisal(self):
+        for appraisal_mode in ("single", "multi"):
+            pool, instances = self.make(["a", "b", "c"], decay_mode="lazy", appraisal_mode=appraisal_mode)
+            session_ids = ["a", "b", "a", "c", "b", "a"]
+            pathway_ids = pool.appraise_batch(session_ids, TEXTS)
+            for session_id, text, pathway_id in zip(session_ids, TEXTS, pathway_ids.tolist()):
+                instances[session_id].generate_emotion_path(text)
+                self.assertEqual(instances[session_id].pathway_names[pathway_id], instances[session_id].last_pathway)
+            self.assert_same_intensities(pool, instances)
+
+    def test_multi_appraisal_view_matches_an_instance(self):
+        pool, instances = self.make(["a"], appraisal_mode="multi")
+        view = pool.session("a")
+        for text in TEXTS:
+            self.assertEqual(view.generate_emotion_path(text), instances["a"].generate_emotion_path(text))
+            self.assertEqual(view.last_pathway_weights, instances["a"].last_pathway_weights)
+            self.assertEqual(view.last_pathway, instances["a"].last_pathway)
+        self.assertEqual(view.appraisal_mode, "multi")
+        self.assert_same_intensities(pool, instances)
+
+    def test_timeline_is_rejected(self):
+        pool, _ = self.make(["a"])
+        timeline = EmotionTimeline(clock=self.clock)
+        with self.assertRaises(ValueError):
+            timeline.attach("a", pool.session("a"))
+        self.assertEqual(timeline.sessions, {})
+        self.assertIsNone(pool.session("a").timeline)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+# test_emotion_timeline.py
+import unittest
+
+import numpy as np
+
+from cadence_clock import VirtualClock
+from emotion_timeline import EmotionTimeline
+from emotional_ai_module import EmotionAI_PathBased_DynamicIntensity_V3, EMOTION_CATEGORIES
+
+TEXTS = ("I am scared of the storm", "What a wonderful happy day", "The weekly report", "I am scared and angry",
+         "I love this, thank you", "This is disgusting")
+
+
+class EmotionTimelineTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = VirtualClock(epoch=1000.0)
+
+    def step_live(self, timeline, turns, decay_mode="tick", appraisal_mode="single"):
+        """
+        Steps a recorded session one turn per second, returning {time: intensity vector} of the live
+        session after each turn, as the reference for point-in-time queries.
+        """
+        emotion_ai = EmotionAI_PathBased_DynamicIntensity_V3(decay_mode=decay_mode, clock=self.clock, appraisal_mode=appraisal_mode)
+        timeline.attach("user", emotion_ai)
+        states = {self.clock.time(): [0.0] * len(EMOTION_CATEGORIES)}
+        for turn in range(turns):
+            self.clock.advance(1.0)
+            emotion_ai.generate_emotion_path(TEXTS[turn % len(TEXTS)])
+            emotion_ai.update_emotion_intensity()
+            levels = emotion_ai.get_emotion_intensity()
+            states[self.clock.time()] = [levels[emotion] for emotion in EMOTION_CATEGORIES]
+        return emotion_ai, states
+
+    def assert_matches_live(self, timeline, states):
+        session = timeline.session("user")
+        times = [time for time in states if time >= session.retained_since]
+        for time in times:
+            self.assertEqual(session.intensities_at(time).tolist(), states[time], time)
+        shuffled = list(reversed(times))
+        np.testing.assert_array_equal(session.intensities_at_times(shuffled), [states[time] for time in shuffled])
+        return times
+
+    def test_queries_match_the_live_session(self):
+        timeline = EmotionTimeline(checkpoint_every=4, clock=self.clock)
+        emotion_ai, states = self.step_live(timeline, 40)
+        self.assertEqual(len(self.assert_matches_live(timeline, states)), 41)
+        self.assertEqual(timeline.intensities_at("user", self.clock.time()), emotion_ai.get_emotion_intensity())
+        self.assertEqual(timeline.intensities_at("user", 1010.5), dict(zip(EMOTION_CATEGORIES, states[1010.0])))
+
+    def test_lazy_multi_label_session_matches(self):
+        timeline = EmotionTimeline(checkpoint_every=5, clock=self.clock)
+        _, states = self.step_live(timeline, 30, decay_mode="lazy", appraisal_mode="multi")
+        self.assert_matches_live(timeline, states)
+
+    def test_intensities_between(self):
+        timeline = EmotionTimeline(checkpoint_every=4, clock=self.clock)
+        _, states = self.step_live(timeline, 12)
+        times, intensities = timeline.intensities_between("user", 1002.5, 1005.0)
+        self.assertEqual(times[0], 1002.5)
+        self.assertEqual(intensities[0].tolist(), states[1002.0])
+        self.assertEqual(sorted(set(times[1:].tolist())), [1003.0, 1004.0, 1005.0]) # An appraisal and a decay event per turn
+        self.assertEqual(intensities[-1].tolist(), states[1005.0])
+
+    def test_retention_by_age_keeps_recent_queries_exact(self):
+        timeline = EmotionTimeline(checkpoint_every=4, retention_seconds=10, clock=self.clock)
+        _, states = self.step_live(timeline, 60)
+        session = timeline.session("user")
+        self.assertGreater(session.retained_since, 1000.0)
+        self.assertGreaterEqual(session.retained_since, self.clock.time() - 10 - 4 * 2) # Whole checkpoint intervals
+        self.assertGreaterEqual(len(self.assert_matches_live(timeline, states)), 10)
+        with self.assertRaises(ValueError):
+            session.intensities_at(1000.0)
+
+    def test_retention_by_event_count(self):
+        timeline = EmotionTimeline(checkpoint_every=4, max_events=16, clock=self.clock)
+        _, states = self.step_live(timeline, 60)
+        session = timeline.session("user")
+        self.assertLessEqual(len(session), 16 + 4)
+        self.assertGreaterEqual(len(session), 16)
+        self.assert_matches_live(timeline, states)
+
+    def test_detach_stops_recording(self):
+        timeline = EmotionTimeline(clock=self.clock)
+        emotion_ai, _ = self.step_live(timeline, 3)
+        session = timeline.detach("user", emotion_ai)
+        events = len(session)
+        emotion_ai.generate_emotion_path(TEXTS[0])
+        self.assertIsNone(emotion_ai.timeline)
+        self.assertEqual(len(session), events)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+# test_executor_ai_module.py
+import unittest
+
+from emotional_ai_module import EmotionAI_PathBased_DynamicIntensity_V3
+from executor_ai_module import DEFAULT_MODEL_CACHE_SIZE, ExecutorScoringModel, _default_model, executor_ai_decision_dynamic_intensity
+from main_ai_system import AI_RESPONSES, DEFAULT_AI_RESPONSE, MIND_AI_OPTIONS, run_turn
+from mind_ai_module import MindAI_Learning
+
+
+class ExecutorOptionsTest(unittest.TestCase):
+    def test_scores_the_callers_options(self):
+        mind_ai_learner = MindAI_Learning()
+        chosen_option, scores = executor_ai_decision_dynamic_intensity(
+            MIND_AI_OPTIONS, ["[APPRAISAL_NEUTRAL]"], {}, mind_ai_learner
+        )
+        self.assertEqual(list(scores), MIND_AI_OPTIONS)
+        self.assertEqual(chosen_option, MIND_AI_OPTIONS[1])
+        self.assertEqual(mind_ai_learner.decision_history[-1]["chosen_option"], MIND_AI_OPTIONS[1])
+        self.assertEqual(mind_ai_learner.decision_history[-1]["outcome"], "positive")
+
+    def test_run_turn_reaches_a_real_response(self):
+        turn = run_turn(EmotionAI_PathBased_DynamicIntensity_V3(), MindAI_Learning(), "Hello, how are you?")
+        self.assertIn(turn["chosen_option"], MIND_AI_OPTIONS)
+        self.assertEqual(turn["ai_response"], AI_RESPONSES[turn["chosen_option"]])
+        self.assertNotEqual(turn["ai_response"], DEFAULT_AI_RESPONSE)
+
+    def test_fear_penalty_applies_to_the_third_option(self):
+        mind_ai_learner = MindAI_Learning()
+        for _ in range(7):
+            mind_ai_learner.record_decision_outcome(["[EMOTION_FEAR]"], MIND_AI_OPTIONS[2], "negative")
+        options, priority = mind_ai_learner.analyze_options("Current situation", ["[EMOTION_FEAR]"], MIND_AI_OPTIONS)
+        self.assertEqual(options, MIND_AI_OPTIONS)
+        self.assertAlmostEqual(priority[MIND_AI_OPTIONS[2]], 3 - 7 * 0.2)
+        self.assertEqual(priority[MIND_AI_OPTIONS[0]], 5)
+        self.assertEqual(priority[MIND_AI_OPTIONS[1]], 7)
+
+    def test_default_options_keep_the_classic_choice(self):
+        chosen_option, scores = executor_ai_decision_dynamic_intensity(
+            ["Option A", "Option B", "Option C"], ["[EMOTION_JOY]"], {"JOY": 0.7}, MindAI_Learning()
+        )
+        self.assertEqual(chosen_option, "Option B")
+        self.assertEqual(scores, {"Option A": 5.0, "Option B": 9.0, "Option C": 3.0})
+
+    def test_mismatched_scoring_model_is_rejected(self):
+        mind_ai_learner = MindAI_Learning()
+        with self.assertRaises(ValueError):
+            executor_ai_decision_dynamic_intensity(
+                MIND_AI_OPTIONS, ["[APPRAISAL_NEUTRAL]"], {}, mind_ai_learner, ExecutorScoringModel.default()
+            )
+        self.assertEqual(mind_ai_learner.decision_history, [])
+
+    def test_default_model_cache_is_bounded(self):
+        for count in range(DEFAULT_MODEL_CACHE_SIZE * 2):
+            options = [f"Option {index}" for index in range(count + 1)]
+            executor_ai_decision_dynamic_intensity(options, ["[APPRAISAL_NEUTRAL]"], {}, MindAI_Learning())
+        self.assertLessEqual(_default_model.cache_info().currsize, DEFAULT_MODEL_CACHE_SIZE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+# test_main_ai_system.py
+import builtins
+import contextlib
+import io
+import unittest
+from unittest import mock
+
+from cadence_clock import VirtualClock
+from cadence_events import RingBufferSink
+from main_ai_system import main, simulate
+
+
+class MainTest(unittest.TestCase):
+    def test_main_keeps_an_empty_caller_sink(self):
+        events = RingBufferSink()
+        self.assertFalse(events) # Empty sinks are falsy: main must not replace it
+        user_inputs = iter(["hello there", "exit"])
+        with mock.patch.object(builtins, "input", lambda prompt: next(user_inputs)), \
+                contextlib.redirect_stdout(io.StringIO()) as output:
+            main(clock=VirtualClock(), events=events)
+        self.assertEqual(len(events), 2)
+        self.assertNotIn("Chosen Option", output.getvalue())
+
+    def test_simulate_is_reproducible(self):
+        first = list(simulate(["hello", "I am afraid of the threat", "thank you"]))
+        second = list(simulate(["hello", "I am afraid of the threat", "thank you"]))
+        self.assertEqual(first, second)
+        self.assertEqual([timestamp for timestamp, _ in first], [60.0, 120.0, 180.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
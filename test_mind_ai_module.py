@@ -0,0 +1,38 @@
+# test_mind_ai_module.py
+import unittest
+
+from mind_ai_module import PENALTY_CACHE_STEPS, MindAI_Learning
+
+
+def fear_records(count):
+    return [{"emotion_path": ["[EMOTION_FEAR]"], "chosen_option": "Option C", "outcome": "negative", "timestamp": 0.0}
+            for _ in range(count)]
+
+
+class MindAILearningTest(unittest.TestCase):
+    def test_prefilled_list_history_is_counted(self):
+        mind_ai_learner = MindAI_Learning(decision_history=fear_records(7))
+        self.assertEqual(mind_ai_learner.count_outcomes("[EMOTION_FEAR]", "Option C", "negative"), 7)
+        priority = mind_ai_learner.analyze_options("Current situation", ["[EMOTION_FEAR]"])[1]
+        self.assertAlmostEqual(priority["Option C"], 1.6)
+
+    def test_penalized_priority_matches_repeated_subtraction(self):
+        mind_ai_learner = MindAI_Learning()
+        for count in (0, 7, 1000, 3, 999, 1001):
+            expected = 3
+            for _ in range(count):
+                expected -= 0.2
+            self.assertEqual(mind_ai_learner._penalized_priority(3, 0.2, count), expected)
+
+    def test_penalty_cache_is_bounded(self):
+        mind_ai_learner = MindAI_Learning()
+        for count in (PENALTY_CACHE_STEPS * 3, PENALTY_CACHE_STEPS * 3 + 5, PENALTY_CACHE_STEPS + 1, PENALTY_CACHE_STEPS * 2, 10):
+            expected = 3
+            for _ in range(count):
+                expected -= 0.2
+            self.assertEqual(mind_ai_learner._penalized_priority(3, 0.2, count), expected)
+        self.assertEqual(len(mind_ai_learner._penalty_cache[(3, 0.2)][0]), PENALTY_CACHE_STEPS)
+
+
+if __name__ == "__main__":
+    unittest.main()
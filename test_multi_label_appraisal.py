@@ -0,0 +1,38 @@
+# test_multi_label_appraisal.py
+import unittest
+
+from emotional_ai_module import EmotionAI_PathBased_DynamicIntensity_V3, AppraisalIndex
+from test_appraisal_equivalence import generate_corpus
+
+CORPUS_SIZE = 10000
+
+
+class MultiLabelAppraisalTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.appraisal_index = AppraisalIndex()
+        cls.corpus = generate_corpus(cls.appraisal_index.matcher.keywords, CORPUS_SIZE)
+
+    def test_memoized_results_match_a_fresh_weighing(self):
+        emotion_ai = EmotionAI_PathBased_DynamicIntensity_V3()
+        for text in self.corpus * 2:
+            expected = self.appraisal_index._weigh_pathways(frozenset(self.appraisal_index.matcher.find_all(text.lower())))
+            weights = self.appraisal_index.select_pathways(text.lower())
+            self.assertEqual(weights, expected, text)
+            weights.clear() # Callers get a copy; the memoized result is untouched
+            self.assertEqual(self.appraisal_index.select_pathways(text.lower()), expected, text)
+            self.assertEqual(emotion_ai.appraise_multi(text)[0], expected, text)
+
+    def test_mixed_message_raises_every_matched_emotion(self):
+        emotion_ai = EmotionAI_PathBased_DynamicIntensity_V3(appraisal_mode="multi")
+        emotion_ai.generate_emotion_path("thank you, but I am afraid")
+        levels = emotion_ai.get_emotion_intensity()
+        self.assertGreater(levels["JOY"], 0.0)
+        self.assertGreater(levels["FEAR"], 0.0)
+
+    def test_no_match_is_the_default_pathway(self):
+        self.assertEqual(self.appraisal_index.select_pathways("the weekly report"), {self.appraisal_index.default_pathway: 1.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+# test_session_paging.py
+import os
+import tempfile
+import unittest
+
+from cadence_clock import VirtualClock
+from decision_history_store import ColumnarDecisionHistory
+from emotional_ai_module import EmotionAI_PathBased_DynamicIntensity_V3
+from main_ai_system import run_turn
+from mind_ai_module import MindAI_Learning
+from session_paging import PagedSessions
+
+TEXTS = ("I am scared of the storm", "What a wonderful happy day", "The weekly report", "I am scared and angry")
+
+
+class SessionPagingTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "sessions.db")
+        self.clock = VirtualClock(epoch=1000.0)
+
+    def open_store(self, memory_budget=256 << 20):
+        store = PagedSessions(self.path, memory_budget, lambda: EmotionAI_PathBased_DynamicIntensity_V3(clock=self.clock))
+        self.addCleanup(lambda: store._db.close())
+        return store
+
+    def make_session(self, decision_history=None):
+        emotion_ai = EmotionAI_PathBased_DynamicIntensity_V3(
+            {emotion: 0.05 for emotion in EmotionAI_PathBased_DynamicIntensity_V3().emotion_categories},
+            appraisal_intensity_multiplier=1.5, decay_mode="lazy", decay_tick_seconds=2.0, clock=self.clock, appraisal_mode="multi"
+        )
+        return emotion_ai, MindAI_Learning(decision_history, clock=self.clock)
+
+    def run_turns(self, *states):
+        """Runs TEXTS through each state a second apart, the states taking each turn at the same time."""
+        results = [[] for _ in states]
+        for text in TEXTS:
+            for state, state_results in zip(states, results):
+                state_results.append(run_turn(*state, text))
+            self.clock.advance(1.0)
+        return results
+
+    def assert_same_session(self, paged, live):
+        for name in ("intensity_decay_rates", "appraisal_intensity_multiplier", "decay_mode", "decay_tick_seconds",
+                     "appraisal_mode", "last_pathway", "last_pathway_weights"):
+            self.assertEqual(getattr(paged[0], name), getattr(live[0], name), name)
+        for emotion, level in live[0].get_emotion_intensity().items():
+            self.assertAlmostEqual(paged[0].get_emotion_intensity()[emotion], level, msg=emotion)
+        self.assertEqual(paged[1].analyze_options("Current situation", ["[EMOTION_FEAR]"]),
+                         live[1].analyze_options("Current situation", ["[EMOTION_FEAR]"]))
+        paged_results, live_results = self.run_turns(paged, live)
+        self.assertEqual(paged_results, live_results)
+
+    def round_trip(self, decision_history, live_history):
+        store = self.open_store()
+        store["user"] = paged = self.make_session(decision_history)
+        live = self.make_session(live_history)
+        paged_results, live_results = self.run_turns(paged, live)
+        self.assertEqual(paged_results, live_results)
+        store.evict("user")
+        self.clock.advance(30.0) # Idle while paged out: lazy decay owes 15 ticks
+        paged = store["user"]
+        self.assertEqual(store.stats()["misses"], 1)
+        self.assert_same_session(paged, live)
+
+    def test_list_history_round_trip(self):
+        self.round_trip(None, None)
+
+    def test_columnar_history_round_trip(self):
+        self.round_trip(ColumnarDecisionHistory(capacity=3), ColumnarDecisionHistory(capacity=3))
+
+    def test_budget_pages_out_the_least_recently_used(self):
+        store = self.open_store(memory_budget=1)
+        store["a"], store["b"] = self.make_session(), self.make_session()
+        self.assertEqual(store.stats()["resident"], 1)
+        self.assertEqual(store.stats()["evictions"], 1)
+        self.assertIn("a", store)
+        self.assertIsNone(store.get("missing"))
+
+    def test_close_persists_resident_sessions(self):
+        store = self.open_store()
+        store["user"] = paged = self.make_session()
+        live = self.make_session()
+        self.run_turns(paged, live)
+        store.close()
+        self.assert_same_session(self.open_store()["user"], live)
+
+
+if __name__ == "__main__":
+    unittest.main()
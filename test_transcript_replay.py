@@ -0,0 +1,37 @@
+# test_transcript_replay.py
+import unittest
+
+from decision_history_store import ColumnarDecisionHistory
+from transcript_replay import replay
+
+
+class BoundedReplayTest(unittest.TestCase):
+    def test_history_grows_only_up_to_its_capacity(self):
+        history = ColumnarDecisionHistory(capacity=3000)
+        for timestamp in range(7000):
+            history.append(["[EMOTION_JOY]"], "Option A", "positive", float(timestamp))
+        self.assertEqual(len(history), 3000)
+        self.assertEqual(history.columns()[3][0], 4000.0)
+        self.assertEqual(history.count("[EMOTION_JOY]", "Option A", "positive"), 3000)
+
+    def test_small_history_doesnt_allocate_its_whole_capacity(self):
+        history = ColumnarDecisionHistory(capacity=1 << 20)
+        history.append(["[EMOTION_JOY]"], "Option A", "positive", 0.0)
+        self.assertLess(history.nbytes, 1 << 16)
+
+    def test_dropped_session_starts_fresh(self):
+        turns = [("a", "I am scared"), ("b", "I am scared"), ("c", "I am scared"), ("a", "I am scared")]
+        bounded = list(replay(turns, max_sessions=2))
+        unbounded = list(replay(turns, max_sessions=None))
+        self.assertEqual(bounded[3]["emotion_intensities"], bounded[0]["emotion_intensities"]) # "a" was dropped when "c" arrived
+        self.assertNotEqual(bounded[3]["emotion_intensities"], unbounded[3]["emotion_intensities"])
+        self.assertEqual(bounded[:3], unbounded[:3])
+
+    def test_recently_used_session_is_kept(self):
+        turns = [("a", "I am scared"), ("b", "I am scared"), ("a", "I am scared"), ("c", "I am scared"), ("a", "I am scared")]
+        bounded = list(replay(turns, max_sessions=2))
+        self.assertEqual(bounded, list(replay(turns, max_sessions=None)))
+
+
+if __name__ == "__main__":
+    unittest.main()
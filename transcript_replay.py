@@ -0,0 +1,164 @@
+# transcript_replay.py
+import argparse
+import json
+import mmap
+import os
+import sys
+from collections import OrderedDict
+
+from emotional_ai_module import EmotionAI_PathBased_DynamicIntensity_V3, enable_appraisal_cache
+from mind_ai_module import MindAI_Learning
+from decision_history_store import ColumnarDecisionHistory
+from main_ai_system import run_turn
+
+TRANSCRIPT_SPEAKERS = ("User", "Gemini")
+RELEASE_BYTES = 8 << 20 # Consumed mapped pages are released in steps of this size
+DEFAULT_HISTORY_CAPACITY = 10000 # Decisions kept per session, about 200 KB of columns
+DEFAULT_MAX_SESSIONS = 1024 # Sessions kept live at once; the least recently used one is dropped past this
+
+
+def iter_lines(path, encoding="utf-8"):
+    """
+    Yields the decoded lines of a file through a read-only memory map, one at a time.
+    Pages already read are released as the scan advances, so resident memory doesn't grow with the file.
+    """
+    with open(path, "rb") as input_file:
+        if os.fstat(input_file.fileno()).st_size == 0:
+            return # Empty files can't be mapped
+        with mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            released = 0
+            for line in iter(mapped.readline, b""):
+                yield line.decode(encoding)
+                if mapped.tell() - released >= RELEASE_BYTES and hasattr(mmap, "MADV_DONTNEED"):
+                    consumed = mapped.tell() - mapped.tell() % mmap.PAGESIZE
+                    mapped.madvise(mmap.MADV_DONTNEED, released, consumed - released)
+                    released = consumed
+
+
+def iter_transcript_turns(lines):
+    """
+    Parses "User:" / "Gemini:" transcripts (the Session History.txt format) into (speaker, text) turns.
+    Lines up to the next speaker prefix continue the current turn and are joined with single spaces;
+    anything before the first turn is ignored.
+    """
+    speaker, parts = None, []
+    prefixes = tuple(f"{name}:" for name in TRANSCRIPT_SPEAKERS)
+    for line in lines:
+        if line.startswith(prefixes):
+            if parts:
+                yield speaker, " ".join(parts)
+            speaker, text = line.split(":", 1)
+            parts = [text.strip()]
+        elif line.strip() and parts:
+            parts.append(line.strip())
+    if parts:
+        yield speaker, " ".join(parts)
+
+
+def iter_jsonl_turns(lines):
+    """
+    Parses JSONL turns: one object per line with "speaker" (or "role") and "text" (or "content"),
+    and optionally "session". Yields (speaker, text) or (speaker, text, session) tuples.
+    """
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            speaker = record.get("speaker", record.get("role"))
+            text = record.get("text", record.get("content"))
+        except (ValueError, AttributeError):
+            raise ValueError(f"Line {line_number}: expected a JSON object with speaker and text") from None
+        if not isinstance(text, str):
+            raise ValueError(f"Line {line_number}: expected a JSON object with speaker and text")
+        yield (speaker, text, record["session"]) if "session" in record else (speaker, text)
+
+
+def iter_user_turns(turns):
+    """Keeps only the user's turns, as (session, text) with session None unless the input names one."""
+    for turn in turns:
+        if str(turn[0]).lower() == "user":
+            yield (turn[2] if len(turn) > 2 else None), turn[1]
+
+
+def read_turns(path, input_format="auto"):
+    """Streams (session, text) user turns from a transcript or JSONL file."""
+    if input_format == "auto":
+        input_format = "jsonl" if path.lower().endswith((".jsonl", ".ndjson")) else "transcript"
+    parse = {"transcript": iter_transcript_turns, "jsonl": iter_jsonl_turns}.get(input_format)
+    if parse is None:
+        raise ValueError(f"Unknown transcript format: {input_format!r}")
+    return iter_user_turns(parse(iter_lines(path)))
+
+
+def replay(user_turns, history_capacity=DEFAULT_HISTORY_CAPACITY, include_text=False, max_sessions=DEFAULT_MAX_SESSIONS):
+    """
+    Runs (session, text) turns through the pipeline, one fresh Emotion/Mind AI per session, and yields
+    one result per turn. Decision histories are columnar ring buffers of history_capacity turns, and at most
+    max_sessions sessions stay live, so memory doesn't grow with transcript length. The tradeoff: a session
+    forgets outcomes older than its capacity, and one that returns after being dropped starts fresh.
+    Pass None for either bound to keep everything (memory then grows about 20 bytes per turn).
+    """
+    sessions = OrderedDict() # session id -> (emotion_ai, mind_ai), least recently used first
+    for turn_number, (session_id, text) in enumerate(user_turns, 1):
+        state = sessions.get(session_id)
+        if state is None:
+            state = sessions[session_id] = (
+                EmotionAI_PathBased_DynamicIntensity_V3(), MindAI_Learning(ColumnarDecisionHistory(capacity=history_capacity))
+            )
+            if max_sessions and len(sessions) > max_sessions:
+                sessions.popitem(last=False) # Drop the idlest session, most likely a finished one
+        else:
+            sessions.move_to_end(session_id)
+        result = {"turn": turn_number}
+        if session_id is not None:
+            result["session"] = session_id
+        if include_text:
+            result["text"] = text
+        result.update(run_turn(state[0], state[1], text))
+        yield result
+
+
+def write_jsonl(results, output_file):
+    """Writes results as JSON lines; output_file should be buffered. Returns the number written."""
+    count = 0
+    for result in results:
+        output_file.write(json.dumps(result) + "\n")
+        count += 1
+    return count
+
+
+def replay_file(input_path, output_path, input_format="auto", history_capacity=DEFAULT_HISTORY_CAPACITY, include_text=False,
+                buffer_size=1 << 20, max_sessions=DEFAULT_MAX_SESSIONS):
+    """Replays a transcript file into a JSONL results file. Returns the number of turns replayed."""
+    results = replay(read_turns(input_path, input_format), history_capacity, include_text, max_sessions)
+    with open(output_path, "w", encoding="utf-8", buffering=buffer_size) as output_file:
+        return write_jsonl(results, output_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay transcripts through the Cadence pipeline and write per-turn results as JSONL.")
+    parser.add_argument("input", help="Transcript (User:/Gemini: text) or JSONL file")
+    parser.add_argument("-o", "--output", help="Results file (default: stdout)")
+    parser.add_argument("--format", choices=("auto", "transcript", "jsonl"), default="auto")
+    parser.add_argument("--history-capacity", type=int, default=DEFAULT_HISTORY_CAPACITY,
+                        help=f"Keep only this many decisions per session, 0 for all (default: {DEFAULT_HISTORY_CAPACITY})")
+    parser.add_argument("--max-sessions", type=int, default=DEFAULT_MAX_SESSIONS,
+                        help=f"Keep only this many sessions live, 0 for all (default: {DEFAULT_MAX_SESSIONS})")
+    parser.add_argument("--include-text", action="store_true", help="Copy each user turn's text into its result")
+    parser.add_argument("--appraisal-cache", type=int, default=0, metavar="ENTRIES", help="Cache pathway selection for this many distinct texts")
+    args = parser.parse_args()
+
+    if args.appraisal_cache:
+        enable_appraisal_cache(args.appraisal_cache)
+    history_capacity = args.history_capacity or None # 0 = unbounded
+    if args.output:
+        count = replay_file(args.input, args.output, args.format, history_capacity, args.include_text, max_sessions=args.max_sessions)
+    else:
+        results = replay(read_turns(args.input, args.format), history_capacity, args.include_text, args.max_sessions)
+        count = write_jsonl(results, sys.stdout)
+    print(f"Replayed {count} turns", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()